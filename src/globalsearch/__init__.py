@@ -3,40 +3,91 @@
 # (c) 2019-2025 Eyosido Software SARL
 # ---------------
 
-import importlib
+import importlib, os, sys, time
 
-from globalsearch.gscore import gslog, gs, sdobj, searchdata, gssdlibrary, gspresets
-from globalsearch.gstests import gsunittests
-from globalsearch.gsui import gsuimgr, gsuiwidget, prefs, prefsdlg, resulttree, searchhistory, searchroottree, uiutil
+# Plugin modules are reloaded at initialization in development mode only, so that source changes are taken into
+# account by disabling/enabling the plugin. Development mode is set by this environment variable, as preferences
+# are read from modules which would then need reloading first.
+DEV_MODE_ENV = "GLOBALSEARCH_DEV"
 
+# dependencies first (a module after the modules it imports), modules not imported yet (i.e. unit tests) are imported
+RELOADED_MODULES = (
+    "globalsearch.gscore.gslog",
+    "globalsearch.gscore.sdobj",
+    "globalsearch.gscore.gspresets",
+    "globalsearch.gscore.gsjsonstream",
+    "globalsearch.gscore.gsbloom",
+    "globalsearch.gscore.gswatcher",
+    "globalsearch.gscore.gsstore",
+    "globalsearch.gscore.gsstorewriter",
+    "globalsearch.gscore.searchdata",
+    "globalsearch.gscore.gssdlibrary",
+    "globalsearch.gscore.gspackagetracker",
+    "globalsearch.gscore.gsindex",
+    "globalsearch.gscore.gs",
+    "globalsearch.gsui.prefs",
+    "globalsearch.gsui.uiutil",
+    "globalsearch.gsui.resultmodel",
+    "globalsearch.gsui.matchdelegate",
+    "globalsearch.gsui.resulttree",
+    "globalsearch.gsui.searchhistory",
+    "globalsearch.gsui.searchroottree",
+    "globalsearch.gsui.gsuiwidget",
+    "globalsearch.gsui.gsuimgr",
+    "globalsearch.gsui.prefsdlg",
+    "globalsearch.gstests.gsunittests",
+    "globalsearch.gstests.gsbenchmarks"
+)
+
+def isDevMode():
+    return bool(os.environ.get(DEV_MODE_ENV))
+
+def reloadModules():
+    for name in RELOADED_MODULES:
+        module = sys.modules.get(name)
+        if module:
+            importlib.reload(module)
+        else:
+            importlib.import_module(name)
+
+# plugin modules are imported here rather than when the package is imported, so that loading the package stays cheap
 def initializeSDPlugin():
-    importlib.reload(gslog)
-    importlib.reload(gs)
-    importlib.reload(sdobj)
-    importlib.reload(searchdata)
-    importlib.reload(gspresets)    
-    importlib.reload(gssdlibrary)
-    importlib.reload(gsuimgr)
-    importlib.reload(gsuiwidget)
-    importlib.reload(prefs)
-    importlib.reload(prefsdlg)
-    importlib.reload(resulttree)
-    importlib.reload(searchhistory)
-    importlib.reload(searchroottree)
-    importlib.reload(uiutil)
-    importlib.reload(gsunittests)
+    devMode = isDevMode()
+    if devMode:
+        reloadStart = time.perf_counter()
+        reloadModules()
+        reloadDuration = time.perf_counter() - reloadStart
+
+    importStart = time.perf_counter()
+    from globalsearch.gscore import gslog, gssdlibrary, gsstore, gsindex
+    from globalsearch.gsui import gsuimgr
+    importDuration = time.perf_counter() - importStart
 
     gslog.GSLogger.classInit()
-    gsuimgr.GSUIManager.classInit()
-    gssdlibrary.GSSDLibrary.classInit()
+    timer = gslog.GSStageTimer("Startup")
+    timer.logStage("imports", importDuration)
+    if devMode:
+        timer.logStage("module reloading", reloadDuration)
+
+    with timer.stage("store"):
+        gsstore.GSStore.classInit()
+    with timer.stage("preferences"):
+        gsuimgr.GSUIManager.classInit()
+    with timer.stage("library"):
+        gssdlibrary.GSSDLibrary.classInit()
+    with timer.stage("content index"):
+        gsindex.GSIndex.classInit()
     gslog.info(gsuimgr.g_gsuimgr.APPNAME + " starting")
-    gsuimgr.g_gsuimgr.setupUI()
+    gsuimgr.g_gsuimgr.setupUI(timer)
 
 def uninitializeSDPlugin():
+    from globalsearch.gscore import gslog, gssdlibrary, gsstore, gsindex
+    from globalsearch.gsui import gsuimgr
     gslog.info(gsuimgr.GSUIManager.APPNAME + " ending")
     gsuimgr.g_gsuimgr.removeUI()
     gsuimgr.GSUIManager.classDeinit()
     gssdlibrary.GSSDLibrary.classDeinit()
+    gsindex.GSIndex.classDeinit()
+    gsstore.GSStore.classDeinit()
     gslog.info(gsuimgr.GSUIManager.APPNAME + " ended")
     gslog.GSLogger.classDeinit()
-
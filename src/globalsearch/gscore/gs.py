@@ -3,14 +3,13 @@
 # (c) 2019-2025 Eyosido Software SARL
 # ---------------
 
-import re
+import re, copy
 from sd.api.sdpackage import SDPackage
 from sd.api.sdgraph import SDGraph
 from sd.api.sbs.sdsbsfunctiongraph import SDSBSFunctionGraph
 from sd.api.sdproperty import SDPropertyCategory
 from sd.api.sdtypefloat import *
 from sd.api.sdvaluefloat import *
-from sd.api.sdvaluestring import SDValueString
 from sd.api.sdresourcefolder import SDResourceFolder
 from sd.api.sdgraphobjectcomment import SDGraphObjectComment
 from sd.api.sdgraphobjectframe import SDGraphObjectFrame
@@ -18,6 +17,8 @@ from sd.api.sdgraphobjectpin import SDGraphObjectPin
 from globalsearch.gscore import gslog
 from globalsearch.gscore.sdobj import SDObj 
 from globalsearch.gscore import gssdlibrary
+from globalsearch.gscore import gsindex
+from globalsearch.gscore.gsbloom import GSBloomFilter
 
 class GlobalSearch:
     """
@@ -41,6 +42,10 @@ class GlobalSearch:
         def hasFunctionNodeFilter(self):
             return self.functionNodeFilter is not None
 
+    # raised from the traversal when cancelCheck tells the search is to be abandoned
+    class Cancelled(Exception):
+        pass
+
     def __init__(self, ctx, prefs, searchRoot, searchCriteria, searchResults):
         self.context = ctx
         self.prefs = prefs
@@ -51,10 +56,236 @@ class GlobalSearch:
         self.searchLogs = prefs.dev_searchLogs # enable to log information about the search (debug only)
         self.searchResults.searchLogs = self.searchLogs
         self.depth = 0  # tree depth, used mostly for debugging
+        self.searchIndex = None # content index used to speed up the traversal: nodes matching node type filters, content summaries
+        self.summaryFeatures = None # content summary features the search string requires, None when not pruning on content summaries
+        self.cancelCheck = None # optional callable returning True when the search is to be abandoned (i.e. search text changed during a live search)
+        self.narrowingKeys = None # keys of the resources holding the results of a previous search this one narrows, see narrowingMayMatch()
 
     def search(self):
+        self.runSteps(self.searchSteps())
+
+    # The search as a generator yielding after each package resource (graph, function, folder) searched, so the search can be
+    # run in slices by the caller (i.e. live search, processing UI events between slices). Queries answered from the content
+    # index do not yield.
+    def searchSteps(self):
         self.depth = 0
-        self.searchInto(self.searchRoot, self.NodeTypeFilterContext())
+        SDObj.invalidateNameCache() # graph instance names only: graph labels may have been edited since last search, which is not notified
+        if self.searchCriteria.usagesOf:
+            self.searchUsages(self.searchCriteria.usagesOf)
+        elif self.searchCriteria.isSSVariables():
+            self.searchUnmatchedVariables()
+        elif self.searchCriteria.ss_library_usage:
+            self.searchLibraryUsageReport()
+        elif self.searchCriteria.isNodeIdSearch():
+            self.searchNodeId()
+        else:
+            yield from self.searchContentSteps()
+
+    # runs a search generator (see searchSteps()) to completion, returns its return value
+    @classmethod
+    def runSteps(cls, steps):
+        while True:
+            try:
+                next(steps)
+            except StopIteration as e:
+                return e.value
+
+    # regular search: traversal from the search root, skipping containers ruled out by their content summary if prune is True
+    def searchContent(self, prune=True):
+        self.runSteps(self.searchContentSteps(prune))
+
+    def searchContentSteps(self, prune=True):
+        if prune and self.prefs.ix_enable and self.prefs.ix_prune and self.searchCriteria.isPrunableSearch():
+            self.summaryFeatures = GSBloomFilter.queryFeatures(self.searchCriteria.searchString, self.searchCriteria.wholeWord)
+        self.searchIndex = self.contentIndex() if self.prefs.ix_enable else None
+        try:
+            yield from self.searchIntoSteps(self.searchRoot, self.NodeTypeFilterContext(), containerKey=self.resourceContainerKey(self.searchRoot))
+        except self.Cancelled:
+            self.searchResults.cancelled = True
+            self.logSearch("search cancelled")
+        if self.searchResults.summaryChecks > 0 and not self.searchResults.cancelled:
+            gslog.debug("Content summaries: " + self.searchResults.summaryStatsStr())
+
+    # Content index of the loaded packages, packages loaded or saved since last query being (re-)indexed. When the index is not
+    # maintained (ix_enable off), packages are indexed on first query and re-indexed when saved (see GSIndex.markStale) or
+    # when their file changed, which is checked here for Designer versions not notifying package saves.
+    # rootOnly: only the package holding the search root is brought up to date, for queries limited to the search root
+    def contentIndex(self, rootOnly=False):
+        index = gsindex.g_gsindex
+        path = self.searchRootPackagePath() if rootOnly else None
+        if not self.prefs.ix_enable:
+            index.queueModifiedPackages(path)
+        index.ensureIndexed(path)
+        return index
+
+    # normalized file path of the package holding the search root, None for the global root or an unsaved package
+    def searchRootPackagePath(self):
+        if self.searchRoot is None:
+            return None
+        filePath = self.searchRoot.getFilePath()
+        return gsindex.GSIndex.normPath(filePath) if filePath else None
+
+    def searchRootKey(self):
+        return gsindex.GSIndex.keyForSDObj(self.searchRoot) if self.searchRoot else None
+
+    # content index keys of the searched containers, only needed when visiting nodes from the content index
+    def resourceContainerKey(self, resource):
+        return gsindex.GSIndex.keyForSDObj(resource) if self.searchIndex and resource else None
+
+    def childContainerKey(self, containerKey, node, suffix):
+        return containerKey + "#" + node.getIdentifier() + "/" + suffix if containerKey else None
+
+    # Whether the search string may be found in a container according to its content summary: False if ruled out, so the
+    # container does not need to be searched into, None if the container has no summary
+    def summaryMayMatch(self, containerKey):
+        if self.summaryFeatures is None or not containerKey:
+            return None
+        container = self.searchIndex.container(containerKey)
+        if container is None or container.summary is None:
+            return None
+        self.searchResults.summaryChecks += 1
+        if container.summary.mayContainAll(self.summaryFeatures):
+            return True
+        self.searchResults.summaryPruned += 1
+        self.logSearch("summaryMayMatch: skipping " + containerKey)
+        return False
+
+    # Whether a resource may hold results when narrowing a previous search: a search string containing the previous one
+    # cannot be found in packages and resources (graphs, functions, folders) where the previous one was not found.
+    # Resources entered from graph nodes (parameter functions, sub-graphs) are searched with the graph holding them.
+    def narrowingMayMatch(self, sdObj, parentSubtype):
+        if self.narrowingKeys is None or parentSubtype not in (SDObj.ROOT, SDObj.PACKAGE, SDObj.FOLDER):
+            return True
+        if gsindex.GSIndex.keyForSDObj(sdObj) in self.narrowingKeys:
+            return True
+        self.logSearch("narrowingMayMatch: skipping " + SDObj.dumpStr(sdObj))
+        return False
+
+    # Keys of the packages and resources holding the results of a search, used as narrowingKeys by a following search
+    @classmethod
+    def resourceKeysWithResults(cls, searchResults):
+        keys = set()
+        pathNodes = [searchResults.pathTree] if searchResults.pathTree else []
+        while pathNodes:
+            pathNode = pathNodes.pop()
+            sdObj = pathNode.sdObj
+            if sdObj is None or isinstance(sdObj, SDPackage) or isinstance(sdObj, SDGraph) or isinstance(sdObj, SDResourceFolder):
+                if sdObj is not None:
+                    try:
+                        keys.add(gsindex.GSIndex.keyForSDObj(sdObj))
+                    except Exception:
+                        pass # graph not being a package resource (i.e. parameter function)
+                pathNodes.extend(pathNode.children)
+        return keys
+
+    # Indexed container of a graph or function if its nodes are the live ones (same identifiers in the same order), None otherwise.
+    # The index reflects the saved package, nodes added or removed since are detected this way.
+    def liveContainer(self, nodes, containerKey):
+        if not containerKey:
+            return None
+        container = self.searchIndex.container(containerKey)
+        if container is None or container.nodeCount() != nodes.getSize():
+            return None
+        for n in range(0, nodes.getSize()):
+            if nodes.getItem(n).getIdentifier() != container.nodeIds[n]:
+                self.logSearch("liveContainer: " + containerKey + " modified since indexed")
+                return None
+        return container
+
+    # Nodes of a graph or function to be visited by the search. If node definitions are provided along with the live indexed
+    # container (see liveContainer), only the nodes having one of these definitions (or referencing a graph from graphIds) are
+    # returned, in graph order.
+    def nodesToVisit(self, nodes, container, definitions=None, graphIds=()):
+        if definitions is not None and container:
+            candidates = [nodes.getItem(p) for p in container.nodePositions(definitions, graphIds)]
+            self.logSearch("nodesToVisit: " + str(len(candidates)) + " out of " + str(nodes.getSize()) + " nodes from content index")
+            return candidates
+        return [nodes.getItem(n) for n in range(0, nodes.getSize())]
+
+    # appends the path to an indexed site along with its node (or the provided live node) as found match
+    def appendIndexedSite(self, index, site, match, rootKey=None, node=None):
+        self.searchResults.appendIndexedPath(index.sitePathEntries(site, rootKey))
+        return self.searchResults.appendPathNode(site.node if node is None else node, match, isFoundMatch=True, assignToCurrent=False)
+
+    # Usages of a graph or function across all loaded packages, answered from the content index (no traversal)
+    def searchUsages(self, resource):
+        index = self.contentIndex()
+        isFunction = isinstance(resource, SDSBSFunctionGraph)
+        for site in index.usages(resource):
+            if isFunction:
+                match = resource.getIdentifier()
+                contextString = "Function call"
+            else:
+                match = SDObj.name(site.node, SDObj.GRAPH_INSTANCE)
+                contextString = "Graph instance"
+            pathNode = self.appendIndexedSite(index, site, match)
+            pathNode.subType = SDObj.USAGE
+            pathNode.contextString = contextString
+            pathNode.referencedRes = resource
+
+    # Nodes from their identifier ("id:" search string prefix). With the content index enabled, indexed nodes having this
+    # identifier are looked up in their live graph, so nodes deleted since the package was saved are not returned. If none
+    # is found (i.e. node added since), the search root is traversed matching node identifiers only.
+    def searchNodeId(self):
+        identifier = self.searchCriteria.nodeIdSearched()
+        if self.prefs.ix_enable and self.searchIndexedNodeId(identifier):
+            return
+
+        criteria = copy.copy(self.searchCriteria)
+        criteria.searchString = identifier
+        criteria.wholeWord = True
+        criteria.enableFilters(False)
+        criteria.graphParamFunc = self.searchCriteria.graphParamFunc
+        criteria.graphNodeFilter = criteria.functionNodeFilter = None
+        searchCriteria = self.searchCriteria
+        self.searchCriteria = criteria
+        try:
+            self.searchContent(prune=False) # a node missing from the index is missing from content summaries too
+        finally:
+            self.searchCriteria = searchCriteria
+
+    # Returns False if no indexed node having this identifier is found in its live graph
+    def searchIndexedNodeId(self, identifier):
+        index = self.contentIndex(rootOnly=True)
+        rootKey = self.searchRootKey()
+        found = False
+        for site in index.nodeSites(identifier):
+            if index.isSiteInRoot(site, rootKey) and \
+               (self.searchCriteria.graphParamFunc or not any(c.type == SDObj.FUNC_PARAM for c in site.container.chain())):
+                try:
+                    node = site.container.sdObj.getNodeFromId(identifier)
+                except Exception:
+                    node = None # graph deleted since indexed
+                if node:
+                    pathNode = self.appendIndexedSite(index, site, identifier, rootKey, node)
+                    if SDObj.isFunction(site.container.type) or site.container.type == SDObj.FUNC_PARAM:
+                        pathNode.graph = site.container.sdObj
+                    found = True
+        return found
+
+    # Library node instance count per package, from the content index
+    def searchLibraryUsageReport(self):
+        index = self.contentIndex(rootOnly=True)
+        lib = gssdlibrary.g_gssdlibrary
+        libraryNodes = lib.load()
+        for packageIndex, counts in index.libraryUsageReport(libraryNodes, self.searchRootKey()):
+            self.searchResults.appendIndexedPath([(index.ROOT_KEY, None, SDObj.ROOT, "Root"), (packageIndex.root.key, packageIndex.root.sdObj, SDObj.PACKAGE, "")])
+            for identifier, count in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+                pathNode = self.searchResults.appendPathNode(None, str(count), isFoundMatch=True, assignToCurrent=False)
+                pathNode.subType = SDObj.LIBRARY_NODE
+                pathNode.name = libraryNodes[identifier][gssdlibrary.GSSDLibrary.LABEL]
+
+    # Variables set but never read (Set nodes are returned) or read but never set (Get nodes are returned), from the content index
+    def searchUnmatchedVariables(self):
+        index = self.contentIndex()
+        rootKey = self.searchRootKey()
+        setters = self.searchCriteria.ss_var_set_not_read
+        names = index.variablesSetButNeverRead() if setters else index.variablesReadButNeverSet()
+        for name in names:
+            sets, gets = index.variableSites(name)
+            for site in (sets if setters else gets):
+                if index.isSiteInRoot(site, rootKey):
+                    self.appendIndexedSite(index, site, name, rootKey)
 
     def logSearch(self, s):
         if self.searchLogs:
@@ -77,15 +308,24 @@ class GlobalSearch:
         
         self.searchResults.currentPathNode = containerPathNode.parent   # we're done with this container, move to parent
 
-    def searchInto(self, sdObj, nodeTypeFilterContext, subType = SDObj.ROOT, parentSubtype = SDObj.ROOT, name = ""):
+    def searchInto(self, sdObj, nodeTypeFilterContext, subType = SDObj.ROOT, parentSubtype = SDObj.ROOT, name = "", containerKey = None):
+        return self.runSteps(self.searchIntoSteps(sdObj, nodeTypeFilterContext, subType, parentSubtype, name, containerKey))
+
+    # searchInto() as a generator, yielding after each package resource searched (see searchSteps())
+    def searchIntoSteps(self, sdObj, nodeTypeFilterContext, subType = SDObj.ROOT, parentSubtype = SDObj.ROOT, name = "", containerKey = None):
         self.logSearch("searchInto " + SDObj.dumpStr(sdObj) + " depth="+str(self.depth))
+        if self.cancelCheck and self.cancelCheck():
+            raise self.Cancelled()
+        mayMatch = self.summaryMayMatch(containerKey)
         if sdObj == None:
             # we need to have root node when searching over multiple packages
             containerPathNode = self.pathEnterContainer(sdObj)
             containerPathNode.subType = SDObj.ROOT
             containerPathNode.name = "Root"
-            foundSearchResult = self.searchPackages(nodeTypeFilterContext)
+            foundSearchResult = yield from self.searchPackagesSteps(nodeTypeFilterContext)
             self.pathLeaveContainer(containerPathNode, foundSearchResult)
+        elif mayMatch is False or not self.narrowingMayMatch(sdObj, parentSubtype):
+            foundSearchResult = False # content summary or previous search rules out the search string
         else:
             containerPathNode = self.pathEnterContainer(sdObj)
             self.depth += 1
@@ -94,23 +334,25 @@ class GlobalSearch:
 
             foundSearchResult = False
             if isinstance(sdObj, SDPackage):
-                foundSearchResult = self.searchPackage(sdObj, nodeTypeFilterContext)
+                foundSearchResult = yield from self.searchPackageSteps(sdObj, nodeTypeFilterContext)
             elif isinstance(sdObj, SDSBSFunctionGraph):
                 isPackageFctDef = parentSubtype == SDObj.ROOT or parentSubtype == SDObj.FOLDER or parentSubtype == SDObj.PACKAGE
-                foundSearchResult = self.searchFunctionGraph(sdObj, nodeTypeFilterContext, isPackageFctDef=isPackageFctDef)
+                foundSearchResult = self.searchFunctionGraph(sdObj, nodeTypeFilterContext, isPackageFctDef=isPackageFctDef, containerKey=containerKey)
             elif isinstance(sdObj, SDGraph):
-                foundSearchResult = self.searchGraph(sdObj, nodeTypeFilterContext)
+                foundSearchResult = self.searchGraph(sdObj, nodeTypeFilterContext, containerKey)
             elif isinstance(sdObj, SDResourceFolder):
-                foundSearchResult = self.searchFolder(sdObj, nodeTypeFilterContext)
+                foundSearchResult = yield from self.searchFolderSteps(sdObj, nodeTypeFilterContext)
             else:
                 gslog.warning("Nothing to search into, this is not a container")
 
             self.pathLeaveContainer(containerPathNode, foundSearchResult)
             self.depth -= 1
+            if mayMatch and not foundSearchResult:
+                self.searchResults.summaryFalsePositives += 1
 
         return foundSearchResult
 
-    def searchPackages(self, nodeTypeFilterContext):
+    def searchPackagesSteps(self, nodeTypeFilterContext):
         self.logSearch("searchPackages ")
         foundSearchResult = False
         app = self.context.getSDApplication()
@@ -120,11 +362,11 @@ class GlobalSearch:
             self.logSearch("searchPackages found " + str(count) + ' packages')
             for p in range(0, count):
                 package = packages.getItem(p)
-                if self.searchInto(package, nodeTypeFilterContext, subType=SDObj.PACKAGE):
+                if (yield from self.searchIntoSteps(package, nodeTypeFilterContext, subType=SDObj.PACKAGE)):
                     foundSearchResult = True
         return foundSearchResult
 
-    def searchPackage(self, package, nodeTypeFilterContext):
+    def searchPackageSteps(self, package, nodeTypeFilterContext):
         self.logSearch("searchPackage " + SDObj.dumpStr(package))
         foundSearchResult = False
         resources = package.getChildrenResources(False)
@@ -134,12 +376,13 @@ class GlobalSearch:
             for r in range(0, count):
                 resource = resources.getItem(r)
                 subType, _ = SDObj.type(resource)
-                if self.isContainerNode(resource) and self.searchInto(resource, nodeTypeFilterContext, subType=subType, parentSubtype=SDObj.PACKAGE):
+                if self.isContainerNode(resource) and (yield from self.searchIntoSteps(resource, nodeTypeFilterContext, subType=subType, parentSubtype=SDObj.PACKAGE, containerKey=self.resourceContainerKey(resource))):
                     foundSearchResult = True
+                yield
 
         return foundSearchResult
 
-    def searchGraph(self, graph, nodeTypeFilterContext):
+    def searchGraph(self, graph, nodeTypeFilterContext, containerKey = None):
         self.logSearch("searchGraph " + SDObj.dumpStr(graph))
         foundSearchResult = False
 
@@ -168,10 +411,12 @@ class GlobalSearch:
                     foundSearchResult = True
 
         # search graph param functions and subgraphs
-        nodes = graph.getNodes()
+        definitions, graphIds = self.searchCriteria.graphNodeCandidateDefinitions() if self.searchCriteria.graphNodeFilter else (None, ())
+        graphNodes = graph.getNodes()
+        container = self.liveContainer(graphNodes, containerKey) if definitions is not None else None
+        nodes = self.nodesToVisit(graphNodes, container, definitions, graphIds)
         self.logSearch("searchGraph: parsing graph nodes")
-        for n in range(0, nodes.getSize()):
-            node = nodes.getItem(n)
+        for node in nodes:
             nodeType, typeStr = SDObj.type(node)   
             refRes = node.getReferencedResource()
             currentNodeTypeFilterContext = nodeTypeFilterContext # reset to original context for each new node
@@ -269,14 +514,16 @@ class GlobalSearch:
                                 else:
                                     # Search into regular parameter function
                                     self.logSearch("searchGraph: searching into regular param function")
-                                    if self.searchInto(propGraph, currentNodeTypeFilterContext, SDObj.FUNC_PARAM, parentSubtype=SDObj.GRAPH_NODE, name=paramName):
+                                    if self.searchInto(propGraph, currentNodeTypeFilterContext, SDObj.FUNC_PARAM, parentSubtype=SDObj.GRAPH_NODE, name=paramName,
+                                                       containerKey=self.childContainerKey(containerKey, node, prop.getId())):
                                         foundSearchResult_lev2 = True
                         p += 1
                     
             # system nodes having inner graphs (FX-Map, Pixel Processor, Value)
             if (passedGraphNodeFiltering or graphNodefilterPartialMatch) and SDObj.hasSystemContent(nodeType):
                 self.logSearch("searchGraph: Searching into system node " + str(refRes)) 
-                if self.searchInto(refRes, nodeTypeFilterContext, subType=SDObj.systemContentType(nodeType), parentSubtype=nodeType, name=SDObj.systemGraphName(nodeType)):
+                if self.searchInto(refRes, nodeTypeFilterContext, subType=SDObj.systemContentType(nodeType), parentSubtype=nodeType, name=SDObj.systemGraphName(nodeType),
+                                   containerKey=self.childContainerKey(containerKey, node, "content")):
                     foundSearchResult_lev2 = True
             else:
                 # search custom sub-graphs
@@ -296,7 +543,7 @@ class GlobalSearch:
                             containerPathNode_lev2.name = SDObj.name(node, SDObj.GRAPH_INSTANCE)
                             containerPathNode_lev2.referencedRes = refRes
                             self.logSearch("searchGraph: searching custom sub-graphs: refRes:" + str(refRes) + " isFunctionGraph:"+str(isFunctionGraph)+ " isSpecialGraph:"+str(isSpecialGraph) + " isCustomGraph:"+str(isCustomGraph))
-                            if self.searchGraph(refRes, currentNodeTypeFilterContext):
+                            if self.searchGraph(refRes, currentNodeTypeFilterContext, self.resourceContainerKey(refRes)):
                                 foundSearchResult_lev2 = True
 
             self.pathLeaveContainer(containerPathNode_lev2, foundSearchResult_lev2)
@@ -386,7 +633,7 @@ class GlobalSearch:
 
         return foundSearchResult
 
-    def searchFolder(self, folder, nodeTypeFilterContext):
+    def searchFolderSteps(self, folder, nodeTypeFilterContext):
         self.logSearch("searchFolder " + SDObj.dumpStr(folder))
         foundSearchResult = False
 
@@ -404,13 +651,14 @@ class GlobalSearch:
             for r in range(0, resources.getSize()):
                 resource = resources.getItem(r)
                 subType, _ = SDObj.type(resource)
-                if self.isContainerNode(resource) and self.searchInto(resource, nodeTypeFilterContext, subType=subType, parentSubtype=SDObj.FOLDER):
+                if self.isContainerNode(resource) and (yield from self.searchIntoSteps(resource, nodeTypeFilterContext, subType=subType, parentSubtype=SDObj.FOLDER, containerKey=self.resourceContainerKey(resource))):
                     foundSearchResult = True
+                yield
 
         return foundSearchResult
 
     # isPackageFctDef: tells whether the function is a package function definition (in a folder in the Explorer), i.e. not within the context of a node
-    def searchFunctionGraph(self, functionGraph, nodeTypeFilterContext, isPackageFctDef):
+    def searchFunctionGraph(self, functionGraph, nodeTypeFilterContext, isPackageFctDef, containerKey = None):
         self.logSearch("searchFunctionGraph " + SDObj.dumpStr(functionGraph) + " isPackageFctDef="+str(isPackageFctDef))
         foundSearchResult = False
 
@@ -468,9 +716,12 @@ class GlobalSearch:
                     foundSearchResult = True
 
         # search function nodes
-        nodes = functionGraph.getNodes()
-        for n in range(0, nodes.getSize()):
-            node = nodes.getItem(n)
+        definitions = self.searchCriteria.functionNodeCandidateDefinitions() if self.searchCriteria.isFunctionNodeTypeOnlySearch() else None
+        searchVariables = self.searchCriteria.hasSearchString() and (self.searchCriteria.varGetter or self.searchCriteria.varSetter)
+        functionNodes = functionGraph.getNodes()
+        container = self.liveContainer(functionNodes, containerKey) if definitions is not None or searchVariables else None
+        nodes = self.nodesToVisit(functionNodes, container, definitions)
+        for node in nodes:
             defId = node.getDefinition().getId()
             identifier = node.getIdentifier()
 
@@ -505,7 +756,9 @@ class GlobalSearch:
                         foundSearchResult = True
                 
                 if ((self.searchCriteria.varGetter and defId.startswith("sbs::function::get")) or (self.searchCriteria.varSetter and defId.startswith("sbs::function::set"))):
-                    if self.matchFirstStringInputProperty(node):
+                    # variable name from the content index if available, read from the node otherwise
+                    varName = container.variableNames.get(identifier) if container else SDObj.variableName(node)
+                    if self.matchVariableName(node, varName):
                         self.logSearch("searchFunctionGraph: found match for getter or setter")
                         foundSearchResult = True
             
@@ -520,7 +773,7 @@ class GlobalSearch:
                         containerPathNode.name = functionGraph.getIdentifier()
                         containerPathNode.referencedRes = functionGraph
 
-                        if self.searchFunctionGraph(functionGraph, nodeTypeFilterContext, isPackageFctDef=False):
+                        if self.searchFunctionGraph(functionGraph, nodeTypeFilterContext, isPackageFctDef=False, containerKey=self.resourceContainerKey(functionGraph)):
                             foundSearchResult_lev2 = True
 
                         self.pathLeaveContainer(containerPathNode, foundSearchResult_lev2)
@@ -584,8 +837,8 @@ class GlobalSearch:
             seachedContent_mod = searchedContent.lower()
         return seachedContent_mod, searchString_mod
     
-    # returns whether searchedContent has searchString as whole word
-    def hasWholeWord(self, searchedContent, searchString):
+    # returns (start, end) of searchString as whole word in searchedContent, wildcards extending it to the whole word, None if not found
+    def wholeWordSpan(self, searchedContent, searchString):
         patternStart = r'\b'
         patternEnd = r'\b'
 
@@ -598,38 +851,30 @@ class GlobalSearch:
             searchString = searchString[:-1] # remove last *
         
         match = re.search( patternStart + re.escape(searchString) + patternEnd, searchedContent)        
-        return bool(match)      
+        return match.span() if match else None
 
+    # returns whether content matches the search string, the match span being kept (see SearchResults.matchSpanFor)
+    # so found results can be highlighted without searching again
     def isMatchingSearchStringCriteria(self, content):
         if self.searchCriteria.hasSearchString():
             content_mod, searchStr_mod = self.prepareForCaseSensitivity(content, self.searchCriteria.searchString)
 
             if self.searchCriteria.wholeWord:
-                return self.hasWholeWord(content_mod, searchStr_mod)
+                span = self.wholeWordSpan(content_mod, searchStr_mod)
             else:
-                (stripped, startsWithWildcard, endsWithWildcard) = self.processWildcard(searchStr_mod)
                 (stripped,_, _) = self.processWildcard(searchStr_mod)
                 i = content_mod.find(stripped)
-                return i != -1
+                span = (i, i + len(stripped)) if i != -1 else None
+
+            if span:
+                self.searchResults.lastMatch = (content, span)
+                return True
 
         return False            
 
-    def matchFirstStringInputProperty(self, node):
+    def matchVariableName(self, node, varName):
         foundSearchResult = False
-        properties = node.getProperties(SDPropertyCategory.Input)
-        if properties:
-            foundStr = False
-            p = 0
-            psize = properties.getSize()
-            while p < psize and not foundStr:
-                prop = properties.getItem(p)
-                sdValStr = node.getPropertyValue(prop)
-                if sdValStr and isinstance(sdValStr, SDValueString):
-                    foundStr = True
-                    valStr = sdValStr.get()
-                    if self.isMatchingSearchStringCriteria(valStr):
-                        self.searchResults.appendPathNode(node, valStr, isFoundMatch=True, assignToCurrent=False)
-                        foundSearchResult = True
-                p += 1
-
+        if varName is not None and self.isMatchingSearchStringCriteria(varName):
+            self.searchResults.appendPathNode(node, varName, isFoundMatch=True, assignToCurrent=False)
+            foundSearchResult = True
         return foundSearchResult
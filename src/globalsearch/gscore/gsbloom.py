@@ -0,0 +1,80 @@
+# ---------------
+# Global Search - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import math, re, hashlib
+
+class GSBloomFilter:
+    """
+    Compact summary of the strings of a container, telling whether a search string may be found inside it.
+    Features are lowercase words (tokens) and trigrams, so any substring of 3 characters or more can be tested.
+    A negative answer is certain, a positive one may be a false positive.
+    """
+    FALSE_POSITIVE_RATE = 0.01
+    MIN_QUERY_LEN = 3
+    TOKEN_RE = re.compile(r"\w+")
+
+    @classmethod
+    def trigrams(cls, s):
+        return [s[i:i+3] for i in range(0, len(s) - 2)]
+
+    # features of a string being summarized
+    @classmethod
+    def stringFeatures(cls, s):
+        s = s.lower()
+        features = set(cls.trigrams(s))
+        features.update("w:" + t for t in cls.TOKEN_RE.findall(s))
+        return features
+
+    # features a container must have for a search string to be found inside it, None if the search string cannot be tested
+    @classmethod
+    def queryFeatures(cls, searchString, wholeWord):
+        s = searchString.lower()
+        hasWildcard = s.startswith("*") or s.endswith("*")
+        s = s.strip("*")
+        if len(s) < cls.MIN_QUERY_LEN:
+            return None
+        features = cls.trigrams(s)
+        if wholeWord and not hasWildcard and cls.TOKEN_RE.fullmatch(s):
+            # a whole word match of a single word is one of the words of the container
+            features.append("w:" + s)
+        return features
+
+    @classmethod
+    def fromFeatures(cls, features):
+        n = max(len(features), 1)
+        bitCount = max(64, int(math.ceil(-n * math.log(cls.FALSE_POSITIVE_RATE) / (math.log(2) ** 2))))
+        hashCount = max(1, int(round(bitCount / n * math.log(2))))
+        bloom = GSBloomFilter(bitCount, hashCount)
+        for f in features:
+            bloom.add(f)
+        return bloom
+
+    def __init__(self, bitCount, hashCount):
+        self.bitCount = bitCount
+        self.hashCount = hashCount
+        self.bits = bytearray((bitCount + 7) // 8)
+
+    # double hashing: bit positions h1 + i * h2 from a single digest
+    def positions(self, feature):
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bitCount for i in range(0, self.hashCount)]
+
+    def add(self, feature):
+        for p in self.positions(feature):
+            self.bits[p >> 3] |= 1 << (p & 7)
+
+    def mayContain(self, feature):
+        for p in self.positions(feature):
+            if not self.bits[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+    def mayContainAll(self, features):
+        for f in features:
+            if not self.mayContain(f):
+                return False
+        return True
@@ -0,0 +1,655 @@
+# ---------------
+# Global Search - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import os, hashlib, sqlite3
+
+import sd
+from sd.api.sdpackage import SDPackage
+from sd.api.sdgraph import SDGraph
+from sd.api.sbs.sdsbsfunctiongraph import SDSBSFunctionGraph
+from sd.api.sdproperty import SDPropertyCategory
+from sd.api.sdresourcefolder import SDResourceFolder
+from sd.api.sdgraphobjectcomment import SDGraphObjectComment
+from sd.api.sdgraphobjectframe import SDGraphObjectFrame
+from sd.api.sdgraphobjectpin import SDGraphObjectPin
+from sd.api.apiexception import APIException
+
+from globalsearch.gscore import gslog, gsstore
+from globalsearch.gscore.sdobj import SDObj
+from globalsearch.gscore.gswatcher import GSFileWatcher
+from globalsearch.gscore.gsbloom import GSBloomFilter
+
+class GSIndexContainer:
+    """
+    Content summary of a searchable container: package, folder, graph, function,
+    graph parameter function or system content (FX-Map graph, Pixel Processor function etc.)
+    """
+    def __init__(self, key, type, name, sdObj, parent=None, ownerNode=None):
+        self.key = key
+        self.type = type
+        self.name = name
+        self.sdObj = sdObj
+        self.parent = parent
+        self.ownerNode = ownerNode # graph node owning a parameter function or system content
+        self.strings = [] # searchable strings found directly in this container
+        self.children = [] # nested containers
+        self.nodeIds = [] # identifiers of the graph or function nodes, in SD API order
+        self.nodesByDefinition = {} # key: node definition id, value: list of node positions in nodeIds
+        self.summary = None # GSBloomFilter of the strings of this container and its nested containers (not built for packages)
+        self.nodesByGraphId = {} # key: identifier of the graph referenced by a node (i.e. graph instance), value: list of node positions in nodeIds
+        self.variableNames = {} # key: identifier of a Get or Set function node, value: its variable name
+        if parent:
+            parent.children.append(self)
+
+    def addNode(self, identifier, definitionId, graphId=None):
+        position = len(self.nodeIds)
+        self.nodeIds.append(identifier)
+        self.nodesByDefinition.setdefault(definitionId, []).append(position)
+        if graphId:
+            self.nodesByGraphId.setdefault(graphId, []).append(position)
+
+    def nodeCount(self):
+        return len(self.nodeIds)
+
+    # positions of the nodes having one of the given definitions or referencing one of the given graph identifiers, in SD API order
+    def nodePositions(self, definitions, graphIds=()):
+        positions = set()
+        for d in definitions:
+            positions.update(self.nodesByDefinition.get(d, ()))
+        for g in graphIds:
+            positions.update(self.nodesByGraphId.get(g, ()))
+        return sorted(positions)
+
+    def packageContainer(self):
+        c = self
+        while c.parent:
+            c = c.parent
+        return c
+
+    def chain(self):
+        # containers from the package down to self
+        containers = []
+        c = self
+        while c:
+            containers.append(c)
+            c = c.parent
+        containers.reverse()
+        return containers
+
+    def pathName(self):
+        # name to be assigned to search result path nodes, when not determined by the SD object itself
+        if self.type == SDObj.FUNC_PARAM or SDObj.isSystemContent(self.type):
+            return self.name
+        return ""
+
+class GSIndexSite:
+    """
+    Location of an indexed node
+    """
+    def __init__(self, container, node, identifier):
+        self.container = container # GSIndexContainer the node belongs to
+        self.node = node
+        self.identifier = identifier
+
+class GSVariableSite(GSIndexSite):
+    """
+    Location of a Get or Set function node
+    """
+    def __init__(self, container, node, identifier, definitionId):
+        super().__init__(container, node, identifier)
+        self.definitionId = definitionId
+
+    def isSetter(self):
+        return self.definitionId.startswith("sbs::function::set")
+
+    def getterKind(self):
+        # i.e. "get_float1", "get_bool", None for setters
+        return None if self.isSetter() else self.definitionId.rsplit("::", 1)[-1]
+
+class GSPackageIndex:
+    """
+    Indexed content of a single user package along with the state of its file at indexing time
+    """
+    def __init__(self, filePath):
+        self.filePath = filePath
+        self.mtime = 0
+        self.size = 0
+        self.contentHash = None
+        self.root = None # GSIndexContainer of the package
+        self.containers = {} # key: container key, value: GSIndexContainer
+        self.graphInstances = {} # key: referenced graph key, value: list of GSIndexSite of graph instance nodes
+        self.functionCalls = {} # key: called function key, value: list of GSIndexSite of function call nodes
+        self.variableSets = {} # key: variable name, value: list of GSVariableSite of Set nodes
+        self.variableGets = {} # key: variable name, value: list of GSVariableSite of Get nodes
+        self.inputNames = set() # graph, function and system node (i.e. Pixel Processor) input parameter ids, readable without being Set
+        self.graphInstancesById = {} # key: referenced graph identifier, value: list of GSIndexSite of graph instance nodes (used for library nodes)
+        self.nodesById = {} # key: node identifier, value: list of GSIndexSite of graph and function nodes
+
+    # the content hash recorded in the store is reused while the file modification time and size are unchanged
+    def updateFileState(self):
+        st = os.stat(self.filePath)
+        self.mtime = st.st_mtime_ns
+        self.size = st.st_size
+        state = GSIndex.storedFileState(self.filePath)
+        if state and state[0] == self.mtime and state[1] == self.size:
+            self.contentHash = state[2]
+        else:
+            self.contentHash = GSIndex.fileHash(self.filePath)
+            GSIndex.storeFileState(self)
+
+class GSIndexBuilder:
+    """
+    Extracts the searchable content of a package through the SD API in a single pass
+    """
+    def __init__(self, packageIndex):
+        self.packageIndex = packageIndex
+
+    def newContainer(self, key, type, name, sdObj, parent, ownerNode=None):
+        container = GSIndexContainer(key, type, name, sdObj, parent, ownerNode)
+        self.packageIndex.containers[key] = container
+        return container
+
+    def addSite(self, collection, key, container, node, identifier, site=None):
+        if site is None:
+            site = GSIndexSite(container, node, identifier)
+        sites = collection.get(key)
+        if sites is None:
+            collection[key] = [site]
+        else:
+            sites.append(site)
+        return site
+
+    def build(self, package):
+        filePath = self.packageIndex.filePath
+        root = self.newContainer(filePath, SDObj.PACKAGE, SDObj.name(package, SDObj.PACKAGE), package, None)
+        self.packageIndex.root = root
+        resources = package.getChildrenResources(False)
+        if resources:
+            for r in range(0, resources.getSize()):
+                self.indexResource(resources.getItem(r), root)
+        self.buildSummaries(root)
+
+    # builds the content summary of every container but packages, returns the summary features of the container
+    def buildSummaries(self, container):
+        features = set()
+        for s in container.strings:
+            features.update(GSBloomFilter.stringFeatures(s))
+        for child in container.children:
+            features.update(self.buildSummaries(child))
+        if container.type != SDObj.PACKAGE:
+            container.summary = GSBloomFilter.fromFeatures(features)
+        return features
+
+    def indexResource(self, resource, parent):
+        if isinstance(resource, SDSBSFunctionGraph):
+            container = self.newContainer(GSIndex.keyForSDObj(resource), SDObj.FUNCTION, SDObj.name(resource, SDObj.FUNCTION), resource, parent)
+            self.indexFunctionGraph(resource, container, isPackageFctDef=True)
+        elif isinstance(resource, SDGraph):
+            container = self.newContainer(GSIndex.keyForSDObj(resource), SDObj.GRAPH, SDObj.name(resource, SDObj.GRAPH), resource, parent)
+            self.indexGraph(resource, container)
+        elif isinstance(resource, SDResourceFolder):
+            container = self.newContainer(GSIndex.keyForSDObj(resource), SDObj.FOLDER, SDObj.name(resource, SDObj.FOLDER), resource, parent)
+            container.strings.append(resource.getIdentifier())
+            children = resource.getChildren(False)
+            if children:
+                for r in range(0, children.getSize()):
+                    self.indexResource(children.getItem(r), container)
+
+    def addIdAndLabel(self, propertyHolder, container):
+        for annotation in ("identifier", "label"):
+            v = propertyHolder.getPropertyValueFromId(annotation, SDPropertyCategory.Annotation)
+            if v and v.get():
+                container.strings.append(v.get())
+
+    def addInputNames(self, propertyHolder):
+        properties = propertyHolder.getProperties(SDPropertyCategory.Input)
+        if properties:
+            for p in range(0, properties.getSize()):
+                self.packageIndex.inputNames.add(properties.getItem(p).getId())
+
+    def indexGraphObjects(self, graph, container):
+        graphObjects = graph.getGraphObjects()
+        if graphObjects:
+            for g in range(0, graphObjects.getSize()):
+                graphObject = graphObjects.getItem(g)
+                if isinstance(graphObject, SDGraphObjectFrame):
+                    try:
+                        title = graphObject.getTitle()
+                        if title:
+                            container.strings.append(title)
+                    except APIException as e:
+                        gslog.error("Indexing frame title failed in " + container.key + ": " + str(e))
+                if isinstance(graphObject, (SDGraphObjectFrame, SDGraphObjectPin, SDGraphObjectComment)):
+                    desc = graphObject.getDescription()
+                    if desc:
+                        container.strings.append(desc)
+
+    def indexGraph(self, graph, container):
+        self.addIdAndLabel(graph, container)
+        self.indexGraphObjects(graph, container)
+        self.addInputNames(graph)
+
+        nodes = graph.getNodes()
+        for n in range(0, nodes.getSize()):
+            self.indexGraphNode(nodes.getItem(n), container)
+
+    def indexGraphNode(self, node, container):
+        nodeType, _ = SDObj.type(node)
+        identifier = node.getIdentifier()
+        container.strings.append(identifier)
+        refRes = node.getReferencedResource()
+        isGraphInstance = nodeType == SDObj.GRAPH_INSTANCE and isinstance(refRes, SDGraph)
+        container.addNode(identifier, node.getDefinition().getId(), refRes.getIdentifier() if isinstance(refRes, SDGraph) else None)
+        self.addSite(self.packageIndex.nodesById, identifier, container, node, identifier)
+
+        if SDObj.isInputNode(nodeType) or nodeType == SDObj.OUTPUT:
+            v = node.getAnnotationPropertyValueFromId('identifier')
+            if v and v.get():
+                container.strings.append(v.get())
+
+        # graph parameter functions
+        properties = node.getProperties(SDPropertyCategory.Input)
+        if properties:
+            for p in range(0, properties.getSize()):
+                prop = properties.getItem(p)
+                propGraph = node.getPropertyGraph(prop)
+                if propGraph and not prop.isFunctionOnly():
+                    key = container.key + "#" + identifier + "/" + prop.getId()
+                    paramContainer = self.newContainer(key, SDObj.FUNC_PARAM, prop.getLabel(), propGraph, container, ownerNode=node)
+                    self.indexFunctionGraph(propGraph, paramContainer, isPackageFctDef=False)
+
+        if isGraphInstance:
+            site = self.addSite(self.packageIndex.graphInstances, GSIndex.keyForSDObj(refRes), container, node, identifier)
+            self.addSite(self.packageIndex.graphInstancesById, refRes.getIdentifier(), container, node, identifier, site)
+
+        # system nodes having inner graphs (FX-Map, Pixel Processor, Value Processor)
+        if SDObj.hasSystemContent(nodeType):
+            self.addInputNames(node) # node inputs (i.e. Pixel Processor inputs) are readable from its inner function
+            if refRes:
+                key = container.key + "#" + identifier + "/content"
+                subType = SDObj.systemContentType(nodeType)
+                systemContainer = self.newContainer(key, subType, SDObj.systemGraphName(nodeType), refRes, container, ownerNode=node)
+                if isinstance(refRes, SDSBSFunctionGraph):
+                    self.indexFunctionGraph(refRes, systemContainer, isPackageFctDef=False)
+                else:
+                    self.indexGraph(refRes, systemContainer)
+
+    def indexFunctionGraph(self, functionGraph, container, isPackageFctDef):
+        # name and inputs are searched for any function, not only package function definitions
+        self.addIdAndLabel(functionGraph, container)
+        if isPackageFctDef:
+            self.addInputNames(functionGraph)
+        properties = functionGraph.getProperties(SDPropertyCategory.Input)
+        if properties:
+            for p in range(0, properties.getSize()):
+                prop = properties.getItem(p)
+                container.strings.append(prop.getId())
+                label = prop.getLabel()
+                if label:
+                    container.strings.append(label)
+
+        self.indexGraphObjects(functionGraph, container)
+
+        nodes = functionGraph.getNodes()
+        for n in range(0, nodes.getSize()):
+            self.indexFunctionNode(nodes.getItem(n), container)
+
+    def indexFunctionNode(self, node, container):
+        identifier = node.getIdentifier()
+        container.strings.append(identifier)
+        defId = node.getDefinition().getId()
+        container.addNode(identifier, defId)
+        self.addSite(self.packageIndex.nodesById, identifier, container, node, identifier)
+        if SDObj.isVariableNodeDefinition(defId):
+            varName = SDObj.variableName(node)
+            if varName:
+                container.strings.append(varName)
+                container.variableNames[identifier] = varName
+                site = GSVariableSite(container, node, identifier, defId)
+                collection = self.packageIndex.variableSets if site.isSetter() else self.packageIndex.variableGets
+                self.addSite(collection, varName, container, node, identifier, site)
+        elif defId == "sbs::function::instance":
+            calledFunction = node.getReferencedResource()
+            if calledFunction:
+                container.strings.append(calledFunction.getIdentifier())
+                self.addSite(self.packageIndex.functionCalls, GSIndex.keyForSDObj(calledFunction), container, node, identifier)
+
+class GSIndex:
+    """
+    Content index of the user packages, kept up to date incrementally: a file watcher reports
+    package files being saved and only the packages whose content actually changed are re-extracted.
+    """
+    HASH_CHUNK_SIZE = 1024 * 1024
+    ROOT_KEY = "" # key of the global root in search result paths
+
+    @classmethod
+    def classInit(cls):
+        global g_gsindex
+        g_gsindex = GSIndex()
+
+    @classmethod
+    def classDeinit(cls):
+        index = globals().get("g_gsindex")
+        if index:
+            index.stopWatching()
+        globals()["g_gsindex"] = None
+
+    @classmethod
+    def normPath(cls, filePath):
+        return os.path.normcase(os.path.abspath(filePath))
+
+    @classmethod
+    def fileHash(cls, filePath):
+        h = hashlib.blake2b(digest_size=16)
+        with open(filePath, "rb") as f:
+            chunk = f.read(cls.HASH_CHUNK_SIZE)
+            while chunk:
+                h.update(chunk)
+                chunk = f.read(cls.HASH_CHUNK_SIZE)
+        return h.hexdigest()
+
+    # package file states, kept in the store (see GSStore) across sessions
+    @classmethod
+    def storedFileState(cls, filePath):
+        try:
+            return gsstore.g_gsstore.packageFileState(filePath) if gsstore.g_gsstore else None
+        except sqlite3.Error:
+            return None
+
+    @classmethod
+    def storeFileState(cls, packageIndex):
+        try:
+            if gsstore.g_gsstore:
+                gsstore.g_gsstore.setPackageFileState(packageIndex.filePath, packageIndex.mtime, packageIndex.size, packageIndex.contentHash)
+        except sqlite3.Error as e:
+            gslog.warning("Storing package file state failed: " + str(e))
+
+    def __init__(self):
+        self.packages = {} # key: normalized package file path, value: GSPackageIndex
+        self.containers = {} # containers of all indexed packages, key: container key (see keyForSDObj), value: GSIndexContainer
+        self.packageOrder = [] # package paths in the user package order
+        self.pendingPaths = [] # user packages waiting to be indexed
+        self.watchDirs = [] # asset directories watched in addition to the user packages
+        self.watcher = GSFileWatcher()
+        self.watching = False
+
+    # --- package tracking
+    def userPackages(self):
+        packages = {}
+        pkgs = sd.getContext().getSDApplication().getPackageMgr().getUserPackages()
+        if pkgs:
+            for p in range(0, pkgs.getSize()):
+                pkg = pkgs.getItem(p)
+                filePath = pkg.getFilePath()
+                if filePath:
+                    packages[self.normPath(filePath)] = pkg
+        return packages
+
+    def userPackageForPath(self, path):
+        return self.userPackages().get(path)
+
+    # synchronizes indexed packages with the currently loaded user packages
+    def syncPackages(self):
+        packages = self.userPackages()
+        self.packageOrder = list(packages.keys())
+        for path in list(self.packages.keys()):
+            if path not in packages:
+                self.removePackage(path)
+        for path in packages.keys():
+            if path not in self.packages and path not in self.pendingPaths:
+                self.pendingPaths.append(path)
+        self.updateWatched(packages.keys())
+
+    def removePackage(self, path):
+        self.forgetContainers(self.packages.pop(path, None))
+        SDObj.invalidateNameCache()
+        if path in self.pendingPaths:
+            self.pendingPaths.remove(path)
+
+    def clear(self):
+        self.packages = {}
+        self.containers = {}
+        self.packageOrder = []
+        self.pendingPaths = []
+
+    def forgetContainers(self, packageIndex):
+        if packageIndex:
+            for key in packageIndex.containers.keys():
+                self.containers.pop(key, None)
+
+    # indexed packages in the same order as a traversal of the user packages
+    def orderedPackageIndexes(self):
+        return [self.packages[path] for path in self.packageOrder if path in self.packages]
+
+    # make sure every loaded user package (or only the one at path) is indexed, to be used before answering a query
+    def ensureIndexed(self, path=None):
+        self.syncPackages()
+        if path is not None:
+            if path in self.pendingPaths:
+                self.pendingPaths.remove(path)
+                pkg = self.userPackageForPath(path)
+                if pkg:
+                    self.indexPackage(path, pkg)
+        elif self.hasPendingPackages():
+            self.indexPendingPackages(maxCount=len(self.pendingPaths))
+
+    def hasPendingPackages(self):
+        return len(self.pendingPaths) > 0
+
+    # index up to maxCount pending packages, so a full indexing can be spread over several UI idle cycles
+    def indexPendingPackages(self, maxCount=1):
+        count = 0
+        while self.pendingPaths and count < maxCount:
+            path = self.pendingPaths.pop(0)
+            pkg = self.userPackageForPath(path)
+            if pkg:
+                self.indexPackage(path, pkg)
+            count += 1
+        return count
+
+    def indexPackage(self, path, package):
+        packageIndex = GSPackageIndex(path)
+        try:
+            if os.path.isfile(path):
+                packageIndex.updateFileState()
+            GSIndexBuilder(packageIndex).build(package)
+        except (APIException, OSError) as e:
+            gslog.error("Indexing package failed: " + path + " " + str(e))
+            return None
+        self.forgetContainers(self.packages.get(path))
+        self.packages[path] = packageIndex # replaced in place once fully built
+        self.containers.update(packageIndex.containers)
+        SDObj.invalidateNameCache() # package content changed
+        return packageIndex
+
+    # re-extracts a package only if its file changed since last indexing
+    def refreshPackageFile(self, path):
+        if path in self.pendingPaths:
+            return False # indexed on next update
+        packageIndex = self.packages.get(path)
+        if packageIndex is None:
+            pkg = self.userPackageForPath(path)
+            if pkg:
+                self.indexPackage(path, pkg)
+                return True
+            return False # .sbs file from a watched directory which is not loaded
+
+        if not self.isFileModified(packageIndex):
+            return False
+
+        pkg = self.userPackageForPath(path)
+        if pkg is None:
+            return False
+        gslog.info("Re-indexing modified package " + path)
+        return self.indexPackage(path, pkg) is not None
+
+    # Whether the file of an indexed package changed since indexing. The file content hash is compared when its
+    # modification time or size changed, the recorded file state being updated if the content is the same.
+    def isFileModified(self, packageIndex):
+        path = packageIndex.filePath
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if st.st_mtime_ns == packageIndex.mtime and st.st_size == packageIndex.size:
+            return False
+        try:
+            if self.fileHash(path) == packageIndex.contentHash:
+                packageIndex.mtime = st.st_mtime_ns
+                packageIndex.size = st.st_size
+                self.storeFileState(packageIndex)
+                return False
+        except OSError:
+            return False
+        return True
+
+    # a package having been saved (see GSPackageTracker) is re-indexed on next update or query
+    def markStale(self, path):
+        if path in self.packages and path not in self.pendingPaths:
+            self.pendingPaths.append(path)
+
+    # queues for re-indexing the indexed packages (or only the one at path) whose file changed, for when package files are not watched
+    def queueModifiedPackages(self, path=None):
+        for p, packageIndex in self.packages.items():
+            if (path is None or p == path) and p not in self.pendingPaths and self.isFileModified(packageIndex):
+                self.pendingPaths.append(p)
+
+    # --- file watching
+    def setWatchDirs(self, dirs):
+        self.watchDirs = [d for d in dirs if d]
+        self.updateWatched(self.packages.keys() | set(self.pendingPaths))
+
+    def updateWatched(self, packagePaths):
+        self.watcher.setWatched(packagePaths, self.watchDirs)
+
+    def startWatching(self):
+        if not self.watching:
+            self.watcher.start()
+            self.watching = True
+            gslog.info("Package file watcher started (" + ("inotify" if self.watcher.isInotify() else "polling") + ")")
+
+    def stopWatching(self):
+        if self.watching:
+            self.watcher.stop()
+            self.watching = False
+
+    # to be called from the UI thread: processes package files changed since last call
+    def processFileChanges(self):
+        for logFunctionName, message in self.watcher.popLogs():
+            getattr(gslog, logFunctionName)(message)
+        refreshed = 0
+        for path in self.watcher.popChangedPaths():
+            if self.refreshPackageFile(path):
+                refreshed += 1
+        return refreshed
+
+    # --- queries
+    def isReady(self):
+        return len(self.packages) > 0 and not self.hasPendingPackages()
+
+    def packageIndexForPath(self, filePath):
+        return self.packages.get(self.normPath(filePath))
+
+    def container(self, key):
+        return self.containers.get(key)
+
+    # usages of a graph (graph instance nodes) or function (function call nodes) across all indexed packages, in traversal order
+    def usages(self, resource):
+        key = self.keyForSDObj(resource)
+        isFunction = isinstance(resource, SDSBSFunctionGraph)
+        sites = []
+        for packageIndex in self.orderedPackageIndexes():
+            collection = packageIndex.functionCalls if isFunction else packageIndex.graphInstances
+            sites.extend(collection.get(key, []))
+        return sites
+
+    # --- variables
+    def variableSites(self, name):
+        sets = []
+        gets = []
+        for packageIndex in self.orderedPackageIndexes():
+            sets.extend(packageIndex.variableSets.get(name, []))
+            gets.extend(packageIndex.variableGets.get(name, []))
+        return sets, gets
+
+    def variableNames(self, setters):
+        names = set()
+        for packageIndex in self.packages.values():
+            names.update((packageIndex.variableSets if setters else packageIndex.variableGets).keys())
+        return names
+
+    def inputNames(self):
+        names = set()
+        for packageIndex in self.packages.values():
+            names.update(packageIndex.inputNames)
+        return names
+
+    # names of variables having Set nodes and no Get node
+    def variablesSetButNeverRead(self):
+        return sorted(self.variableNames(setters=True) - self.variableNames(setters=False))
+
+    # names of variables having Get nodes and no Set node, excluding system variables ($pos etc.) and input parameters
+    def variablesReadButNeverSet(self):
+        names = self.variableNames(setters=False) - self.variableNames(setters=True) - self.inputNames()
+        return sorted(n for n in names if not n.startswith("$"))
+
+    # --- nodes
+    # graph and function nodes having the given identifier, in traversal order
+    def nodeSites(self, identifier):
+        sites = []
+        for packageIndex in self.orderedPackageIndexes():
+            sites.extend(packageIndex.nodesById.get(identifier, []))
+        return sites
+
+    # --- library nodes
+    # list of (packageIndex, {library node identifier: instance count}) for the library nodes found in libraryNodes
+    # (i.e. GSSDLibrary.nodes), counting only instances within rootKey if provided
+    def libraryUsageReport(self, libraryNodes, rootKey=None):
+        report = []
+        for packageIndex in self.orderedPackageIndexes():
+            counts = {}
+            for identifier, sites in packageIndex.graphInstancesById.items():
+                if identifier in libraryNodes:
+                    count = len(sites) if rootKey is None else sum(1 for site in sites if self.isSiteInRoot(site, rootKey))
+                    if count > 0:
+                        counts[identifier] = count
+            if len(counts) > 0:
+                report.append((packageIndex, counts))
+        return report
+
+    # --- search result paths
+    def isSiteInRoot(self, site, rootKey):
+        if rootKey is None:
+            return True
+        c = site.container
+        while c:
+            if c.key == rootKey:
+                return True
+            c = c.parent
+        return False
+
+    # list of (key, sdObj, subType, name) leading to the container of a site, used to build search result paths.
+    # Paths start at the search root container if rootKey is provided, else at a global root like a search over all packages
+    def sitePathEntries(self, site, rootKey=None):
+        entries = [] if rootKey else [(self.ROOT_KEY, None, SDObj.ROOT, "Root")]
+        chain = site.container.chain()
+        if rootKey:
+            chain = chain[[c.key for c in chain].index(rootKey):]
+        for c in chain:
+            if c.ownerNode and c.key != rootKey:
+                entries.append((c.parent.key + "#" + c.ownerNode.getIdentifier(), c.ownerNode, SDObj.UNDEFINED, ""))
+            entries.append((c.key, c.sdObj, c.type, c.pathName()))
+        if rootKey:
+            # like a traversal, the search root path node is typed as root
+            entries[0] = (rootKey, chain[0].sdObj, SDObj.ROOT, "")
+        return entries
+
+    # Keys are stable across SD API calls (unlike Python wrappers of SD objects): packages are identified by their
+    # file path, resources by their package file path and their url within the package
+    @classmethod
+    def keyForSDObj(cls, sdObj):
+        if isinstance(sdObj, SDPackage):
+            return cls.normPath(sdObj.getFilePath())
+        return cls.normPath(sdObj.getFilePath()) + "|" + sdObj.getUrl().split("?")[0]
@@ -0,0 +1,151 @@
+# ---------------
+# Global Search - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import json
+
+class GSJSONStreamReader:
+    """
+    Reads a JSON document from a file in chunks, so the items of a large array can be processed one at a time
+    without the whole document being held in memory. Only the array items are decoded, other values are skipped.
+    """
+    CHUNK_SIZE = 64 * 1024
+    WHITESPACE = " \t\n\r"
+
+    def __init__(self, file):
+        self.file = file
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    # --- buffer
+    def fill(self):
+        # reads the next chunk, dropping the already consumed part of the buffer
+        if self.eof:
+            return False
+        chunk = self.file.read(self.CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        self.skipWhitespace()
+        if self.pos >= len(self.buffer) and not self.fill():
+            raise ValueError("Unexpected end of JSON document")
+        return self.buffer[self.pos]
+
+    def skipWhitespace(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in self.WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self.fill():
+                return
+
+    def expect(self, c):
+        if self.peek() != c:
+            raise ValueError("JSON: expected '" + c + "' at offset " + str(self.pos))
+        self.pos += 1
+
+    # decodes an object, array or string value, reading more chunks until it is complete
+    def readValue(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                self.pos = end
+                return value
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+
+    # decodes a number or literal (true, false, null), reading more chunks until it is delimited
+    def readScalar(self):
+        self.peek()
+        while True:
+            end = self.pos
+            while end < len(self.buffer) and self.buffer[end] not in ",]}" and self.buffer[end] not in self.WHITESPACE:
+                end += 1
+            if end < len(self.buffer) or not self.fill():
+                break
+        value = json.loads(self.buffer[self.pos:end])
+        self.pos = end
+        return value
+
+    # skips a value without decoding it
+    def skipValue(self):
+        depth = 0
+        inString = False
+        escaped = False
+        self.peek()
+        while True:
+            buffer = self.buffer
+            while self.pos < len(buffer):
+                c = buffer[self.pos]
+                self.pos += 1
+                if inString:
+                    if escaped:
+                        escaped = False
+                    elif c == "\\":
+                        escaped = True
+                    elif c == '"':
+                        inString = False
+                        if depth == 0:
+                            return
+                elif c == '"':
+                    inString = True
+                elif c == "{" or c == "[":
+                    depth += 1
+                elif c == "}" or c == "]":
+                    if depth == 0:
+                        self.pos -= 1 # end of a number or literal
+                        return
+                    depth -= 1
+                    if depth == 0:
+                        return
+                elif depth == 0 and (c == "," or c in self.WHITESPACE):
+                    self.pos -= 1 # end of a number or literal
+                    return
+            if not self.fill():
+                return
+
+    # --- document
+    # yields the items of the array found under key in the top level object
+    def iterArrayItems(self, key):
+        self.expect("{")
+        if self.peek() == "}":
+            return
+        while True:
+            name = self.readValue()
+            self.expect(":")
+            if name == key and self.peek() == "[":
+                yield from self.iterArray()
+            else:
+                self.skipValue()
+            c = self.peek()
+            self.pos += 1
+            if c == "}":
+                return
+            if c != ",":
+                raise ValueError("JSON: expected ',' or '}' at offset " + str(self.pos))
+
+    def iterArray(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            if self.peek() in "{[\"":
+                yield self.readValue()
+            else:
+                yield self.readScalar()
+            c = self.peek()
+            self.pos += 1
+            if c == "]":
+                return
+            if c != ",":
+                raise ValueError("JSON: expected ',' or ']' at offset " + str(self.pos))
@@ -3,7 +3,8 @@
 # (c) 2019-2025 Eyosido Software SARL
 # ---------------
 
-import logging
+import logging, time
+from contextlib import contextmanager
 import sd
 
 class GSLogger:
@@ -61,6 +62,29 @@ class GSLogger:
             elif level == self.ERROR:
                 logger.log(msg, LogLevel.Error, gs)
 
+class GSStageTimer:
+    """
+    Measures the successive stages of a process (i.e. plugin startup), each stage duration being logged as it ends
+    """
+    def __init__(self, name):
+        self.name = name
+        self.total = 0.0 # s
+
+    def logStage(self, stageName, duration):
+        self.total += duration
+        info(self.name + ": " + stageName + " {:.1f} ms".format(duration * 1000))
+
+    @contextmanager
+    def stage(self, stageName):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.logStage(stageName, time.perf_counter() - start)
+
+    def logTotal(self):
+        info(self.name + ": total {:.1f} ms".format(self.total * 1000))
+
 def debug(msg):
     g_gslog.log(GSLogger.DEBUG, '[DEBUG]' + msg)
 
@@ -0,0 +1,111 @@
+# ---------------
+# Global Search - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import sd
+
+from globalsearch.gscore import gslog
+
+class GSPackageTracker:
+    """
+    Tracks the list of loaded user packages. Designer file load/close notifications are subscribed to when the
+    application provides them, a fingerprint of the user package list (their file paths) is compared on each check
+    so only added and removed packages are reported.
+    """
+    # SDApplication callback registration methods, not all of them exist in every Designer version
+    EVENT_REGISTRATIONS = ("registerAfterFileLoadedCallback", "registerAfterFileSavedCallback",
+                           "registerBeforeFileClosedCallback", "registerAfterFileClosedCallback")
+    UNSAVED_KEY_PREFIX = "?unsaved:"
+    UNSAVED_POSITION_KEY_PREFIX = "?unsaved#"
+
+    def __init__(self, onEvent, onSaved = None):
+        self.onEvent = onEvent # called on package load/save/close notification
+        self.onSaved = onSaved # called with the file path of a saved package, before onEvent
+        self.callbackIds = []
+        self.fingerprint = None
+
+    # --- notifications
+    def subscribe(self):
+        app = sd.getContext().getSDApplication()
+        for registration in self.EVENT_REGISTRATIONS:
+            register = getattr(app, registration, None)
+            if register:
+                callback = self.onFileSavedEvent if registration == "registerAfterFileSavedCallback" else self.onFileEvent
+                try:
+                    self.callbackIds.append(register(callback))
+                except Exception as e:
+                    gslog.debug("Package tracker: " + registration + " failed: " + str(e))
+        return self.hasNotifications()
+
+    def unsubscribe(self):
+        app = sd.getContext().getSDApplication()
+        unregister = getattr(app, "unregisterCallback", None)
+        if unregister:
+            for callbackId in self.callbackIds:
+                try:
+                    unregister(callbackId)
+                except Exception:
+                    pass
+        self.callbackIds = []
+
+    def hasNotifications(self):
+        return len(self.callbackIds) > 0
+
+    def onFileEvent(self, *args):
+        self.onEvent()
+
+    # arguments: file path, save succeeded
+    def onFileSavedEvent(self, *args):
+        if self.onSaved and len(args) > 0 and args[0] and (len(args) < 2 or args[1]):
+            self.onSaved(args[0])
+        self.onEvent()
+
+    # --- package list
+    # user packages as (key, package) tuples, key being the package file path (see unsavedPackageKey for unsaved packages)
+    @classmethod
+    def userPackages(cls):
+        packages = []
+        unsavedCount = 0
+        pkgs = sd.getContext().getSDApplication().getPackageMgr().getUserPackages()
+        if pkgs:
+            for p in range(0, pkgs.getSize()):
+                pkg = pkgs.getItem(p)
+                key = pkg.getFilePath()
+                if not key:
+                    key = cls.unsavedPackageKey(pkg, unsavedCount)
+                    unsavedCount += 1
+                packages.append((key, pkg))
+        return packages
+
+    # Key of an unsaved package: the dependency its resource urls refer to (i.e. "pkg:///graph?dependency=1234"), which
+    # identifies the package while it is loaded. Empty packages have no such url and are keyed by their position among
+    # unsaved packages, this key not identifying a package (see isPositionKey).
+    @classmethod
+    def unsavedPackageKey(cls, pkg, unsavedCount):
+        try:
+            resources = pkg.getChildrenResources(False)
+            if resources and resources.getSize() > 0:
+                url = resources.getItem(0).getUrl()
+                if "?" in url:
+                    return cls.UNSAVED_KEY_PREFIX + url.split("?", 1)[1]
+        except Exception:
+            pass
+        return cls.UNSAVED_POSITION_KEY_PREFIX + str(unsavedCount)
+
+    @classmethod
+    def isPositionKey(cls, key):
+        return key.startswith(cls.UNSAVED_POSITION_KEY_PREFIX)
+
+    # returns (added keys, removed keys) since last check, None if the package list did not change
+    def checkChanges(self):
+        fingerprint = tuple(key for key, _ in self.userPackages())
+        if fingerprint == self.fingerprint:
+            return None
+        previous = self.fingerprint if self.fingerprint else ()
+        self.fingerprint = fingerprint
+        previousKeys = set(previous)
+        keys = set(fingerprint)
+        added = [key for key in fingerprint if key not in previousKeys]
+        removed = [key for key in previous if key not in keys]
+        return (added, removed)
@@ -9,4 +9,7 @@ class GSPresetTypes:
     SP_PARAM_CUSTOM_FUNC = 1 # graph parameters with custom functions
     SP_TODO = 2 # TODO
     SP_TMP = 3  # TMP
-    SP_LAST = 4
\ No newline at end of file
+    SP_VAR_SET_NOT_READ = 4 # variables set but never read
+    SP_VAR_READ_NOT_SET = 5 # variables read but never set
+    SP_LIBRARY_USAGE = 6 # library node instance count per package
+    SP_LAST = 7
\ No newline at end of file
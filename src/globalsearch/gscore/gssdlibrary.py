@@ -3,14 +3,19 @@
 # (c) 2019-2025 Eyosido Software SARL
 # ---------------
 
-import os, json
-from globalsearch.gscore import gslog
+import os, marshal, sqlite3, threading
+from globalsearch.gscore import gslog, gsstore
+from globalsearch.gscore.gsjsonstream import GSJSONStreamReader
 
 # Accesses the default Designer Substance library nodes
 class GSSDLibrary:
     DB_PATH_WIN = "Adobe/Adobe Substance 3D Designer/databases/resources.json" # inside %LOCALAPPDATA%
     DB_PATH_MAC = "~/Library/Application Support/Adobe/Adobe Substance 3D Designer/databases/resources.json"
 
+    # The library nodes extracted from the SD DB are cached in the store (see GSStore), valid as long as the SD DB file modification time and size are unchanged
+    CACHE_NAME = "sdlibrary"
+    CACHE_VERSION = 1
+
     # indices of fields inside self.nodes values
     LABEL = 0
     SBS_PATH = 1
@@ -19,56 +24,129 @@ class GSSDLibrary:
     def classInit(cls):
         global g_gssdlibrary
         g_gssdlibrary = GSSDLibrary()
+        g_gssdlibrary.startLoading()
 
     @classmethod
     def classDeinit(cls):
         globals()["g_gssdlibrary"] = None
 
+    @classmethod
+    def dbPath(cls):
+        return os.path.join(os.getenv('LOCALAPPDATA'), cls.DB_PATH_WIN) if os.name == 'nt' else os.path.expanduser(cls.DB_PATH_MAC)
+
+    @classmethod
+    def cacheStamp(cls, dbStat):
+        return str(cls.CACHE_VERSION) + ":" + str(dbStat.st_mtime_ns) + ":" + str(dbStat.st_size)
+
     def __init__(self):
         self.nodes = {} # key: node id, value: (label, sbs_path)
+        self.loadThread = None
+        self.loaded = threading.Event()
+        self.logs = [] # (log function, message) logged during loading, flushed from the UI thread
 
     def entry(self, identifier):
+        self.waitLoaded()
         return self.nodes.get(identifier)
 
-    def load(self):
-        if len(self.nodes) == 0:            
-            db_path = os.path.join(os.getenv('LOCALAPPDATA'), self.DB_PATH_WIN) if os.name == 'nt' else self.DB_PATH_MAC
-            db = None
-
-            if os.path.isfile(db_path):
-                try:
-                    with open(db_path, "r") as file:
-                        db = json.load(file)
-                    gslog.info("SD DB loaded from " + db_path)               
-                except Exception as e:
-                    gslog.error("Loading SD DB failed: " + str(e))
+    # loads library nodes on a background thread, so the plugin startup does not depend on the size of the SD DB
+    def startLoading(self):
+        if self.loadThread is None and not self.loaded.is_set():
+            self.loadThread = threading.Thread(target=self.doLoad, name="GlobalSearchLibraryLoader", daemon=True)
+            self.loadThread.start()
+
+    def isLoaded(self):
+        loaded = self.loaded.is_set()
+        if loaded:
+            self.flushLogs()
+        return loaded
+
+    def waitLoaded(self):
+        if not self.loaded.is_set():
+            if self.loadThread is None:
+                self.doLoad() # loading not started, load synchronously
             else:
-                gslog.info("SD DB was not found, SD library nodes won't be available as search filter. Path=" + db_path)
-
-            if db:
-                try:
-                    resources = db["resources"]
-                    for r in resources:
-                        if r.get("is_listable"):
-                            extension = r.get("extension")
-                            if extension and extension == "graph":
-                                ident = r.get("basename")
-                                if ident:
-                                    sbs = r.get("archive_url")
-                                    if sbs:
-                                        metadata = r.get("metadata")
-                                        if metadata:
-                                            hideInLibrary = metadata.get("hideInLibrary")
-                                            if not hideInLibrary or hideInLibrary == "0":
-                                                label = metadata.get("label")
-                                                if label:
-                                                    self.nodes[ident] = (label, sbs)
-                except Exception as e:
-                    gslog.error("Parsing SD DB failed: " + str(e))
+                self.loaded.wait()
+        self.flushLogs()
+
+    def log(self, logFunction, message):
+        self.logs.append((logFunction, message))
 
+    def flushLogs(self):
+        while self.logs:
+            logFunction, message = self.logs.pop(0)
+            logFunction(message)
+
+    def load(self):
+        self.waitLoaded()
         return self.nodes
 
+    # no SD API call in here (logging included) as it may run on a background thread
+    def doLoad(self):
+        nodes = {}
+        db_path = self.dbPath()
+        if os.path.isfile(db_path):
+            try:
+                st = os.stat(db_path)
+                nodes = self.loadCache(st)
+                if nodes is None:
+                    nodes = self.parseDB(db_path)
+                    self.saveCache(st, nodes)
+            except Exception as e:
+                self.log(gslog.error, "Loading SD DB failed: " + str(e))
+                nodes = {}
+        else:
+            self.log(gslog.info, "SD DB was not found, SD library nodes won't be available as search filter. Path=" + db_path)
 
+        self.nodes = nodes
+        self.loaded.set()
 
+    def loadCache(self, dbStat):
+        nodes = None
+        store = gsstore.g_gsstore
+        try:
+            data = store.cachedData(self.CACHE_NAME, self.cacheStamp(dbStat)) if store else None
+            if data is not None:
+                nodes = marshal.loads(data)
+                self.log(gslog.info, "SD DB loaded from cache")
+        except (sqlite3.Error, EOFError, ValueError, TypeError):
+            pass # no cache or unreadable cache (i.e. from another Python version), rebuilt from the SD DB
+        return nodes
 
-    
+    def saveCache(self, dbStat, nodes):
+        store = gsstore.g_gsstore
+        try:
+            if store:
+                store.setCachedData(self.CACHE_NAME, self.cacheStamp(dbStat), marshal.dumps(nodes))
+        except sqlite3.Error as e:
+            self.log(gslog.error, "Writing SD DB cache failed: " + str(e))
+
+    # the SD DB being a large document, its resources are read one at a time, keeping only the library nodes
+    # read or parsing errors are raised so that partial results are not cached
+    def parseDB(self, db_path):
+        nodes = {}
+        with open(db_path, "r") as file:
+            for r in GSJSONStreamReader(file).iterArrayItems("resources"):
+                entry = self.libraryNodeEntry(r)
+                if entry:
+                    nodes[entry[0]] = entry[1]
+        self.log(gslog.info, "SD DB loaded from " + db_path)
+        return nodes
+
+    # (identifier, (label, sbs_path)) of a SD DB resource being a library node, else None
+    @classmethod
+    def libraryNodeEntry(cls, r):
+        if isinstance(r, dict) and r.get("is_listable"):
+            extension = r.get("extension")
+            if extension and extension == "graph":
+                ident = r.get("basename")
+                if ident:
+                    sbs = r.get("archive_url")
+                    if sbs:
+                        metadata = r.get("metadata")
+                        if metadata:
+                            hideInLibrary = metadata.get("hideInLibrary")
+                            if not hideInLibrary or hideInLibrary == "0":
+                                label = metadata.get("label")
+                                if label:
+                                    return (ident, (label, sbs))
+        return None
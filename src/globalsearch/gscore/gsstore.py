@@ -0,0 +1,199 @@
+# ---------------
+# Global Search - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import os, json, sqlite3, threading
+from contextlib import contextmanager
+from globalsearch.gscore import gslog
+
+class GSStore:
+    """
+    Persistent state of the plugin in a single SQLite database: preferences, search history and navigation,
+    cached results and content index metadata. The database is in WAL mode, each change is written in its own
+    transaction and only the rows it affects are written, so a crash never leaves a partially written state.
+    Usable from any thread, accesses are serialized. JSON files of previous versions are imported once (see migrateJSONFile).
+    """
+    FILENAME = "gsstore.db"
+
+    """
+    Schema versions:
+    1: initial version
+    """
+    SCHEMA_VERSION = 1
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+        "CREATE TABLE IF NOT EXISTS prefs (name TEXT PRIMARY KEY, value TEXT)", # value: JSON
+        "CREATE TABLE IF NOT EXISTS history (key TEXT PRIMARY KEY, text TEXT, seq INTEGER)", # key: case folded text, seq: higher is more recent
+        "CREATE TABLE IF NOT EXISTS navigation (id INTEGER PRIMARY KEY AUTOINCREMENT, item TEXT)", # item: JSON
+        "CREATE TABLE IF NOT EXISTS cache (name TEXT PRIMARY KEY, stamp TEXT, data BLOB)", # stamp: validity of data, i.e. source file state
+        "CREATE TABLE IF NOT EXISTS index_meta (path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, content_hash TEXT)"
+    )
+
+    @classmethod
+    def classInit(cls):
+        global g_gsstore
+        g_gsstore = GSStore.open(cls.filename())
+
+    @classmethod
+    def classDeinit(cls):
+        store = globals().get("g_gsstore")
+        if store:
+            store.close()
+        globals()["g_gsstore"] = None
+
+    @classmethod
+    def filename(cls):
+        path = os.path.dirname(os.path.dirname(__file__)) # go one folder up
+        return os.path.join(path, cls.FILENAME)
+
+    # opens the store, falling back to a non persistent one if the database cannot be opened (i.e. read-only plugin folder)
+    @classmethod
+    def open(cls, path):
+        try:
+            return GSStore(path)
+        except sqlite3.Error as e:
+            gslog.error("Opening " + path + " failed, state won't be persistent: " + str(e))
+            return GSStore(":memory:")
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None) # transactions are explicit
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL") # durable at checkpoints, consistent after a crash in WAL mode
+        with self.transaction() as c:
+            for statement in self.SCHEMA:
+                c.execute(statement)
+            c.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('schema', ?)", (str(self.SCHEMA_VERSION),))
+
+    def close(self):
+        with self.lock:
+            if self.connection:
+                self.connection.close()
+                self.connection = None
+
+    def checkOpen(self):
+        if self.connection is None:
+            raise sqlite3.ProgrammingError("Store is closed") # i.e. used from a background thread at plugin unloading
+
+    @contextmanager
+    def transaction(self):
+        with self.lock:
+            self.checkOpen()
+            c = self.connection.cursor()
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                yield c
+                c.execute("COMMIT")
+            except BaseException:
+                c.execute("ROLLBACK")
+                raise
+
+    # runs write functions (i.e. historyPush) as function(cursor, *arguments) in a single transaction, see GSStoreWriter
+    def writeBatch(self, writes):
+        with self.transaction() as c:
+            for function, args in writes:
+                function(c, *args)
+
+    def query(self, sql, params=()):
+        with self.lock:
+            self.checkOpen()
+            return self.connection.execute(sql, params).fetchall()
+
+    # --- meta
+    def metaValue(self, key):
+        rows = self.query("SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0][0] if rows else None
+
+    def setMetaValue(self, key, value):
+        with self.transaction() as c:
+            c.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # Imports a JSON file of a previous version the first time it is met, importFunction(document) writing it to the store.
+    # The file is left as is.
+    def migrateJSONFile(self, name, path, importFunction):
+        key = "migrated:" + name
+        if self.metaValue(key) is None:
+            if os.path.exists(path):
+                try:
+                    with open(path, "r") as readFile:
+                        importFunction(json.load(readFile))
+                    gslog.info("Imported " + path)
+                except (OSError, ValueError) as e:
+                    gslog.warning("Importing " + path + " failed: " + str(e))
+            self.setMetaValue(key, path)
+
+    # --- prefs
+    def prefs(self):
+        return {name: json.loads(value) for name, value in self.query("SELECT name, value FROM prefs")}
+
+    def savePrefs(self, values):
+        with self.transaction() as c:
+            c.executemany("INSERT OR REPLACE INTO prefs (name, value) VALUES (?, ?)", [(name, json.dumps(value)) for name, value in values.items()])
+
+    # --- history
+    # history texts, most recent first
+    def history(self, maxCount):
+        return [text for text, in self.query("SELECT text FROM history ORDER BY seq DESC LIMIT ?", (maxCount,))]
+
+    # makes text the most recent one, only the maxCount most recent texts are kept
+    def pushHistory(self, key, text, maxCount):
+        with self.transaction() as c:
+            self.historyPush(c, key, text, maxCount)
+
+    def clearHistory(self):
+        with self.transaction() as c:
+            self.historyClear(c)
+
+    @classmethod
+    def historyPush(cls, c, key, text, maxCount):
+        c.execute("INSERT OR REPLACE INTO history (key, text, seq) VALUES (?, ?, (SELECT IFNULL(MAX(seq), 0) + 1 FROM history))", (key, text))
+        c.execute("DELETE FROM history WHERE key NOT IN (SELECT key FROM history ORDER BY seq DESC LIMIT ?)", (maxCount,))
+
+    @classmethod
+    def historyClear(cls, c):
+        c.execute("DELETE FROM history")
+
+    # --- navigation
+    # navigation items, oldest first
+    def navigation(self, maxCount):
+        rows = self.query("SELECT item FROM navigation ORDER BY id DESC LIMIT ?", (maxCount,))
+        return [json.loads(item) for item, in reversed(rows)]
+
+    def appendNavigation(self, item, maxCount):
+        with self.transaction() as c:
+            self.navigationAppend(c, item, maxCount)
+
+    def clearNavigation(self):
+        with self.transaction() as c:
+            self.navigationClear(c)
+
+    @classmethod
+    def navigationAppend(cls, c, item, maxCount):
+        c.execute("INSERT INTO navigation (item) VALUES (?)", (json.dumps(item),))
+        c.execute("DELETE FROM navigation WHERE id <= (SELECT MAX(id) FROM navigation) - ?", (maxCount,))
+
+    @classmethod
+    def navigationClear(cls, c):
+        c.execute("DELETE FROM navigation")
+
+    # --- cached results
+    # cached data if its stamp is still stamp, None otherwise
+    def cachedData(self, name, stamp):
+        rows = self.query("SELECT data FROM cache WHERE name = ? AND stamp = ?", (name, stamp))
+        return rows[0][0] if rows else None
+
+    def setCachedData(self, name, stamp, data):
+        with self.transaction() as c:
+            c.execute("INSERT OR REPLACE INTO cache (name, stamp, data) VALUES (?, ?, ?)", (name, stamp, data))
+
+    # --- content index metadata
+    # (mtime, size, content hash) of a package file when it was last indexed, None if unknown
+    def packageFileState(self, path):
+        rows = self.query("SELECT mtime, size, content_hash FROM index_meta WHERE path = ?", (path,))
+        return rows[0] if rows else None
+
+    def setPackageFileState(self, path, mtime, size, contentHash):
+        with self.transaction() as c:
+            c.execute("INSERT OR REPLACE INTO index_meta (path, mtime, size, content_hash) VALUES (?, ?, ?, ?)", (path, mtime, size, contentHash))
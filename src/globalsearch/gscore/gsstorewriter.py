@@ -0,0 +1,74 @@
+# ---------------
+# Global Search - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import sqlite3, time, threading
+from globalsearch.gscore import gslog
+
+class GSStoreWriter:
+    """
+    Writes to the store (see GSStore) from a background thread, a short time after the last write was requested so a burst
+    of changes (i.e. history and navigation of a search) results in a single transaction. Writes are run in the order they
+    were requested.
+    """
+    DEFAULT_DELAY = 1.0 # s between the last write request and the actual writes
+
+    def __init__(self, store, name, delay = DEFAULT_DELAY):
+        self.store = store
+        self.name = name # thread name
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.wakeUp = threading.Condition(self.lock)
+        self.pending = [] # (function, arguments) to be run as function(cursor, *arguments), see GSStore.writeBatch
+        self.due = 0 # time at which pending writes are run
+        self.closing = False
+        self.thread = None
+        self.logs = [] # (log function name, message) logged from the writer thread, flushed from the UI thread
+
+    def write(self, function, *args):
+        with self.lock:
+            self.pending.append((function, args))
+            self.due = time.monotonic() + self.delay
+            if self.thread is None:
+                self.closing = False
+                self.thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+                self.thread.start()
+            self.wakeUp.notify()
+        self.flushLogs()
+
+    # runs pending writes without waiting for their delay and stops the writer thread
+    def close(self, timeout = 5.0):
+        with self.lock:
+            thread = self.thread
+            self.closing = True
+            self.wakeUp.notify()
+        if thread:
+            thread.join(timeout)
+        self.flushLogs()
+
+    def flushLogs(self):
+        with self.lock:
+            logs = self.logs
+            self.logs = []
+        for logFunctionName, message in logs:
+            getattr(gslog, logFunctionName)(message)
+
+    # --- writer thread, no SD API call in here (logging included)
+    def run(self):
+        while True:
+            with self.lock:
+                while True:
+                    if self.pending and (self.closing or time.monotonic() >= self.due):
+                        writes = self.pending
+                        self.pending = []
+                        break
+                    if self.closing:
+                        self.thread = None
+                        return
+                    self.wakeUp.wait(self.due - time.monotonic() if self.pending else None)
+            try:
+                self.store.writeBatch(writes)
+            except sqlite3.Error as e:
+                with self.lock:
+                    self.logs.append(("error", self.name + ": writing to the store failed: " + str(e)))
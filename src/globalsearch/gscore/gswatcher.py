@@ -0,0 +1,237 @@
+# ---------------
+# Global Search - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import os, sys, select, struct, threading
+import ctypes, ctypes.util
+
+class GSInotifyBackend:
+    """
+    Linux inotify based change notification on directories, package files being watched through their parent directory
+    """
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    EVENT_HEADER = struct.Struct("iIII") # wd, mask, cookie, len
+
+    def __init__(self, lock):
+        self.lock = lock # held by the watcher when setting watched paths
+        libcName = ctypes.util.find_library("c") or "libc.so.6"
+        self.libc = ctypes.CDLL(libcName, use_errno=True)
+        self.fd = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {} # key: directory, value: watch descriptor
+        self.watchDirs = {} # key: watch descriptor, value: directory
+
+    # called with self.lock held
+    def setWatched(self, files, dirs):
+        dirs = dirs | set(os.path.dirname(f) for f in files)
+        for d in list(self.watches.keys()):
+            if d not in dirs:
+                wd = self.watches.pop(d)
+                self.watchDirs.pop(wd, None)
+                self.libc.inotify_rm_watch(self.fd, wd)
+
+        for d in dirs:
+            if d not in self.watches and os.path.isdir(d):
+                wd = self.libc.inotify_add_watch(self.fd, os.fsencode(d), self.WATCH_MASK)
+                if wd >= 0:
+                    self.watches[d] = wd
+                    self.watchDirs[wd] = d
+
+    def wait(self, timeout):
+        changed = []
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if readable:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            headerSize = self.EVENT_HEADER.size
+            with self.lock:
+                while offset + headerSize <= len(data):
+                    wd, mask, cookie, nameLen = self.EVENT_HEADER.unpack_from(data, offset)
+                    offset += headerSize
+                    name = data[offset:offset + nameLen].rstrip(b"\0")
+                    offset += nameLen
+                    d = self.watchDirs.get(wd)
+                    if d and name:
+                        changed.append(os.path.join(d, os.fsdecode(name)))
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+class GSPollingBackend:
+    """
+    Portable fallback: compares file modification time and size at regular interval
+    """
+    def __init__(self, lock):
+        self.lock = lock # held by the watcher when setting watched paths
+        self.dirs = set()
+        self.files = set()
+        self.snapshot = {} # key: file path, value: (mtime, size)
+
+    # called with self.lock held. Files already watched keep their last known state, so changes made
+    # since the last check are still reported, only newly watched files are taken as they are now
+    def setWatched(self, files, dirs):
+        self.files = set(files)
+        self.dirs = set(dirs)
+        stats = self.statFiles(self.currentFiles(self.files, self.dirs))
+        self.snapshot = {f: self.snapshot.get(f, st) for f, st in stats.items()}
+
+    @classmethod
+    def currentFiles(cls, files, dirs):
+        files = set(files)
+        for d in dirs:
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        if entry.name.endswith(".sbs") and entry.is_file():
+                            files.add(entry.path)
+            except OSError:
+                pass
+        return files
+
+    @classmethod
+    def statFiles(cls, files):
+        stats = {}
+        for f in files:
+            try:
+                st = os.stat(f)
+                stats[f] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass
+        return stats
+
+    def wait(self, timeout):
+        threading.Event().wait(timeout)
+        with self.lock:
+            files, dirs = self.files, self.dirs
+        stats = self.statFiles(self.currentFiles(files, dirs)) # file system accessed without holding the lock
+        with self.lock:
+            if files is not self.files or dirs is not self.dirs:
+                return [] # watched paths changed meanwhile, their states were taken by setWatched
+            changed = [f for f, st in stats.items() if self.snapshot.get(f) != st]
+            self.snapshot = stats
+        return changed
+
+    def close(self):
+        pass
+
+class GSFileWatcher:
+    """
+    Watches package files (.sbs) and asset directories on a background thread.
+    Changed paths are accumulated and retrieved with popChangedPaths() from the UI thread,
+    as the SD API must not be used from the watcher thread (logging included, see popLogs).
+    """
+    POLL_INTERVAL = 0.5 # seconds
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.changedPaths = set()
+        self.files = set()
+        self.dirs = set()
+        self.thread = None
+        self.stopEvent = threading.Event()
+        self.backend = None
+        self.logs = [] # (log function name, message) logged by the watcher thread, flushed from the UI thread
+
+    def createBackend(self):
+        if sys.platform.startswith("linux"):
+            try:
+                return GSInotifyBackend(self.lock)
+            except (OSError, AttributeError):
+                pass
+        return GSPollingBackend(self.lock)
+
+    def isInotify(self):
+        return isinstance(self.backend, GSInotifyBackend)
+
+    def setWatched(self, files, dirs):
+        files = set(os.path.normcase(os.path.abspath(f)) for f in files if f)
+        dirs = set(os.path.normcase(os.path.abspath(d)) for d in dirs if d)
+        with self.lock:
+            self.files = files
+            self.dirs = dirs
+            if self.backend:
+                self.applyWatched()
+
+    # called with self.lock held
+    def applyWatched(self):
+        self.backend.setWatched(self.files, self.dirs)
+
+    def isWatchedPath(self, path):
+        if path in self.files:
+            return True
+        return path.endswith(".sbs") and os.path.dirname(path) in self.dirs
+
+    def start(self):
+        if self.thread is None:
+            self.stopEvent.clear()
+            with self.lock:
+                self.backend = self.createBackend()
+                self.applyWatched()
+            self.thread = threading.Thread(target=self.run, name="GlobalSearchFileWatcher", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        if self.thread:
+            self.stopEvent.set()
+            self.thread.join(self.POLL_INTERVAL * 4)
+            self.thread = None
+        if self.backend:
+            self.backend.close()
+            self.backend = None
+
+    def log(self, logFunctionName, message):
+        with self.lock:
+            self.logs.append((logFunctionName, message))
+
+    # returns the (log function name, message) logged since last call, to be logged from the UI thread
+    def popLogs(self):
+        with self.lock:
+            logs = self.logs
+            self.logs = []
+        return logs
+
+    # inotify failing (i.e. watch descriptors exhausted), watching goes on by polling
+    def fallBackToPolling(self, e):
+        self.log("warning", "Package file watcher: inotify failed (" + str(e) + "), switching to polling")
+        self.backend.close()
+        with self.lock:
+            self.backend = GSPollingBackend(self.lock)
+            self.applyWatched()
+
+    def run(self):
+        while not self.stopEvent.is_set():
+            try:
+                paths = self.backend.wait(self.POLL_INTERVAL)
+            except (OSError, ValueError) as e:
+                if self.isInotify():
+                    self.fallBackToPolling(e)
+                    continue
+                self.log("error", "Package file watcher stopped: " + str(e))
+                break
+            if paths:
+                with self.lock:
+                    for p in paths:
+                        p = os.path.normcase(os.path.abspath(p))
+                        if self.isWatchedPath(p):
+                            self.changedPaths.add(p)
+
+    def popChangedPaths(self):
+        with self.lock:
+            paths = self.changedPaths
+            self.changedPaths = set()
+        return paths
@@ -18,6 +18,9 @@ from sd.api.sdresourcefolder import SDResourceFolder
 from sd.api.sdgraphobjectcomment import SDGraphObjectComment
 from sd.api.sdgraphobjectframe import SDGraphObjectFrame
 from sd.api.sdgraphobjectpin import SDGraphObjectPin
+from sd.api.sdproperty import SDPropertyCategory
+from sd.api.sdvaluestring import SDValueString
+from sd.api.apiexception import APIException
 
 class SDObj:
     """
@@ -103,6 +106,8 @@ class SDObj:
 
     # Node associated to a role
     FUNC_CALL = 500 # a function being called inside another function
+    USAGE = 501 # a node instancing a graph or calling a function (usages query)
+    LIBRARY_NODE = 502 # a library node entry in the library usage report
 
     NODE_WITH_SYSTEM_CONTENT_NAME = {
         FX_MAP: "FX-Map",
@@ -244,56 +249,110 @@ class SDObj:
         "sbs::function::passthrough": (FUNCTION_NODE, "Dot"),
     }
 
+    # --- type resolution registry
+    # kinds of SD API Python classes, resolved once per class
+    KIND_OBJECT = "object" # type only depends on the class
+    KIND_FUNCTION_NODE = "function_node" # type depends on the node definition, see DEFINITION_TYPE
+    KIND_FXMAP_NODE = "fxmap_node"
+    KIND_NODE = "node"
+
+    CLASS_KIND = {} # key: Python class, value: (kind, type, typeStr)
+    DEFINITION_TYPE = None # key: kind, value: dict mapping definition id to (type, typeStr)
+    CONSTANT_NAME = None # key: constant value, value: constant name
+
+    PACKAGE_NAME_CACHE = {} # key: package file path, value: name, derived from the file path so never stale
+    GRAPH_INSTANCE_NAME_CACHE = {} # key: referenced graph file path and url (see resourceNameKey), value: name
+
     @classmethod
-    def type(cls, sdObj):
-        type = cls.UNDEFINED
-        typeStr = ""
-        if isinstance(sdObj, SDPackage):
-            type = cls.PACKAGE
-            typeStr = "Package"
-        elif isinstance(sdObj, SDSBSFunctionGraph):
-            type = cls.FUNCTION
-            typeStr = "Function"
-        elif isinstance(sdObj, SDGraph):
-            type = cls.GRAPH
-            typeStr = "Graph"
-        elif isinstance(sdObj, SDSBSFunctionNode):
-            defId = sdObj.getDefinition().getId()
-            if defId.startswith("sbs::function::get"):
-                type = cls.FNODE_GET
-                typeStr = "Get"
-            elif defId.startswith("sbs::function::set"):
-                type = cls.FNODE_SET
-                typeStr = "Set"
-        elif isinstance(sdObj, SDGraphObjectComment):
-            type = cls.COMMENT
-            typeStr = "Comment"
-        elif isinstance(sdObj, SDGraphObjectPin):
-            type = cls.PIN
-            typeStr = "Pin"
-        elif isinstance(sdObj, SDGraphObjectFrame):
-            type = cls.FRAME
-            typeStr = "Frame"
-        elif isinstance(sdObj, SDResourceFolder):  
-            type = cls.FOLDER  
-            typeStr = "Folder"
-        elif isinstance(sdObj, SDSBSFxMapNode):
-            definitionId = sdObj.getDefinition().getId()
-            typeTuple = cls.SDNODE_FXMAP_TYPE.get(definitionId)
-            if typeTuple:
-                type = typeTuple[0]
-                typeStr = typeTuple[1]
-        elif isinstance(sdObj, SDNode):
-            definitionId = sdObj.getDefinition().getId()
-            typeTuple = cls.SDNODE_COMPOSITING_TYPE.get(definitionId)
-            if typeTuple:
-                type = typeTuple[0]
-                typeStr = typeTuple[1]
+    def classKind(cls, pyClass):
+        kindTuple = cls.CLASS_KIND.get(pyClass)
+        if kindTuple is None:
+            # same precedence as isinstance() tests on an object, as SD API classes derive from each other
+            if issubclass(pyClass, SDPackage):
+                kindTuple = (cls.KIND_OBJECT, cls.PACKAGE, "Package")
+            elif issubclass(pyClass, SDSBSFunctionGraph):
+                kindTuple = (cls.KIND_OBJECT, cls.FUNCTION, "Function")
+            elif issubclass(pyClass, SDGraph):
+                kindTuple = (cls.KIND_OBJECT, cls.GRAPH, "Graph")
+            elif issubclass(pyClass, SDSBSFunctionNode):
+                kindTuple = (cls.KIND_FUNCTION_NODE, cls.UNDEFINED, "")
+            elif issubclass(pyClass, SDGraphObjectComment):
+                kindTuple = (cls.KIND_OBJECT, cls.COMMENT, "Comment")
+            elif issubclass(pyClass, SDGraphObjectPin):
+                kindTuple = (cls.KIND_OBJECT, cls.PIN, "Pin")
+            elif issubclass(pyClass, SDGraphObjectFrame):
+                kindTuple = (cls.KIND_OBJECT, cls.FRAME, "Frame")
+            elif issubclass(pyClass, SDResourceFolder):
+                kindTuple = (cls.KIND_OBJECT, cls.FOLDER, "Folder")
+            elif issubclass(pyClass, SDSBSFxMapNode):
+                kindTuple = (cls.KIND_FXMAP_NODE, cls.UNDEFINED, "")
+            elif issubclass(pyClass, SDNode):
+                kindTuple = (cls.KIND_NODE, cls.UNDEFINED, "")
             else:
-                type = cls.GRAPH_NODE
-                typeStr = definitionId
-        return (type, typeStr)
-    
+                kindTuple = (cls.KIND_OBJECT, cls.UNDEFINED, "")
+            cls.CLASS_KIND[pyClass] = kindTuple
+        return kindTuple
+
+    @classmethod
+    def definitionTypes(cls):
+        if cls.DEFINITION_TYPE is None:
+            functionTypes = {}
+            for definitionId in cls.NODE_FUNCTION_TYPE.keys():
+                functionTypes[definitionId] = cls.resolveDefinitionType(cls.KIND_FUNCTION_NODE, definitionId)
+            cls.DEFINITION_TYPE = {
+                cls.KIND_FUNCTION_NODE: functionTypes,
+                cls.KIND_FXMAP_NODE: dict(cls.SDNODE_FXMAP_TYPE),
+                cls.KIND_NODE: dict(cls.SDNODE_COMPOSITING_TYPE)
+            }
+        return cls.DEFINITION_TYPE
+
+    # type of a node definition not found in the registry
+    @classmethod
+    def resolveDefinitionType(cls, kind, definitionId):
+        typeTuple = (cls.UNDEFINED, "")
+        if kind == cls.KIND_FUNCTION_NODE:
+            if definitionId.startswith("sbs::function::get"):
+                typeTuple = (cls.FNODE_GET, "Get")
+            elif definitionId.startswith("sbs::function::set"):
+                typeTuple = (cls.FNODE_SET, "Set")
+        elif kind == cls.KIND_NODE:
+            typeTuple = (cls.GRAPH_NODE, definitionId)
+        return typeTuple
+
+    @classmethod
+    def definitionType(cls, kind, definitionId):
+        types = cls.definitionTypes()[kind]
+        typeTuple = types.get(definitionId)
+        if typeTuple is None:
+            typeTuple = cls.resolveDefinitionType(kind, definitionId)
+            types[definitionId] = typeTuple # definitions unknown to the tables (i.e. other compositing nodes) are cached as well
+        return typeTuple
+
+    @classmethod
+    def type(cls, sdObj):
+        kind, type, typeStr = cls.classKind(sdObj.__class__)
+        if kind == cls.KIND_OBJECT:
+            return (type, typeStr)
+        return cls.definitionType(kind, sdObj.getDefinition().getId())
+
+    @classmethod
+    def isVariableNodeDefinition(cls, definitionId):
+        return definitionId.startswith("sbs::function::get") or definitionId.startswith("sbs::function::set")
+
+    @classmethod
+    def variableName(cls, node):
+        # variable name of a Get/Set function node: its first string input property, which is "__constant__"
+        v = node.getPropertyValueFromId("__constant__", SDPropertyCategory.Input)
+        if v and isinstance(v, SDValueString):
+            return v.get()
+        properties = node.getProperties(SDPropertyCategory.Input)
+        if properties:
+            for p in range(0, properties.getSize()):
+                sdValStr = node.getPropertyValue(properties.getItem(p))
+                if sdValStr and isinstance(sdValStr, SDValueString):
+                    return sdValStr.get()
+        return None
+
     @classmethod
     def isInputNode(cls, type):
         return type == cls.INPUT_GRAYSCALE or type == cls.INPUT_COLOR or type == cls.INPUT_VALUE
@@ -356,6 +415,10 @@ class SDObj:
             typeStr = "Function inputs"
         elif type == cls.FUNC_INPUT:
             typeStr = "Function input"
+        elif type == cls.USAGE:
+            typeStr = "Usage"
+        elif type == cls.LIBRARY_NODE:
+            typeStr = "Library node"
         return typeStr
 
     @classmethod
@@ -385,7 +448,11 @@ class SDObj:
             _,typeStr = cls.type(sdObj)
             name = typeStr
         elif type == cls.PACKAGE:
-            name = Path(sdObj.getFilePath()).stem
+            filePath = sdObj.getFilePath()
+            name = cls.PACKAGE_NAME_CACHE.get(filePath)
+            if name is None:
+                name = Path(filePath).stem
+                cls.PACKAGE_NAME_CACHE[filePath] = name
         elif cls.isTypeGraphObject(type):
             name = sdObj.getDescription()
         elif cls.isTypeFunctionNode(type):
@@ -401,14 +468,42 @@ class SDObj:
         elif type == cls.GRAPH_INSTANCE:
             graph = sdObj.getReferencedResource()
             if graph and isinstance(graph, SDGraph):
-                try:
-                    name = graph.getAnnotationPropertyValueFromId("label").get()
-                except:
-                    pass
-                finally:
-                    if not name or len(name) == 0:
-                        name = graph.getIdentifier()
+                key = cls.resourceNameKey(graph)
+                cachedName = cls.GRAPH_INSTANCE_NAME_CACHE.get(key) if key else None
+                if cachedName is not None:
+                    name = cachedName
+                else:
+                    try:
+                        name = graph.getAnnotationPropertyValueFromId("label").get()
+                    except:
+                        pass
+                    finally:
+                        if not name or len(name) == 0:
+                            name = graph.getIdentifier()
+                    if key:
+                        cls.GRAPH_INSTANCE_NAME_CACHE[key] = name
         return name
+
+    # Name cache key of a resource: unlike Python wrappers of SD objects, file path and url are stable across API calls
+    @classmethod
+    def resourceNameKey(cls, resource):
+        try:
+            return resource.getFilePath() + "|" + resource.getUrl()
+        except APIException:
+            return None # resource not reachable anymore, its name is not cached
+
+    # to be called when packages change (loaded, unloaded, modified) and before each search, as graph labels may be edited without
+    # notification: graph instance names are invalidated. Package names stay cached across searches, their file path determining them.
+    # If filePath is specified (i.e. package closed), only the names related to this package file are invalidated, its name included.
+    @classmethod
+    def invalidateNameCache(cls, filePath=None):
+        if filePath is None:
+            cls.GRAPH_INSTANCE_NAME_CACHE.clear()
+        else:
+            cls.PACKAGE_NAME_CACHE.pop(filePath, None)
+            prefix = filePath + "|"
+            for key in [k for k in cls.GRAPH_INSTANCE_NAME_CACHE.keys() if k.startswith(prefix)]:
+                del cls.GRAPH_INSTANCE_NAME_CACHE[key]
     
     @classmethod
     def dumpStr(cls, sdObj):
@@ -420,7 +515,10 @@ class SDObj:
     
     @classmethod
     def constantName(cls, constantValue):
-        for name, value in inspect.getmembers(cls):
-            if not name.startswith("__") and value == constantValue:
-                return name
-        return None    
+        if cls.CONSTANT_NAME is None:
+            constantNames = {}
+            for name, value in inspect.getmembers(cls):
+                if not name.startswith("__") and isinstance(value, int):
+                    constantNames.setdefault(value, name) # first name in alphabetical order, as a linear search would find it
+            cls.CONSTANT_NAME = constantNames
+        return cls.CONSTANT_NAME.get(constantValue)
@@ -50,6 +50,8 @@ class SearchCriteria:
     """
     Search filters
     """
+    NODE_ID_PREFIX = "id:" # search string prefix of node identifier searches, see isNodeIdSearch()
+
     def __init__(self, searchString = ""):
         self.searchString = searchString
 
@@ -75,6 +77,12 @@ class SearchCriteria:
 
         # special searches
         self.ss_param_func = False # return graph parameters to which are associated functions
+        self.ss_var_set_not_read = False # return Set nodes of variables which are never read (from the content index)
+        self.ss_var_read_not_set = False # return Get nodes of variables which are never set (from the content index)
+        self.ss_library_usage = False # library usage report: library node instance count per package (from the content index)
+        self.usagesOf = None # graph or function whose usages (graph instances, function calls) are searched, answered from the content index
+
+        self.graphNodeFilterDefs = None # (filter, definitions, graph identifiers) computed from graphNodeFilter, see graphNodeCandidateDefinitions()
 
     def enableFilters(self, enable):
         self.varGetter = enable
@@ -119,6 +127,72 @@ class SearchCriteria:
         matching, _, _ = self.isGraphNodeFilterMatchingWithTypeAndRefRes(nodeType, refRes)  
         return matching
 
+    # Node definitions (and referenced graph identifiers for library nodes) of the graph nodes a search with a graph node filter
+    # needs to visit: matching nodes, partial matches (FX-Map when filtering on an FX-Map node) and graph instances when entering
+    # custom sub-graphs. Other nodes are skipped by the search, so they don't need to be visited at all.
+    def graphNodeCandidateDefinitions(self):
+        f = self.graphNodeFilter
+        if self.graphNodeFilterDefs is None or self.graphNodeFilterDefs[0] is not f:
+            definitions = set()
+            graphIds = set()
+            if f:
+                if f.isSystem():
+                    for collection in (SDObj.SDNODE_COMPOSITING_TYPE, SDObj.SDNODE_FXMAP_TYPE):
+                        for definition, typeTuple in collection.items():
+                            matching, partialMatch, _ = self.isGraphNodeFilterMatchingWithTypeAndRefRes(typeTuple[0], None)
+                            if matching or partialMatch:
+                                definitions.add(definition)
+                else:
+                    graphIds.add(f.identifier)
+            self.graphNodeFilterDefs = (f, frozenset(definitions), frozenset(graphIds))
+
+        _, definitions, graphIds = self.graphNodeFilterDefs
+        if self.enterCustomSubGraphs:
+            definitions = definitions | {"sbs::compositing::sbscompgraph_instance"}
+        return definitions, graphIds
+
+    # Node definitions of the function nodes a search by function node type only needs to visit
+    def functionNodeCandidateDefinitions(self):
+        definitions = {self.functionNodeFilter.definition}
+        if self.enterGraphPkgFct:
+            definitions.add("sbs::function::instance")
+        return definitions
+
+    # search which may skip containers whose content summary rules out the search string: the search string must be
+    # the only condition, as node filters, sub-graph descent and special searches don't rely on the container content
+    def isPrunableSearch(self):
+        return self.hasSearchString() and not self.hasNodeFilter() and not self.ss_param_func \
+            and not self.enterCustomSubGraphs and not self.enterGraphPkgFct
+
+    # Whether this search finds results only where a previous one did: same options, search string containing the previous one
+    # (within words, wildcards being ignored). Does not hold for whole words: "ab" is a word of "ab cd" whereas "a" is not.
+    def isNarrowingOf(self, previous):
+        if self.wholeWord or not self.hasSearchString() or not previous.hasSearchString() or self.isNodeIdSearch() or previous.isNodeIdSearch():
+            return False
+        ignored = ("searchString", "graphNodeFilterDefs")
+        options = {k: v for k, v in vars(self).items() if k not in ignored}
+        previousOptions = {k: v for k, v in vars(previous).items() if k not in ignored}
+        return options == previousOptions and previous.comparableSearchString() in self.comparableSearchString()
+
+    # search string as matched within words
+    def comparableSearchString(self):
+        s = self.searchString
+        if s.startswith("*"):
+            s = s[1:]
+        if s.endswith("*"):
+            s = s[:-1]
+        return s if self.caseSensitive else s.lower()
+
+    # search for a node identifier (i.e. reported by a cooking error) with the NODE_ID_PREFIX search string prefix
+    def isNodeIdSearch(self):
+        return self.hasSearchString() and self.searchString.startswith(self.NODE_ID_PREFIX) and len(self.nodeIdSearched()) > 0
+
+    def nodeIdSearched(self):
+        return self.searchString[len(self.NODE_ID_PREFIX):].strip()
+
+    def isFunctionNodeTypeOnlySearch(self):
+        return self.functionNodeFilter is not None and not self.hasSearchString()
+
     def isFunctionNodeFilterMatchingForDef(self, definitionId):
         matching = False
         if self.functionNodeFilter:
@@ -132,6 +206,18 @@ class SearchCriteria:
         self.ss_param_func = True
         self.enableFilters(False)
 
+    def setupForSSVariables(self, setNotRead):
+        self.ss_var_set_not_read = setNotRead
+        self.ss_var_read_not_set = not setNotRead
+        self.enableFilters(False)
+
+    def setupForSSLibraryUsage(self):
+        self.ss_library_usage = True
+        self.enableFilters(False)
+
+    def isSSVariables(self):
+        return self.ss_var_set_not_read or self.ss_var_read_not_set
+
     def __str__(self):
         s = "SearchCriteria:\n"
         s += "searchString: " + self.searchString + "\n"
@@ -160,7 +246,10 @@ class SearchCriteria:
         else:
             s += "No function node filter\n"
 
-        s += "ss_param_func: " + str(self.ss_param_func)
+        s += "ss_param_func: " + str(self.ss_param_func) + "\n"
+        s += "ss_var_set_not_read: " + str(self.ss_var_set_not_read) + "\n"
+        s += "ss_var_read_not_set: " + str(self.ss_var_read_not_set) + "\n"
+        s += "ss_library_usage: " + str(self.ss_library_usage)
         return s
 
 class SearchResultPathNode:
@@ -175,6 +264,7 @@ class SearchResultPathNode:
         self.subType = SDObj.UNDEFINED   # to characterise some sdObj which cannot be characterized by themselves (i.e. function graph of a pixel processor) 
         self.name = "" # when node represents a named item (i.e. graph input param) whose name cannot be determined with sdObj
         self.foundMatch = foundMatch     # used only if match is found at this node level
+        self.matchSpan = None # (start, end) of the search string match within foundMatch, recorded at match time
         self.parent = parent
         self.children = []
 
@@ -287,6 +377,14 @@ class SearchResults:
         self.currentPathNode = self.pathTree
         self.foundCount = 0
         self.searchLogs = False
+        self.indexedPathNodes = {} # key: index key, value: SearchResultPathNode, used when building results from the content index
+        self.cancelled = False # search abandoned before completion (see GlobalSearch.cancelCheck), results are partial
+        self.lastMatch = None # (content, (start, end)) of the last content matching the search string, see matchSpanFor()
+
+        # content summary statistics
+        self.summaryChecks = 0 # containers whose content summary was checked before searching into them
+        self.summaryPruned = 0 # containers skipped as their content summary ruled out the search string
+        self.summaryFalsePositives = 0 # containers searched into as their summary allowed a match, without search result
     
     def logSearch(self, s):
         if self.searchLogs:
@@ -301,12 +399,25 @@ class SearchResults:
     def incrementFoundCount(self):
         self.foundCount += 1
 
+    def pruningRatio(self):
+        return self.summaryPruned / self.summaryChecks if self.summaryChecks > 0 else 0.0
+
+    # ratio of containers without search result that were not ruled out by their summary
+    def summaryFalsePositiveRate(self):
+        negatives = self.summaryPruned + self.summaryFalsePositives
+        return self.summaryFalsePositives / negatives if negatives > 0 else 0.0
+
+    def summaryStatsStr(self):
+        return "checked: " + str(self.summaryChecks) + " pruned: " + str(self.summaryPruned) + \
+            " pruning ratio: {:.2f} false positive rate: {:.3f}".format(self.pruningRatio(), self.summaryFalsePositiveRate())
+
     # --- Path tree operations
     def appendPathNode(self, sdObj, foundMatchStr = None, isFoundMatch = False, assignToCurrent = True):
         # we are using both foundMatchStr and isFoundMatch as for presets foundMatchStr can be empty
         logSearchStr = "appendPathNode: " + SDObj.dumpStr(sdObj) + " isFoundMatch=" + str(isFoundMatch) + " assignToCurrent="+str(assignToCurrent)
 
         newPathNode = SearchResultPathNode(sdObj, foundMatchStr, self.pathTree)
+        newPathNode.matchSpan = self.matchSpanFor(foundMatchStr)
         if not self.pathTree:
             self.pathTree = newPathNode
         else:
@@ -327,6 +438,31 @@ class SearchResults:
 
         return newPathNode
 
+    # span of the search string within a found match, if this match was the last content tested by the search
+    def matchSpanFor(self, foundMatch):
+        if foundMatch and self.lastMatch and self.lastMatch[0] == foundMatch:
+            return self.lastMatch[1]
+        return None
+
+    # Appends a path from index entries (see GSIndex.sitePathEntries) merging it with the already existing path nodes
+    # and makes its last path node the current one, so found nodes can then be appended to it
+    def appendIndexedPath(self, pathEntries):
+        parent = None
+        for key, sdObj, subType, name in pathEntries:
+            pathNode = self.indexedPathNodes.get(key)
+            if pathNode is None:
+                pathNode = SearchResultPathNode(sdObj, None, parent)
+                pathNode.subType = subType
+                pathNode.name = name
+                if parent:
+                    parent.children.append(pathNode)
+                else:
+                    self.pathTree = pathNode
+                self.indexedPathNodes[key] = pathNode
+            parent = pathNode
+        self.currentPathNode = parent
+        return parent
+
     def dropCurrentPathBranch(self):
         # gslog.debug("dropCurrentPathBranch, tree before drop:")
         # gslog.debug("self.currentPathNode="+str(self.currentPathNode))
@@ -346,6 +482,7 @@ class SearchResults:
     def setFoundMatchForCurrentPathNode(self, foundMatch):
         if self.currentPathNode: 
             self.currentPathNode.foundMatch = foundMatch
+            self.currentPathNode.matchSpan = self.matchSpanFor(foundMatch)
             self.incrementFoundCount()
 
     # --- debug
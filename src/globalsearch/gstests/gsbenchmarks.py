@@ -0,0 +1,356 @@
+# ---------------
+# Global Search - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import inspect, time, os, json, tempfile, tracemalloc
+import sd
+
+from sd.api.sdpackage import SDPackage
+from sd.api.sdgraph import SDGraph
+from sd.api.sbs.sdsbsfunctiongraph import SDSBSFunctionGraph
+from sd.api.sbs.sdsbsfunctionnode import SDSBSFunctionNode
+from sd.api.sdnode import SDNode
+from sd.api.sbs.sdsbsfxmapnode import SDSBSFxMapNode
+from sd.api.sdresourcefolder import SDResourceFolder
+from sd.api.sdgraphobjectcomment import SDGraphObjectComment
+from sd.api.sdgraphobjectframe import SDGraphObjectFrame
+from sd.api.sdgraphobjectpin import SDGraphObjectPin
+
+from globalsearch.gscore import gslog
+from globalsearch.gscore.sdobj import SDObj
+from globalsearch.gscore.gssdlibrary import GSSDLibrary
+from globalsearch.gscore.searchdata import SearchResults, SearchResultPathNode, SearchCriteria
+from globalsearch.gsui.uiutil import GSUIUtil
+from globalsearch.gsui.resultmodel import GSUISearchResultModel
+
+class GSBenchmarks:
+    # HOW TO RUN BENCHMARKS:
+    # Start the plugin with "dev_unitTests" preference to true (see gsunittests.py) and use the "Global Search/Run Benchmarks" menu,
+    # results are logged into the Console view. Benchmarks using graph nodes run on the nodes of the currently loaded user packages.
+    REPEAT = 5 # best of REPEAT runs is reported
+
+    def __init__(self):
+        self.report = []
+
+    def log(self, s):
+        self.report.append(s)
+        gslog.info("[BENCHMARK] " + s)
+
+    # best time in seconds of REPEAT runs of fn() called number times
+    def timeIt(self, fn, number):
+        best = None
+        for r in range(0, self.REPEAT):
+            start = time.perf_counter()
+            for n in range(0, number):
+                fn()
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        return best
+
+    def compare(self, name, referenceFn, fn, number):
+        reference = self.timeIt(referenceFn, number)
+        current = self.timeIt(fn, number)
+        speedup = reference / current if current > 0 else 0
+        self.log(name + ": reference {:.3f} ms, current {:.3f} ms, speedup x{:.1f}".format(reference * 1000, current * 1000, speedup))
+
+    def runAll(self):
+        self.log("Running benchmarks")
+        self.benchSDObjType()
+        self.benchConstantName()
+        self.benchLibraryParsing()
+        self.benchResultPopulate()
+        self.benchResultSort()
+        self.benchResultFilter()
+        self.benchUILoading()
+
+    # --- SDObj type resolution
+    # type resolution before the registry: isinstance() chain and table lookups on every call
+    @classmethod
+    def referenceType(cls, sdObj):
+        type = SDObj.UNDEFINED
+        typeStr = ""
+        if isinstance(sdObj, SDPackage):
+            type, typeStr = SDObj.PACKAGE, "Package"
+        elif isinstance(sdObj, SDSBSFunctionGraph):
+            type, typeStr = SDObj.FUNCTION, "Function"
+        elif isinstance(sdObj, SDGraph):
+            type, typeStr = SDObj.GRAPH, "Graph"
+        elif isinstance(sdObj, SDSBSFunctionNode):
+            defId = sdObj.getDefinition().getId()
+            if defId.startswith("sbs::function::get"):
+                type, typeStr = SDObj.FNODE_GET, "Get"
+            elif defId.startswith("sbs::function::set"):
+                type, typeStr = SDObj.FNODE_SET, "Set"
+        elif isinstance(sdObj, SDGraphObjectComment):
+            type, typeStr = SDObj.COMMENT, "Comment"
+        elif isinstance(sdObj, SDGraphObjectPin):
+            type, typeStr = SDObj.PIN, "Pin"
+        elif isinstance(sdObj, SDGraphObjectFrame):
+            type, typeStr = SDObj.FRAME, "Frame"
+        elif isinstance(sdObj, SDResourceFolder):
+            type, typeStr = SDObj.FOLDER, "Folder"
+        elif isinstance(sdObj, SDSBSFxMapNode):
+            typeTuple = SDObj.SDNODE_FXMAP_TYPE.get(sdObj.getDefinition().getId())
+            if typeTuple:
+                type, typeStr = typeTuple
+        elif isinstance(sdObj, SDNode):
+            definitionId = sdObj.getDefinition().getId()
+            typeTuple = SDObj.SDNODE_COMPOSITING_TYPE.get(definitionId)
+            if typeTuple:
+                type, typeStr = typeTuple
+            else:
+                type, typeStr = SDObj.GRAPH_NODE, definitionId
+        return (type, typeStr)
+
+    # definition ids of the type tables, along with the class kind they are resolved for
+    def tableDefinitions(self):
+        definitions = [(SDObj.KIND_NODE, d) for d in SDObj.SDNODE_COMPOSITING_TYPE.keys()]
+        definitions += [(SDObj.KIND_FXMAP_NODE, d) for d in SDObj.SDNODE_FXMAP_TYPE.keys()]
+        definitions += [(SDObj.KIND_FUNCTION_NODE, d) for d in SDObj.NODE_FUNCTION_TYPE.keys()]
+        return definitions
+
+    @classmethod
+    def referenceDefinitionType(cls, kind, definitionId):
+        if kind == SDObj.KIND_FUNCTION_NODE:
+            if definitionId.startswith("sbs::function::get"):
+                return (SDObj.FNODE_GET, "Get")
+            elif definitionId.startswith("sbs::function::set"):
+                return (SDObj.FNODE_SET, "Set")
+            return (SDObj.UNDEFINED, "")
+        elif kind == SDObj.KIND_FXMAP_NODE:
+            typeTuple = SDObj.SDNODE_FXMAP_TYPE.get(definitionId)
+            return typeTuple if typeTuple else (SDObj.UNDEFINED, "")
+        typeTuple = SDObj.SDNODE_COMPOSITING_TYPE.get(definitionId)
+        return typeTuple if typeTuple else (SDObj.GRAPH_NODE, definitionId)
+
+    # nodes of the graphs and functions of the loaded user packages
+    def userPackageNodes(self):
+        nodes = []
+        packages = sd.getContext().getSDApplication().getPackageMgr().getUserPackages()
+        if packages:
+            for p in range(0, packages.getSize()):
+                resources = packages.getItem(p).getChildrenResources(True)
+                if resources:
+                    for r in range(0, resources.getSize()):
+                        resource = resources.getItem(r)
+                        if isinstance(resource, SDGraph):
+                            graphNodes = resource.getNodes()
+                            for n in range(0, graphNodes.getSize()):
+                                nodes.append(graphNodes.getItem(n))
+        return nodes
+
+    def benchSDObjType(self):
+        definitions = self.tableDefinitions()
+        for kind, definitionId in definitions:
+            if SDObj.definitionType(kind, definitionId) != self.referenceDefinitionType(kind, definitionId):
+                self.log("SDObj definition type MISMATCH for " + definitionId)
+
+        def referenceTables():
+            for kind, definitionId in definitions:
+                self.referenceDefinitionType(kind, definitionId)
+        def registryTables():
+            for kind, definitionId in definitions:
+                SDObj.definitionType(kind, definitionId)
+        self.compare("SDObj definition type (" + str(len(definitions)) + " table definitions x 100)", referenceTables, registryTables, 100)
+
+        nodes = self.userPackageNodes()
+        if len(nodes) > 0:
+            mismatches = [n for n in nodes if SDObj.type(n) != self.referenceType(n)]
+            if len(mismatches) > 0:
+                self.log("SDObj.type MISMATCH for " + str(len(mismatches)) + " nodes")
+
+            def referenceNodes():
+                for n in nodes:
+                    self.referenceType(n)
+            def registryNodes():
+                for n in nodes:
+                    SDObj.type(n)
+            self.compare("SDObj.type (" + str(len(nodes)) + " user package nodes x 10)", referenceNodes, registryNodes, 10)
+        else:
+            self.log("SDObj.type on nodes skipped: no user package loaded")
+
+    # --- SDObj constant names
+    @classmethod
+    def referenceConstantName(cls, constantValue):
+        for name, value in inspect.getmembers(SDObj):
+            if not name.startswith("__") and value == constantValue:
+                return name
+        return None
+
+    def benchConstantName(self):
+        values = [SDObj.ROOT, SDObj.GRAPH, SDObj.FUNC_PARAM, SDObj.FX_MAP_GRAPH, SDObj.GRAPH_INSTANCE, SDObj.COMMENT, SDObj.FUNC_CALL, SDObj.USAGE]
+        for v in values:
+            if SDObj.constantName(v) != self.referenceConstantName(v):
+                self.log("SDObj.constantName MISMATCH for " + str(v))
+
+        def reference():
+            for v in values:
+                self.referenceConstantName(v)
+        def registry():
+            for v in values:
+                SDObj.constantName(v)
+        self.compare("SDObj.constantName (" + str(len(values)) + " constants x 100)", reference, registry, 100)
+
+    # --- SD DB (resources.json) parsing
+    SYNTHETIC_DB_SIZE = 50 * 1024 * 1024
+
+    # writes a synthetic SD DB of about SYNTHETIC_DB_SIZE bytes, one resource out of 4 being a library node
+    def writeSyntheticDB(self, path):
+        with open(path, "w") as file:
+            file.write('{"version": 1, "resources": [')
+            size = 0
+            r = 0
+            while size < self.SYNTHETIC_DB_SIZE:
+                isNode = r % 4 == 0
+                resource = {
+                    "basename": "node_" + str(r),
+                    "extension": "graph" if isNode else "resource",
+                    "is_listable": True,
+                    "archive_url": "sbs://library/node_" + str(r) + ".sbs",
+                    "uid": "{" + str(r).zfill(32) + "}",
+                    "metadata": {"label": "Node " + str(r), "hideInLibrary": "0", "category": "Benchmark", "keywords": "synthetic benchmark resource " * 8,
+                                 "description": "Synthetic resource used to benchmark the SD DB parsing. " * 4},
+                    "thumbnail": "data:" + "A" * 256
+                }
+                s = (", " if r > 0 else "") + json.dumps(resource)
+                file.write(s)
+                size += len(s)
+                r += 1
+            file.write('], "settings": {"locale": "en"}}')
+        return r
+
+    # parsing before the streaming reader: whole document loaded then walked
+    @classmethod
+    def referenceParseDB(cls, path):
+        nodes = {}
+        with open(path, "r") as file:
+            db = json.load(file)
+        for r in db["resources"]:
+            entry = GSSDLibrary.libraryNodeEntry(r)
+            if entry:
+                nodes[entry[0]] = entry[1]
+        return nodes
+
+    def peakMemory(self, fn):
+        tracemalloc.start()
+        try:
+            result = fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return result, peak
+
+    def benchLibraryParsing(self):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            resourceCount = self.writeSyntheticDB(path)
+            library = GSSDLibrary()
+            referenceNodes, referencePeak = self.peakMemory(lambda: self.referenceParseDB(path))
+            nodes, peak = self.peakMemory(lambda: library.parseDB(path))
+            if nodes != referenceNodes:
+                self.log("SD DB parsing MISMATCH: " + str(len(nodes)) + " nodes instead of " + str(len(referenceNodes)))
+            self.log("SD DB parsing peak memory ({:.0f} MB, {} resources): reference {:.1f} MB, current {:.1f} MB".format(
+                os.path.getsize(path) / (1024 * 1024), resourceCount, referencePeak / (1024 * 1024), peak / (1024 * 1024)))
+            self.compare("SD DB parsing time", lambda: self.referenceParseDB(path), lambda: library.parseDB(path), 1)
+        finally:
+            os.remove(path)
+
+    # --- search result display
+    RESULT_PARENT_COUNT = 100
+    RESULT_CHILD_COUNT = 100
+
+    # synthetic search results of RESULT_PARENT_COUNT x RESULT_CHILD_COUNT found rows, not relying on SD objects
+    def syntheticSearchResults(self):
+        searchResults = SearchResults()
+        root = SearchResultPathNode(None)
+        root.subType = SDObj.ROOT
+        for p in range(0, self.RESULT_PARENT_COUNT):
+            parent = SearchResultPathNode(None, parent=root)
+            parent.subType = SDObj.LIBRARY_NODE
+            parent.name = "node_" + str(p)
+            root.children.append(parent)
+            for c in range(0, self.RESULT_CHILD_COUNT):
+                child = SearchResultPathNode(None, foundMatch="input_" + str(c) + "_benchmark", parent=parent)
+                child.subType = SDObj.FUNC_INPUT
+                child.name = "input_" + str(c)
+                parent.children.append(child)
+                searchResults.incrementFoundCount()
+        searchResults.pathTree = root
+        return searchResults
+
+    # display data of every row, as populating the former QTreeWidget did
+    @classmethod
+    def populateModel(cls, searchResults, searchCriteria, displayMode, iconFn=None):
+        model = GSUISearchResultModel(searchResults, searchCriteria, displayMode)
+        if iconFn:
+            model.icon = iconFn
+        for pathNode in model.nodesInOrder():
+            model.rowDataForNode(pathNode)
+        return model
+
+    # icon loading before the icon cache: PNG loaded and scaled on every call
+    @classmethod
+    def referenceIcon(cls, type):
+        iconFilename = GSUIUtil.iconFilenameForSDObj(type)
+        return GSUIUtil.loadIcon(iconFilename, GSUISearchResultModel.ICON_HEIGHT) if iconFilename else None
+
+    def benchResultPopulate(self):
+        searchResults = self.syntheticSearchResults()
+        searchCriteria = SearchCriteria("benchmark")
+        GSUIUtil.prewarmIcons()
+        for displayMode, modeStr in ((GSUISearchResultModel.DM_TREE, "tree"), (GSUISearchResultModel.DM_LIST, "list")):
+            self.compare("Search result populate, " + modeStr + " mode (" + str(searchResults.getFoundCount()) + " found rows)",
+                lambda: self.populateModel(searchResults, searchCriteria, displayMode, self.referenceIcon),
+                lambda: self.populateModel(searchResults, searchCriteria, displayMode), 1)
+
+    def benchResultSort(self):
+        searchResults = self.syntheticSearchResults()
+        searchCriteria = SearchCriteria("benchmark")
+        model = self.populateModel(searchResults, searchCriteria, GSUISearchResultModel.DM_LIST)
+        columns = range(0, GSUISearchResultModel.COLUMN_COUNT)
+
+        # sorting before precomputed sort keys: displayed text compared on every sort
+        def reference():
+            for c in columns:
+                sorted(model.foundNodes, key=lambda n: model.rowDataForNode(n)[0][c])
+        def current():
+            for c in columns:
+                model.sort(c)
+        self.compare("Search result list sort, all columns (" + str(len(model.foundNodes)) + " found rows)", reference, current, 1)
+
+    FILTER_KEYSTROKES = "input_42"
+
+    # filter typed one keystroke at a time, the first keystroke computing the filter keys
+    def benchResultFilter(self):
+        searchResults = self.syntheticSearchResults()
+        searchCriteria = SearchCriteria("benchmark")
+        for displayMode, modeStr in ((GSUISearchResultModel.DM_TREE, "tree"), (GSUISearchResultModel.DM_LIST, "list")):
+            model = GSUISearchResultModel(searchResults, searchCriteria, displayMode)
+            model.setFilter("x") # filter keys
+            model.setFilter("")
+            worst = 0
+            for k in range(1, len(self.FILTER_KEYSTROKES) + 1):
+                start = time.perf_counter()
+                model.setFilter(self.FILTER_KEYSTROKES[:k])
+                worst = max(worst, time.perf_counter() - start)
+            self.log("Search result filter, " + modeStr + " mode (" + str(searchResults.getFoundCount()) + " found rows): worst keystroke {:.3f} ms, {} rows displayed".format(
+                worst * 1000, len(model.nodesInOrder())))
+
+    # --- startup
+    UI_FILENAME = "gs_main.ui"
+
+    # main form set up from its compiled module compared to the .ui file parsed at runtime, as done before
+    def benchUILoading(self):
+        widget = GSUIUtil.loadCompiledUI(self.UI_FILENAME)
+        if widget is None:
+            self.log("UI loading skipped: no compiled form for " + self.UI_FILENAME)
+            return
+        widget.deleteLater()
+
+        def load(loadFn):
+            widget = loadFn(self.UI_FILENAME)
+            widget.deleteLater()
+        self.compare("UI loading, " + self.UI_FILENAME, lambda: load(GSUIUtil.loadUIFile), lambda: load(GSUIUtil.loadCompiledUI), 10)
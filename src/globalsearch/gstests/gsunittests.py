@@ -3,7 +3,7 @@
 # (c) 2019-2025 Eyosido Software SARL
 # ---------------
 
-import json, sd, os
+import json, sd, os, copy
 if sd.getContext().getSDApplication().getVersion() < "14.0.0":
     from PySide2.QtCore import QTimer
 else:
@@ -18,6 +18,7 @@ from globalsearch.gscore.gs import GlobalSearch
 from globalsearch.gscore.searchdata import SearchResults, SearchCriteria, SearchResultPathNodeJSONEncoder, NoteTypeFilterData
 from globalsearch.gscore.sdobj import SDObj
 from globalsearch.gscore import gssdlibrary
+from globalsearch.gsui.resultmodel import GSUISearchResultModel
 
 class GSUnitTests:
     # HOW TO RUN TESTS:
@@ -27,10 +28,16 @@ class GSUnitTests:
     # the reference test results "gs_unit_test_results.json" must be regenerated, this is explained below in section "HOW TO RECORD TESTS".
     #
     # To run the tests:
-    # - Start the plugin with "dev_unitTests" to true in Preferences file gsprefs.json, this make a "Global Search" top level menu in the application menu bar available (plusing needs to be restarted).
+    # - Start the plugin with "dev_unitTests" preference to true, this make a "Global Search" top level menu in the application menu bar available (plusing needs to be restarted).
+    # Preferences are stored in the "gsstore.db" SQLite database in the "globalsearch" directory, with Designer closed:
+    #   sqlite3 gsstore.db "UPDATE prefs SET value = 'true' WHERE name = 'dev_unitTests'"
+    # Setting the GLOBALSEARCH_DEV environment variable before starting Designer makes the plugin reload its modules when enabled again,
+    # so that code changes are taken into account without restarting Designer.
     # - To run all the tests, use the "Global Search/Run Unit Tests" menu, test results will be logged into the Console view. 
     # - To run a single test, use the "Global Search/Tests" menu which contains individual tests. If "Display Test Result In Tree View" menu is selected, the test result
     # and search string will be displayed in the tree view. This is useful to verify a test is providing the expected result before recording.
+    # - Each test is run once per index mode (see INDEX_MODES), content index disabled then enabled, both results being compared to the same reference.
+    # Tests having no reference result are FAILED.
     #
     # HOW TO RECORD TESTS:
     # When making modifications to the plugin code, reference packages ("gs_unit_tests_pkg1.sbs" and "gs_unit_tests_pkg2.sbs") or the test description below such as modifying
@@ -41,7 +48,7 @@ class GSUnitTests:
     # The new tests will not be marked as PASSED at this stage but this is normal since they are not in the reference test results file. If modifications have been made into the
     # reference packages, some tests may fail, even though they are still valid, make sure to double-check these after the new reference test results is generated.
     # - when you are done checking the validity of the new tests or changes, use the "Global Search/Run Unit Tests (Record)" menu. This will generate a "gs_unit_test_results.json" file
-    # in the "globalsearch" directory (same location as the "gsprefs.json"). To make this file the new reference test result file, it needs to moved manually to the "gstests" folder and
+    # in the "globalsearch" directory (same location as "gsstore.db"). Results are recorded with the first index mode, the results of the other modes being compared to them. To make this file the new reference test result file, it needs to moved manually to the "gstests" folder and
     # replace the former one.
     # - "Global Search/Run Unit Tests" can now be run and all the tests should be PASSED.
     #
@@ -59,6 +66,14 @@ class GSUnitTests:
     # - graphNodeFilter and functionNodeFilter: these are defined outside of searchCriteria and their value is either:
     #   . the definition of the node for system nodes
     #   . the id of the node for library nodes
+    # - usagesOf (optional): graph or function whose usages are searched (Find Usages), same format as root
+    # - resultFilter (optional): filter text applied to the results in list display mode (see GSUISearchResultModel.setFilter()), the test result being the displayed rows
+    # - narrowsFrom (optional): search string of a previous live search, searched first with the same criteria, whose results narrow the test search when it is a narrowing of it
+    # - cancel (optional): number of containers searched into before the search is cancelled (as a live search whose text changed), the same search
+    #   being run to its end first. The search must be cancelled and find less than the full search (nothing if cancelled at once), the test result
+    #   being the cancelled and truncated states
+    # - reference (optional): id of the test whose reference result the test is compared to, the test result not being recorded
+    # - pruned (optional): if True, the search must skip containers on their content summary (pruning ratio above 0) in the index modes pruning them
 
     TESTS = {
         # Filters in Preferences
@@ -140,6 +155,12 @@ class GSUnitTests:
         'lib_graph_node_filters_1': { 'name': '"test" in Blur HQ Grayscale', 'root': '', 'searchCriteria':{'searchString': "test"}, 'graphNodeFilter': "blur_hq_grayscale"},
         'lib_graph_node_filters_2': { 'name': 'Blur HQ Grayscale nodes', 'root': '', 'searchCriteria':{'searchString': ""}, 'graphNodeFilter': "blur_hq_grayscale"},
         'lib_graph_node_filters_3': { 'name': 'test_return_1 pkg function in Blur HQ Grayscale nodes', 'root': '', 'searchCriteria':{'searchString': "test_return_1"}, 'graphNodeFilter': "blur_hq_grayscale"},
+        'lib_graph_node_filters_4': { 'name': 'Blur HQ Grayscale nodes from test_graph_1', 'root': 'g:test_graph_1', 'searchCriteria':{'searchString': ""}, 'graphNodeFilter': "blur_hq_grayscale"},
+        'lib_graph_node_filters_5': { 'name': 'Blur HQ Grayscale nodes, enter sub-graphs', 'root': '', 'searchCriteria':{'searchString': "", 'enterCustomSubGraphs':True}, 'graphNodeFilter': "blur_hq_grayscale"},
+
+        # Presets: library usage report (content index)
+        'library_usage_1': { 'name': 'Library usage preset', 'root': '', 'searchCriteria':{'searchString': "", 'ss_library_usage':True}},
+        'library_usage_2': { 'name': 'Library usage preset from pkg2', 'root': 'p:gs_unit_tests_pkg2', 'searchCriteria':{'searchString': "", 'ss_library_usage':True}},
 
         # Function node filters
         'function_node_filters_1': { 'name': '"my_test_var" get float1 from test_return_1', 'root': 'pf:test_return_1', 'searchCriteria':{'searchString': "my_test_var"}, 'functionNodeFilter': "sbs::function::get_float1"},
@@ -173,20 +194,64 @@ class GSUnitTests:
         # Node identifier
         'node_id_1': { 'name': '"1534176499" node id', 'root': '', 'searchCriteria':{'searchString': "1534176499"}},
         'node_id_2': { 'name': '"1534182345" node id', 'root': '', 'searchCriteria':{'searchString': "1534182345"}},
+        'node_id_3': { 'name': '"id:1534176499" node id only', 'root': '', 'searchCriteria':{'searchString': "id:1534176499"}},
+        'node_id_4': { 'name': '"id:1534182345" node id only', 'root': '', 'searchCriteria':{'searchString': "id:1534182345"}},
+        'node_id_5': { 'name': '"id:1534176499" node id only from pkg2', 'root': 'p:gs_unit_tests_pkg2', 'searchCriteria':{'searchString': "id:1534176499"}},
+        'node_id_6': { 'name': '"id:1" unknown node id', 'root': '', 'searchCriteria':{'searchString': "id:1"}},
         
         # Getters / setters
         'getset_1': { 'name': 'Getters for my_test_var', 'root': '', 'searchCriteria':{'searchString': "my_test_var", 'varSetter':False, 'folderId':False, 'graphName':False, 'funcName':False, 'funcInput':False, 'comment':False}},
         'getset_2': { 'name': 'Setters for my_test_var', 'root': '', 'searchCriteria':{'searchString': "my_test_var", 'varGetter':False, 'folderId':False, 'graphName':False, 'funcName':False, 'funcInput':False, 'comment':False}},
 
+        # Presets: unmatched variables (content index)
+        'variables_1': { 'name': 'Variables set but never read preset', 'root': '', 'searchCriteria':{'searchString': "", 'ss_var_set_not_read':True}},
+        'variables_2': { 'name': 'Variables read but never set preset', 'root': '', 'searchCriteria':{'searchString': "", 'ss_var_read_not_set':True}},
+        'variables_3': { 'name': 'Variables set but never read from pkg2', 'root': 'p:gs_unit_tests_pkg2', 'searchCriteria':{'searchString': "", 'ss_var_set_not_read':True}},
+        'variables_4': { 'name': 'Getters and setters for "my_test" in test_return_1', 'root': 'pf:test_return_1', 'searchCriteria':{'searchString': "my_test", 'folderId':False, 'graphName':False, 'funcName':False, 'funcInput':False, 'comment':False}},
+
         # Pins
         'pins_1': { 'name': '"pin"', 'root': '', 'searchCriteria':{'searchString': "pin"}},
 
         # Multiple packages
         'multiple_packages_1': { 'name': '"test_return_1"', 'root': '', 'searchCriteria':{'searchString': "test_return_1"}},
+
+        # Content summary pruning (index on mode): containers ruled out by their summary are skipped, results must be the same
+        'pruning_1': { 'name': '"no_such_text_anywhere" not found', 'root': '', 'searchCriteria':{'searchString': "no_such_text_anywhere"}, 'pruned': True},
+        'pruning_2': { 'name': '"my_fmx_var" in FX-Map from pkg1', 'root': 'p:gs_unit_tests_pkg1', 'searchCriteria':{'searchString': "my_fmx_var"}, 'pruned': True},
+        'pruning_3': { 'name': '"test_offset" in Pixel Processor, Whole Word enabled', 'root': '', 'searchCriteria':{'searchString': "test_offset", "wholeWord":True}, 'pruned': True},
+        'pruning_4': { 'name': '"test_double" function calls in param functions from test_graph_1', 'root': 'g:test_graph_1', 'searchCriteria':{'searchString': "test_double"}, 'pruned': True},
+        'pruning_5': { 'name': '"My test graph" graph label from pkg2', 'root': 'p:gs_unit_tests_pkg2', 'searchCriteria':{'searchString': "My test graph"}, 'pruned': True},
+
+        # Usages (Find Usages)
+        'usages_1': { 'name': 'Usages of graph test_subgraph_1', 'root': '', 'searchCriteria':{'searchString': ""}, 'usagesOf': 'g:test_subgraph_1'},
+        'usages_2': { 'name': 'Usages of pkg function test_return_1', 'root': '', 'searchCriteria':{'searchString': ""}, 'usagesOf': 'pf:test_return_1'},
+        'usages_3': { 'name': 'Usages of pkg function root_pkg_function', 'root': '', 'searchCriteria':{'searchString': ""}, 'usagesOf': 'pf:root_pkg_function'},
+
+        # Filtering within results
+        'filter_1': { 'name': '"test" results filtered by "return"', 'root': '', 'searchCriteria':{'searchString': "test"}, 'resultFilter': "return"},
+        'filter_2': { 'name': '"test" results filtered by "type:function"', 'root': '', 'searchCriteria':{'searchString': "test"}, 'resultFilter': "type:function"},
+        'filter_3': { 'name': '"test" results filtered by "pkg:gs_unit_tests_pkg2"', 'root': '', 'searchCriteria':{'searchString': "test"}, 'resultFilter': "pkg:gs_unit_tests_pkg2"},
+        'filter_4': { 'name': '"var" results filtered by "type:get my_test"', 'root': '', 'searchCriteria':{'searchString': "var"}, 'resultFilter': "type:get my_test"},
+        'filter_5': { 'name': '"test" results filtered by "no_such_text_anywhere"', 'root': '', 'searchCriteria':{'searchString': "test"}, 'resultFilter': "no_such_text_anywhere"},
+
+        # Live search: narrowing searches must find the same results as the full searches
+        'live_search_1': { 'name': '"test" narrowed from "tes"', 'root': '', 'searchCriteria':{'searchString': "test"}, 'narrowsFrom': "tes", 'reference': 'search_root_1'},
+        'live_search_2': { 'name': '"test" narrowed from "est" from pkg1', 'root': 'p:gs_unit_tests_pkg1', 'searchCriteria':{'searchString': "test"}, 'narrowsFrom': "est", 'reference': 'search_root_2'},
+        'live_search_3': { 'name': '"my_fmx_var" narrowed from "my_" into FX-Map', 'root': '', 'searchCriteria':{'searchString': "my_fmx_var"}, 'narrowsFrom': "my_", 'reference': 'fxmap_2'},
+        'live_search_4': { 'name': '"this is a test return" narrowed from "this"', 'root': '', 'searchCriteria':{'searchString': "this is a test return"}, 'narrowsFrom': "this", 'reference': 'single_result_1'},
+        'live_search_5': { 'name': '"test" after "return", not narrowing', 'root': '', 'searchCriteria':{'searchString': "test"}, 'narrowsFrom': "return", 'reference': 'search_root_1'},
+        'live_search_6': { 'name': '"test" cancelled at once', 'root': '', 'searchCriteria':{'searchString': "test"}, 'cancel': 0},
+        'live_search_7': { 'name': '"test" cancelled after 5 containers', 'root': '', 'searchCriteria':{'searchString': "test"}, 'cancel': 5},
     }
 
     TEST_RESULTS_FNAME = 'gs_unit_test_results.json'
 
+    # Preference overrides each test is run with: searches narrowed or answered from the content index must find the same results as plain traversals
+    INDEX_MODES = (
+        ('index off', {'ix_enable': False, 'ix_prune': False}),
+        ('index on', {'ix_enable': True, 'ix_prune': True}),
+    )
+
     @classmethod
     def systemCompNodeFilter(cls, definition):
         data = SDObj.SDNODE_COMPOSITING_TYPE[definition]
@@ -216,6 +281,7 @@ class GSUnitTests:
         self.reference_test_result_path = os.path.join(gstests_path , self.TEST_RESULTS_FNAME)
         self.recorded_test_result_path = os.path.join(globalsearch_path , self.TEST_RESULTS_FNAME)
         self.testIds = list(self.TESTS.keys())
+        self.runs = [(testId, modeIndex) for testId in self.testIds for modeIndex in range(0, len(self.INDEX_MODES))] # (test id, index mode index)
         self.record = False
         self.reset()
 
@@ -271,23 +337,118 @@ class GSUnitTests:
         if functionNodeFilterDef:
             sc.functionNodeFilter = self.functionNodeFilter(functionNodeFilterDef)
 
+        usagesOf = test.get('usagesOf')
+        if usagesOf:
+            sc.usagesOf = self.findSearchRootFromSpec(usagesOf)
+
         return sc
         
+    # preferences the current test is run with: current preferences with the index mode overrides
+    def testPrefs(self, test):
+        prefs = copy.copy(self.prefs)
+        prefs.__dict__.update(self.INDEX_MODES[self.modeIndex][1])
+        return prefs
+
     def runTest(self, test):
-        jsonResult = self.performSearch(self.searchCriteria, test['root'])
+        prefs = self.testPrefs(test)
+        narrowingKeys = self.narrowingKeys(test, prefs)
+        cancel = test.get('cancel')
+        cancelCheck = None
+        if cancel is not None:
+            self.performSearch(self.searchCriteria, test['root'], prefs)
+            self.fullFoundCount = self.searchResults.getFoundCount()
+            cancelCheck = self.cancelCheckAfter(cancel)
+        jsonResult = self.performSearch(self.searchCriteria, test['root'], prefs, narrowingKeys, cancelCheck)
+        if cancelCheck:
+            jsonResult = json.dumps({'cancelled': self.searchResults.cancelled, 'truncated': self.searchResults.getFoundCount() < self.fullFoundCount})
+        resultFilter = test.get('resultFilter')
+        if resultFilter is not None:
+            jsonResult = self.filteredResult(self.searchCriteria, resultFilter)
         return jsonResult
+
+    # cancel check of a search (see GlobalSearch.cancelCheck) cancelling it once count containers were searched into
+    @classmethod
+    def cancelCheckAfter(cls, count):
+        checks = [0]
+        def cancelCheck():
+            checks[0] += 1
+            return checks[0] > count
+        return cancelCheck
+
+    # keys of the resources holding the results of the previous live search (narrowsFrom), if the test search is a narrowing of it
+    def narrowingKeys(self, test, prefs):
+        narrowsFrom = test.get('narrowsFrom')
+        if narrowsFrom is None:
+            return None
+        previousCriteria = copy.copy(self.searchCriteria)
+        previousCriteria.searchString = narrowsFrom
+        self.performSearch(previousCriteria, test['root'], prefs)
+        if not self.searchCriteria.isNarrowingOf(previousCriteria):
+            return None
+        return GlobalSearch.resourceKeysWithResults(self.searchResults)
+
+    # rows displayed in list display mode once the results of the last search are filtered, one list of column texts per row
+    def filteredResult(self, searchCriteria, filterText):
+        model = GSUISearchResultModel(self.searchResults, searchCriteria, GSUISearchResultModel.DM_LIST)
+        model.setFilter(filterText)
+        columns = range(0, GSUISearchResultModel.COLUMN_COUNT)
+        rows = [[model.listColumnText(pathNode, c) for c in columns] for pathNode in model.topNodes]
+        return json.dumps(rows)
     
     def prepareTestReport(self):
-        self.testReport = self.testId + " - " + self.test['name']
+        self.testReport = self.testId + " - " + self.test['name'] + " [" + self.INDEX_MODES[self.modeIndex][0] + "]"
     
-    def completeTestReport(self, passed):
+    def completeTestReport(self, passed, reason=None):
         s = "PASSED" if passed else "FAILED" 
+        if reason:
+            s += " (" + reason + ")"
         self.testReport += " -> " + s
 
+    # reference result of the current test: from the reference file, or recorded by the first index mode when recording
+    def referenceResult(self):
+        results = self.recordedTestResults if self.record else self.referenceTestResults
+        return results.get(self.test.get('reference', self.testId))
+
+    # Expectations on how the current test search ran, its results being compared to the reference result separately.
+    # Returns the reason of the failure, None if expectations are met.
+    def expectationFailure(self):
+        if self.test.get('pruned') and self.INDEX_MODES[self.modeIndex][1].get('ix_prune') and self.searchResults.pruningRatio() <= 0:
+            return "no container pruned"
+        cancel = self.test.get('cancel')
+        if cancel is not None:
+            found = self.searchResults.getFoundCount()
+            if not self.searchResults.cancelled:
+                return "search not cancelled"
+            if found >= self.fullFoundCount:
+                return "cancelled search not truncated"
+            if cancel == 0 and found > 0:
+                return "results found by a search cancelled at once"
+        return None
+
+    def checkTestResult(self):
+        failure = self.expectationFailure()
+        if self.record and self.modeIndex == 0 and 'reference' not in self.test:
+            self.recordedTestResults[self.testId] = self.jsonResult
+            if failure:
+                gslog.error(self.testReport + " -> " + failure)
+            return
+
+        referenceTestResult = self.referenceResult()
+        if failure is None and referenceTestResult is None:
+            failure = "no reference result"
+        passed = failure is None and self.jsonResult == referenceTestResult
+        if passed:
+            self.passedCount += 1
+        self.completeTestReport(passed, failure)
+        if passed:
+            gslog.debug(self.testReport)
+        else:
+            gslog.error(self.testReport)
+
     # prepare test output and run the test
     def preTest(self):
         self.prepareTestReport()
-        if self.record:
+        if self.record and self.modeIndex == 0 and 'reference' not in self.test:
             gslog.debug(self.testReport)
 
         self.searchCriteria = self.prepareSearchCriteria(self.test)
@@ -297,22 +458,7 @@ class GSUnitTests:
 
     # process test result and launch the next test or terminate if no remaining test
     def postTest(self):
-        if self.record:
-            self.recordedTestResults[self.testId] = self.jsonResult
-        else:
-            if len(self.referenceTestResults) > 0 and self.referenceTestResults.get(self.testId):
-                referenceTestResult = self.referenceTestResults[self.testId]
-                if self.jsonResult == referenceTestResult:
-                    self.passedCount += 1
-
-                passed = self.jsonResult == referenceTestResult
-                self.completeTestReport(passed)
-                if passed:
-                    gslog.debug(self.testReport)
-                else:
-                    gslog.error(self.testReport)
-            else:
-                gslog.debug(self.testReport)
+        self.checkTestResult()
 
         # next test
         if self.prepareToRunNextTest():
@@ -324,28 +470,31 @@ class GSUnitTests:
         if self.record:
             self.saveRecordedTestResults()
         elif totalReport:
-            totalRun = len(self.testIds)
+            totalRun = len(self.runs)
             totalFailed = totalRun - self.passedCount
             gslog.debug("Total test RUN:" + str(totalRun) + " - PASSED:" + str(self.passedCount) + " - FAILED:"+str(totalFailed))
 
     def prepareToRunNextTest(self):
         hasNextTest = False
-        if self.currentTestIdIndex < len(self.testIds)-1:
-            self.prepareToRunTestIndex(self.currentTestIdIndex + 1)
+        if self.currentRunIndex < len(self.runs)-1:
+            self.prepareToRunTestIndex(self.currentRunIndex + 1)
             hasNextTest = True
         return hasNextTest
 
-    def prepareToRunTestId(self, testId):
+    def prepareToRunTestId(self, testId, modeIndex=0):
         self.testId = testId
+        self.modeIndex = modeIndex # index in INDEX_MODES
         self.test = self.TESTS[testId]
         self.searchCriteria = None
         self.searchResults = None # SearchResults instance, contains pathTree
+        self.fullFoundCount = 0 # found count of the search run to its end, for tests cancelling it
         self.jsonResult = None  # json
         self.testReport = ''
 
+    # index: index in self.runs
     def prepareToRunTestIndex(self, index):
-        self.currentTestIdIndex = index
-        self.prepareToRunTestId(self.testIds[index])
+        self.currentRunIndex = index
+        self.prepareToRunTestId(*self.runs[index])
 
     # record: if True, the serialized results are written into file TEST_RESULTS_FNAME as a dictionary with the following format: key: test id, value: test result tree
     # if False, TEST_RESULTS_FNAME is loaded and its content is compared to the test results being performed.
@@ -372,20 +521,12 @@ class GSUnitTests:
         if len(self.referenceTestResults) == 0:
             self.loadReferenceTestResults()
 
-        self.prepareToRunTestId(testId)
-        self.prepareTestReport()
-        self.searchCriteria = self.prepareSearchCriteria(self.test)
-        self.jsonResult = self.runTest(self.test)
-        if len(self.referenceTestResults) > 0 and self.referenceTestResults.get(self.testId):
-            referenceTestResult = self.referenceTestResults[self.testId]
-            passed = self.jsonResult == referenceTestResult
-            self.completeTestReport(passed)
-            if passed:
-                gslog.debug(self.testReport)
-            else:
-                gslog.error(self.testReport)
-        else:
-            gslog.debug(self.testReport)
+        for modeIndex in range(0, len(self.INDEX_MODES)):
+            self.prepareToRunTestId(testId, modeIndex)
+            self.prepareTestReport()
+            self.searchCriteria = self.prepareSearchCriteria(self.test)
+            self.jsonResult = self.runTest(self.test)
+            self.checkTestResult()
 
     def defaultSearchCriteria(self, searchString=""):
         sc = SearchCriteria(searchString)
@@ -438,26 +579,31 @@ class GSUnitTests:
                         return found
         return None
                                                        
-    def performSearch(self, searchCriteria, searchRoot = None):
-        if searchRoot is not None and len(searchRoot) == 0:
-            searchRootObj = None
-        else:
-            comps = searchRoot.split(':')
-            typeStr = comps[0]
-            if typeStr == 'p':
-                type = SDObj.PACKAGE
-            elif typeStr == 'f':
-                type = SDObj.FOLDER
-            elif typeStr == 'g':
-                type = SDObj.GRAPH
-            elif typeStr == 'pf':
-                type = SDObj.FUNCTION
-            searchRootObj = self.findSearchRoot(comps[1], type)
-            # t, tstr = SDObj.type(searchRootObj)
-            # gslog.debug("found search root: " + str(searchRootObj) + " " + SDObj.name(searchRootObj, t))
+    # Finds a search root from its test description format (x:name, see TESTS), None for the global root
+    def findSearchRootFromSpec(self, spec):
+        if spec is None or len(spec) == 0:
+            return None
+        comps = spec.split(':')
+        typeStr = comps[0]
+        if typeStr == 'p':
+            type = SDObj.PACKAGE
+        elif typeStr == 'f':
+            type = SDObj.FOLDER
+        elif typeStr == 'g':
+            type = SDObj.GRAPH
+        elif typeStr == 'pf':
+            type = SDObj.FUNCTION
+        return self.findSearchRoot(comps[1], type)
+
+    def performSearch(self, searchCriteria, searchRoot = None, prefs = None, narrowingKeys = None, cancelCheck = None):
+        searchRootObj = self.findSearchRootFromSpec(searchRoot)
+        # t, tstr = SDObj.type(searchRootObj)
+        # gslog.debug("found search root: " + str(searchRootObj) + " " + SDObj.name(searchRootObj, t))
 
         self.searchResults = SearchResults()
-        gs = GlobalSearch(sd.getContext(), self.prefs, searchRootObj, searchCriteria, self.searchResults)
+        gs = GlobalSearch(sd.getContext(), prefs if prefs else self.prefs, searchRootObj, searchCriteria, self.searchResults)
+        gs.narrowingKeys = narrowingKeys
+        gs.cancelCheck = cancelCheck
         gs.search()
         jsonResult = json.dumps(self.searchResults.pathTree, cls=SearchResultPathNodeJSONEncoder)
         return jsonResult
@@ -15,15 +15,22 @@ else:
     from PySide6.QtGui import QAction
 
 from globalsearch.gscore import gslog
+from globalsearch.gscore import gsindex
+from globalsearch.gscore.sdobj import SDObj
+from globalsearch.gscore.gspackagetracker import GSPackageTracker
 from globalsearch.gsui.prefs import GSUIPref
 from globalsearch.gsui.gsuiwidget import GSUIWidget
-from globalsearch.gstests.gsunittests import GSUnitTests
+from globalsearch.gsui.uiutil import GSUIUtil
 
 class GSUIManager:
     """
     Main UI handler
     """
     APPNAME = "Global Search"
+    INDEX_TIMER_INTERVAL = 250 # ms, processing of package file changes and pending indexing
+    PACKAGE_POLL_INTERVAL = 1000 # ms, user package list check when Designer provides no package notification
+    PACKAGE_POLL_INTERVAL_WITH_EVENTS = 5000 # ms, safety check for changes not notified (e.g. new unsaved packages)
+    PACKAGE_EVENT_DELAY = 100 # ms, lets Designer update its package list before it is checked
 
     @classmethod
     def classInit(cls):
@@ -40,22 +47,47 @@ class GSUIManager:
         self.prefs = GSUIPref()
         self.uiWidget = None
         self.menu = None
-
-    def setupUI(self):
-        self.dockWidget =  self.uiMgr.newDockWidget('global_search', self.__class__.APPNAME)
-        self.uiWidget = GSUIWidget(self)
-
-        boxLayout = QVBoxLayout()
-        self.dockWidget.setLayout(boxLayout)
-        boxLayout.addWidget(self.uiWidget.ui)
-
-        self.updateFromPrefs()
-
+        self.indexTimer = None
+        self.packageTimer = None
+        self.packageTracker = GSPackageTracker(self.onPackageEvent, self.onPackageSaved)
+
+    # only the dock and the main widget are set up here, other parts once the dock is shown (see setupDeferredUI)
+    def setupUI(self, timer = None):
+        if timer is None:
+            timer = gslog.GSStageTimer("UI setup")
+        with timer.stage("dock"):
+            self.dockWidget =  self.uiMgr.newDockWidget('global_search', self.__class__.APPNAME)
+            self.uiWidget = GSUIWidget(self)
+
+            boxLayout = QVBoxLayout()
+            self.dockWidget.setLayout(boxLayout)
+            boxLayout.addWidget(self.uiWidget.ui)
+
+            self.indexTimer = QTimer()
+            self.indexTimer.timeout.connect(self.onIndexTimer)
+
+        QTimer.singleShot(0, lambda:self.setupDeferredUI(timer))
+
+    def setupDeferredUI(self, timer):
+        if not self.uiWidget or not self.uiWidget.ui:
+            return # UI removed meanwhile
+
+        with timer.stage("node type filters"):
+            self.uiWidget.setupNodeTypeFilters()
+        with timer.stage("icons"):
+            GSUIUtil.prewarmIcons()
+        with timer.stage("content index"):
+            self.updateFromPrefs()
+        with timer.stage("package tracking"):
+            self.setupPackageTracking()
         if self.prefs.dev_unitTests:
-            QTimer.singleShot(0, lambda:self.setupUnitTests())
+            with timer.stage("unit tests menu"):
+                self.setupUnitTests()
+        timer.logTotal()
 
     # create an application menu from where unit tests can be run
     def setupUnitTests(self):
+        from globalsearch.gstests.gsunittests import GSUnitTests
         self.menu = self.uiMgr.newMenu(self.APPNAME, self.APPNAME)
 
         action = QAction("Run Unit Tests", self.menu)
@@ -66,6 +98,10 @@ class GSUIManager:
         action.triggered.connect(lambda:self.onRunUnitTests(record=True))
         self.menu.addAction(action)
 
+        action = QAction("Run Benchmarks", self.menu)
+        action.triggered.connect(lambda:self.onRunBenchmarks())
+        self.menu.addAction(action)
+
         individualTestsMenu = self.menu.addMenu("Tests")
 
         action = QAction("Display Test Result In Tree View", individualTestsMenu)
@@ -85,10 +121,17 @@ class GSUIManager:
         self.displayTestResultInTreeView = checked
 
     def onRunUnitTests(self, record=False):
+        from globalsearch.gstests.gsunittests import GSUnitTests
         unitTests = GSUnitTests(self.prefs)
         unitTests.runAllTests(record)
 
+    def onRunBenchmarks(self):
+        from globalsearch.gstests.gsbenchmarks import GSBenchmarks
+        benchmarks = GSBenchmarks()
+        benchmarks.runAll()
+
     def onRunTest(self, testId):
+        from globalsearch.gstests.gsunittests import GSUnitTests
         unitTests = GSUnitTests(self.prefs)
         unitTests.runTestId(testId)
         if self.displayTestResultInTreeView:
@@ -97,9 +140,77 @@ class GSUIManager:
 
     def updateFromPrefs(self):
         self.uiWidget.showNodeTypeFilters(self.prefs.sc_DisplayNodeTypeFilters)
+        self.updateIndexFromPrefs()
+
+    # --- package tracking
+    def setupPackageTracking(self):
+        hasNotifications = self.packageTracker.subscribe()
+        gslog.info("Package tracking: " + ("notifications" if hasNotifications else "polling"))
+        self.packageTimer = QTimer()
+        self.packageTimer.timeout.connect(self.checkPackages)
+        self.packageTimer.start(self.PACKAGE_POLL_INTERVAL_WITH_EVENTS if hasNotifications else self.PACKAGE_POLL_INTERVAL)
+        QTimer.singleShot(0, lambda:self.checkPackages())
+
+    def onPackageEvent(self):
+        QTimer.singleShot(self.PACKAGE_EVENT_DELAY, lambda:self.checkPackages())
+
+    # the content index of a saved package is rebuilt on next index update or query
+    def onPackageSaved(self, filePath):
+        gsindex.g_gsindex.markStale(gsindex.GSIndex.normPath(filePath))
+
+    # updates the root tree, the name cache and the content index for packages loaded or closed since last check
+    def checkPackages(self):
+        changes = self.packageTracker.checkChanges()
+        if changes and self.uiWidget and self.uiWidget.ui:
+            added, removed = changes
+            self.uiWidget.stopLiveSearch() # may be searching closed packages
+            gslog.debug("User packages changed: " + str(len(added)) + " added, " + str(len(removed)) + " removed")
+            for key in removed:
+                SDObj.invalidateNameCache(key)
+            self.uiWidget.onPackagesChanged()
+            self.syncIndex()
+
+    # --- content index
+    def updateIndexFromPrefs(self):
+        index = gsindex.g_gsindex
+        if self.prefs.ix_enable:
+            index.setWatchDirs(self.prefs.ix_watchDirs)
+            self.syncIndex()
+            index.startWatching()
+            if not self.indexTimer.isActive():
+                self.indexTimer.start(self.INDEX_TIMER_INTERVAL)
+        else:
+            self.indexTimer.stop()
+            index.stopWatching()
+
+    # to be called when the list of user packages may have changed
+    def syncIndex(self):
+        if self.prefs.ix_enable:
+            gsindex.g_gsindex.syncPackages()
+
+    def onIndexTimer(self):
+        if self.uiWidget and self.uiWidget.searchRunning:
+            return # index in use by a live search run in slices, updated on next tick
+        index = gsindex.g_gsindex
+        index.processFileChanges()
+        if index.hasPendingPackages():
+            index.indexPendingPackages()
 
     def removeUI(self):
         gslog.info("Remove UI")
+        if self.uiWidget:
+            self.uiWidget.abandonSearch()
+            if self.uiWidget.searchHistory:
+                self.uiWidget.searchHistory.close() # pending history changes written
+        if self.packageTimer:
+            self.packageTimer.stop()
+            self.packageTimer = None
+        self.packageTracker.unsubscribe()
+
+        if self.indexTimer:
+            self.indexTimer.stop()
+            self.indexTimer = None
+
         if self.menu:
             self.uiMgr.deleteMenu(self.menu.objectName())
             self.menu = None      
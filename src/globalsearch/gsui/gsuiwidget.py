@@ -3,7 +3,7 @@
 # (c) 2019-2025 Eyosido Software SARL
 # ---------------
 
-import os, json
+import os, json, time
 import sd
 if sd.getContext().getSDApplication().getVersion() < "14.0.0":
     from PySide2 import QtWidgets, QtGui
@@ -27,7 +27,6 @@ from globalsearch.gscore.gspresets import GSPresetTypes
 from globalsearch.gsui.uiutil import GSUIUtil
 from globalsearch.gsui.searchroottree import GSUIComboTreeWidget
 from globalsearch.gsui.resulttree import GSUISearchResultTreeWidget
-from globalsearch.gsui.prefsdlg import GSUIPrefsDlg
 from globalsearch.gsui.searchhistory import GSUISearchHistory
     
 class GSUIToggleToolButton(QtWidgets.QToolButton):
@@ -54,6 +53,9 @@ class GSUIWidget(QWidget):
     """
     Main UI widget
     """
+    LIVE_SEARCH_DELAY = 80 # ms of typing inactivity before a live search starts
+    LIVE_SEARCH_MIN_LENGTH = 2 # shorter search texts match too much to be searched while typing
+    LIVE_SEARCH_SLICE_DURATION = 0.02 # s of searching between UI event processings during a live search, so typing cancels it
 
     class LineEdit(QLineEdit):
         """
@@ -77,6 +79,8 @@ class GSUIWidget(QWidget):
             self.preset = preset
             self.graphNodeFilter = graphNodeFilter
             self.functionNodeFilter = functionNodeFilter
+            self.usagesOf = None # graph or function whose usages are searched
+            self.live = False # search as you type, not added to search history and navigation
 
         def isPreset(self):
             return self.preset != GSPresetTypes.SP_NONE
@@ -90,16 +94,30 @@ class GSUIWidget(QWidget):
         self.uiMgr = gsuiMgr.uiMgr
         self.ui = None
 
-        self.initialPopulationTimer = QTimer(self)
-        self.initialPopulationTimer.timeout.connect(self.doPerformInitialSearchIntoPopulation)
-        self.initialPopulationTimer.setInterval(100) # first timer attempt is fast, others will be spaced more
-
         self.performSearchTimer = QTimer(self)
         self.performSearchTimer.timeout.connect(self.doPerformSearch)
+
+        self.libraryLoadedTimer = QTimer(self) # library nodes are loaded on a background thread, polled until they are ready
+        self.libraryLoadedTimer.timeout.connect(self.onLibraryLoadedTimer)
+        self.libraryLoadedTimer.setInterval(100)
         self.searchParams = None
 
+        self.liveSearchTimer = QTimer(self) # debounces search text changes in live search mode
+        self.liveSearchTimer.setSingleShot(True)
+        self.liveSearchTimer.setInterval(self.LIVE_SEARCH_DELAY)
+        self.liveSearchTimer.timeout.connect(self.onLiveSearchTimer)
+        self.liveSearchSliceTimer = QTimer(self) # runs the next slice of a live search once UI events are processed
+        self.liveSearchSliceTimer.setSingleShot(True)
+        self.liveSearchSliceTimer.setInterval(0)
+        self.liveSearchSliceTimer.timeout.connect(self.onLiveSearchSlice)
+        self.searchRunning = False # a live search is in progress, run in slices
+        self.searchCancelled = False # set when the running live search text changed, checked by the search traversal
+        self.liveSearch = None # (search steps, search params, search criteria, search results) of the live search in progress
+        self.narrowingBasis = None # (search criteria, search root, resource keys with results) of the last live search
+
         self.ignoreSearchTextChanged = False  # used for programmatic search
         self.ignoreNodeFilterTypeChanged = False  # used for programmatic search
+        self.searchHistory = None
 
         self.loadStaticUI()
         self.setupDynamicUI()
@@ -139,10 +157,6 @@ class GSUIWidget(QWidget):
 
         self.ui.btn_focus_sr.setCheckable(True)
         self.ui.btn_focus_sr.setChecked(True)
-
-        self.setupNodeTypeFilters()
-
-        self.timedInitialSearchIntoPopulation()
         
     def setupDynamicUI(self):
         # add the search root combo box
@@ -155,8 +169,14 @@ class GSUIWidget(QWidget):
         self.ui.hl_search.insertWidget(5, self.searchResultDisplayToogleButton)
         self.curSearchPreset = GSPresetTypes.SP_NONE
 
+        self.resultFilterEdit = QLineEdit(self.ui)
+        self.resultFilterEdit.setPlaceholderText("Filter results (text, type:..., pkg:...)")
+        self.resultFilterEdit.setToolTip("Narrow displayed search results without searching again.\nAll terms must match, type: matches result types and pkg: result packages")
+        self.resultFilterEdit.setClearButtonEnabled(True)
+        self.ui.vl_search_main.insertWidget(2, self.resultFilterEdit)
+
         self.searchResultTreeWidget = GSUISearchResultTreeWidget(self.gsuiMgr, self.ui)
-        self.ui.vl_search_main.insertWidget(2, self.searchResultTreeWidget)
+        self.ui.vl_search_main.insertWidget(3, self.searchResultTreeWidget)
 
         spacer = QSpacerItem(10, 24, QSizePolicy.Expanding, QSizePolicy.Minimum)
         self.ui.hl_found.insertSpacerItem(1, spacer)
@@ -169,6 +189,7 @@ class GSUIWidget(QWidget):
         self.onSearchTextOrNodeTypeFilterChanged()
         self.enableSearchResultControls()
 
+    # hundreds of entries: called by GSUIManager once the dock is shown
     def setupNodeTypeFilters(self):
         # --- Compositing nodes
         self.ui.cb_graph_node_type.addItem("All graph nodes", None)
@@ -190,7 +211,10 @@ class GSUIWidget(QWidget):
 
         # SD Library nodes
         self.addSeparatorToNodeTypeCB("Library nodes", boldFont)
-        self.populateLibraryNodeTypeCB() 
+        if gssdlibrary.g_gssdlibrary.isLoaded():
+            self.populateLibraryNodeTypeCB()
+        else:
+            self.libraryLoadedTimer.start() # library nodes being last in the combo box, they can be appended once loaded
 
         # --- Function nodes
         self.ui.cb_fct_node_type.addItem("All function nodes", None)
@@ -215,6 +239,11 @@ class GSUIWidget(QWidget):
                 display_label = GSUIUtil.croppedText(label, maxLen=28, ellipsis='..')
                 self.ui.cb_graph_node_type.addItem(display_label, data)
 
+    def onLibraryLoadedTimer(self):
+        if gssdlibrary.g_gssdlibrary.isLoaded():
+            self.libraryLoadedTimer.stop()
+            self.populateLibraryNodeTypeCB()
+
     def populateSystemNodeTypeCB(self, collection, cb):
         sorted_items = dict(sorted(collection.items(), key=lambda item: item[1][1].lower()))
         for definition, typeTuple in sorted_items.items():
@@ -223,22 +252,10 @@ class GSUIWidget(QWidget):
             display_label = GSUIUtil.croppedText(label, maxLen=28, ellipsis='..')
             cb.addItem(display_label, data)
 
-    # We perform a first Search Into population on timer. As long as we have no population, we retry on timer until we have one. This prevents user to have to manually hit the Refresh button the first time the plugin is being used.
-    # This could be avoided if we had events notifying us of new graph/package created/loaded.
-    def timedInitialSearchIntoPopulation(self):
-        if not self.initialPopulationTimer.isActive():
-            self.initialPopulationTimer.start()
-
-    def doPerformInitialSearchIntoPopulation(self):
-        self.initialPopulationTimer.setInterval(1000)
-        # gslog.info('Automatic refreshing of "Search Into" content until first population')
-        self.searchRootWidget.reload()
-
-        # check if we have population
-        itemCount = self.searchRootWidget.treeWidget.topLevelItem(0).childCount() # top level item "Everything" is always present
-        if itemCount > 0:
-            self.initialPopulationTimer.stop()
-            gslog.info('"Search Into" has been populated, stopping automatic population on timer')
+    # user packages were loaded or closed (see GSUIManager.checkPackages): only the affected root entries are updated
+    def onPackagesChanged(self):
+        self.narrowingBasis = None
+        self.searchRootWidget.reload(resetKept=False)
 
     def showNodeTypeFilters(self, show):
         # self.ui.l_graph_node_type.setVisible(show)
@@ -269,6 +286,7 @@ class GSUIWidget(QWidget):
         self.ui.btn_next_sr.clicked.connect(lambda:self.onNextFoundResult())
         self.ui.btn_save_sr.clicked.connect(lambda:self.onSaveSearchResults())
         self.searchResultDisplayToogleButton.toggled.connect(self.onSearchResultDisplayToggle)
+        self.resultFilterEdit.textChanged.connect(self.onResultFilterTextChanged)
         
     def getCurrentSearchRoot(self):
         treeWidget = self.searchRootWidget.treeWidget
@@ -335,18 +353,21 @@ class GSUIWidget(QWidget):
     
     def onRefresh(self):
         gslog.info('Refreshing "Search Into" content')
+        SDObj.invalidateNameCache()
+        self.narrowingBasis = None
         self.searchRootWidget.reload()
+        self.gsuiMgr.syncIndex()
 
     def onSearch(self):
         self.getTextAndSearch(nav=False)
 
-    def getTextAndSearch(self, nav=False):
+    def getTextAndSearch(self, nav=False, live=False):
         searchStr = self.ui.cb_search.currentText()
         if (searchStr and len(searchStr) > 0) or (self.ui.cb_graph_node_type.currentIndex() > 0) or (self.ui.cb_fct_node_type.currentIndex() > 0):
             customTreeData = self.getCurrentSearchRoot()
             if customTreeData:
                 if self.isSearchRootValid(customTreeData):
-                    self.performSearch(searchStr, customTreeData.sdObj, nav, self.curSearchPreset)
+                    self.performSearch(searchStr, customTreeData.sdObj, nav, self.curSearchPreset, live)
                 else:
                     gslog.warning("Search Root does not exist anymore, refreshing search roots and selecting \"Everything\" as Search Root.")
                     self.onRefresh()
@@ -358,6 +379,69 @@ class GSUIWidget(QWidget):
         if not self.ignoreSearchTextChanged:
             self.curSearchPreset = GSPresetTypes.SP_NONE
             self.onSearchTextOrNodeTypeFilterChanged()
+            if self.gsuiMgr.prefs.sp_liveSearch:
+                self.scheduleLiveSearch()
+
+    # --- live search
+    def scheduleLiveSearch(self):
+        if self.searchRunning:
+            self.searchCancelled = True # stale search text
+        self.liveSearchTimer.start()
+
+    def onLiveSearchTimer(self):
+        searchStr = self.ui.cb_search.currentText()
+        if searchStr and len(searchStr) >= self.LIVE_SEARCH_MIN_LENGTH:
+            self.getTextAndSearch(live=True)
+        elif not searchStr:
+            self.emptySearchResults()
+            self.clearStatus()
+            self.enableSearchResultControls()
+
+    # A live search is run in slices of LIVE_SEARCH_SLICE_DURATION from timer events (see GlobalSearch.searchSteps()), UI events
+    # being processed between slices by the event loop, never from within the search
+    def onLiveSearchSlice(self):
+        if self.liveSearch is None:
+            return
+        steps, searchParams, searchCriteria, searchResults = self.liveSearch
+        sliceEnd = time.perf_counter() + self.LIVE_SEARCH_SLICE_DURATION
+        try:
+            while time.perf_counter() < sliceEnd:
+                next(steps)
+        except StopIteration:
+            self.liveSearch = None
+            self.searchRunning = False
+            self.searchEnded(searchParams, searchCriteria, searchResults)
+            return
+        except Exception:
+            self.stopLiveSearch()
+            raise
+        self.liveSearchSliceTimer.start()
+
+    # the live search in progress is abandoned, its results are not displayed
+    def stopLiveSearch(self):
+        self.liveSearchSliceTimer.stop()
+        if self.liveSearch:
+            self.liveSearch[0].close()
+            self.liveSearch = None
+        self.searchRunning = False
+
+    # the UI is being removed: a running search is abandoned and no search is started anymore
+    def abandonSearch(self):
+        self.liveSearchTimer.stop()
+        self.performSearchTimer.stop()
+        self.stopLiveSearch()
+
+    # called from the search traversal: the live search text changed since the search started
+    def isLiveSearchStale(self):
+        return self.searchCancelled
+
+    # keys of the resources the previous live search found results in, if the new search can only find results among them
+    def narrowingKeys(self, searchCriteria, searchRoot):
+        if self.narrowingBasis:
+            criteria, root, keys = self.narrowingBasis
+            if root == searchRoot and searchCriteria.isNarrowingOf(criteria):
+                return keys
+        return None
 
     def onSearchTextOrNodeTypeFilterChanged(self):
         if not self.ignoreNodeFilterTypeChanged:
@@ -385,6 +469,8 @@ class GSUIWidget(QWidget):
         self.searchResultTreeWidget.expandCollapseAllItems(expand=False)
 
     def onClear(self):
+        self.liveSearchTimer.stop()
+        self.stopLiveSearch()
         self.ui.cb_search.lineEdit().clear()
         self.ui.cb_search.setCurrentIndex(-1)
         self.curSearchPreset = GSPresetTypes.SP_NONE
@@ -394,37 +480,23 @@ class GSUIWidget(QWidget):
 
     def onPrefs(self):
         if not self.prefsDlg:
+            from globalsearch.gsui.prefsdlg import GSUIPrefsDlg # loaded on first use
             self.prefsDlg = GSUIPrefsDlg(self.gsuiMgr, self)
         self.prefsDlg.setupFromPrefs()
         self.prefsDlg.show()
 
     def navFirstOrLastFoundItem(self, first):
-        foundItem = None
-        # get first or last item in tree
-        item = self.searchResultTreeWidget.navFirstTreeItem() if first else self.searchResultTreeWidget.navLastTreeItem()
-        if item:
-            # is this item a found item?
-            if self.searchResultTreeWidget.navIsFoundItem(item):
-                foundItem = item
-            else:
-                # this item is not a found item, find the first found item either forward (first is True) or backward
-                foundItem = self.searchResultTreeWidget.navFoundItem(first, item)
-        return foundItem
+        return self.searchResultTreeWidget.navFirstFoundItem() if first else self.searchResultTreeWidget.navLastFoundItem()
 
     def navFoundResult(self, next):
         if not self.hasSearchResults():
             return
 
+        # without currently selected item, the search for the next or previous found item starts from the last navigated one (or first/last)
         item = self.searchResultTreeWidget.currentItem()
-        foundItem = None
-        if not item:
-            # no currently selected item, get first (next) or last (prev) found item
-            foundItem = self.navFirstOrLastFoundItem(next)
-        else:
-            # search for the next or previous found item
-            foundItem = self.searchResultTreeWidget.navFoundItem(next, item)
+        foundItem = self.searchResultTreeWidget.navFoundItem(next, item)
 
-        if foundItem:
+        if foundItem is not None:
             self.searchResultTreeWidget.setCurrentItem(foundItem)
             if self.ui.btn_focus_sr.isChecked():
                 self.searchResultTreeWidget.openOrFocusOnItemIfPossible(foundItem)
@@ -453,8 +525,10 @@ class GSUIWidget(QWidget):
 
      # --- processings
     # nav: True if search is issued by a navitation prev/next action
-    def performSearch(self, searchStr, searchRoot, nav=False, preset = GSPresetTypes.SP_NONE):
+    # live: True if search is issued while typing (see sp_liveSearch)
+    def performSearch(self, searchStr, searchRoot, nav=False, preset = GSPresetTypes.SP_NONE, live=False):
         self.setStatusSearching()
+        self.stopLiveSearch() # superseded by this search
 
         # Node type filter
         graphNodeFilter = None
@@ -464,36 +538,74 @@ class GSUIWidget(QWidget):
             functionNodeFilter = self.ui.cb_fct_node_type.currentData()
 
         self.searchParams = self.SearchParams(searchStr, searchRoot, nav, preset, graphNodeFilter, functionNodeFilter)
+        self.searchParams.live = live
+        if not live:
+            self.liveSearchTimer.stop()
+        self.performSearchTimer.start(1)
+
+    # search for the usages of a graph or function (graph instances, function calls) across loaded packages
+    def usagesSearch(self, resource):
+        self.setStatusSearching()
+        type, _ = SDObj.type(resource)
+        self.searchParams = self.SearchParams(SDObj.name(resource, type), None, False, GSPresetTypes.SP_NONE, None, None)
+        self.searchParams.usagesOf = resource
+        self.stopLiveSearch()
         self.performSearchTimer.start(1)
 
     def doPerformSearch(self):
         self.performSearchTimer.stop()
+        self.stopLiveSearch()
+
+        searchParams = self.searchParams
         searchCriteria = self.gsuiMgr.prefs.toSearchCriteria()
-        searchCriteria.searchString = self.searchParams.searchStr
-        searchCriteria.graphNodeFilter = self.searchParams.graphNodeFilter
-        searchCriteria.functionNodeFilter = self.searchParams.functionNodeFilter
+        searchCriteria.searchString = searchParams.searchStr
+        searchCriteria.graphNodeFilter = searchParams.graphNodeFilter
+        searchCriteria.functionNodeFilter = searchParams.functionNodeFilter
+        searchCriteria.usagesOf = searchParams.usagesOf
 
         # gslog.debug(str(searchCriteria))
 
         # search presets
-        if self.searchParams.preset == GSPresetTypes.SP_PARAM_CUSTOM_FUNC:
+        if searchParams.preset == GSPresetTypes.SP_PARAM_CUSTOM_FUNC:
             searchCriteria.setupForSSParamFunc()
-        elif self.searchParams.preset == GSPresetTypes.SP_TODO or self.searchParams.preset == GSPresetTypes.SP_TMP:
+        elif searchParams.preset == GSPresetTypes.SP_TODO or searchParams.preset == GSPresetTypes.SP_TMP:
             searchCriteria.caseSensitive = True
+        elif searchParams.preset == GSPresetTypes.SP_VAR_SET_NOT_READ or searchParams.preset == GSPresetTypes.SP_VAR_READ_NOT_SET:
+            searchCriteria.setupForSSVariables(setNotRead=searchParams.preset == GSPresetTypes.SP_VAR_SET_NOT_READ)
+        elif searchParams.preset == GSPresetTypes.SP_LIBRARY_USAGE:
+            searchCriteria.setupForSSLibraryUsage()
+
+        searchResults = SearchResults()
+        globalSearch = GlobalSearch(sd.getContext(), self.gsuiMgr.prefs, searchParams.searchRoot, searchCriteria, searchResults)
+        if searchParams.live:
+            # a live search is abandoned as soon as the search text changes, and only searches where the previous one found results
+            # when the search text is extended. Searches issued otherwise are complete, as packages may have been edited since.
+            globalSearch.cancelCheck = self.isLiveSearchStale
+            globalSearch.narrowingKeys = self.narrowingKeys(searchCriteria, searchParams.searchRoot)
+            self.searchRunning = True
+            self.searchCancelled = False
+            self.liveSearch = (globalSearch.searchSteps(), searchParams, searchCriteria, searchResults)
+            self.onLiveSearchSlice()
+        else:
+            self.narrowingBasis = None
+            globalSearch.search()
+            self.searchEnded(searchParams, searchCriteria, searchResults)
 
-        self.searchResults = SearchResults()
-        globalSearch = GlobalSearch(sd.getContext(), self.gsuiMgr.prefs, self.searchParams.searchRoot, searchCriteria, self.searchResults)
-
-        globalSearch.search()
+    def searchEnded(self, searchParams, searchCriteria, searchResults):
         #searchResults.log()
+        if self.ui is None or searchResults.cancelled:
+            return # UI removed or live search text changed, the newer search is already scheduled
 
-        self.updateWithSearchResults(self.searchResults, searchCriteria)
+        if searchParams.live:
+            self.narrowingBasis = (searchCriteria, searchParams.searchRoot, GlobalSearch.resourceKeysWithResults(searchResults))
+        self.searchResults = searchResults
+        self.updateWithSearchResults(searchResults, searchCriteria, handleHistoryAndNav=not searchParams.live)
         
     def updateWithSearchResults(self, searchResults, searchCriteria, handleHistoryAndNav = True):
         self.emptySearchResults()
         self.populateSearchResults(searchResults, searchCriteria)
         if searchResults.hasSearchResults():
-            if handleHistoryAndNav:
+            if handleHistoryAndNav and not self.searchParams.usagesOf:
                 if self.searchHistory:
                     if not self.searchParams.isPreset() and self.searchParams.hasSearchString():
                         self.searchHistory.push(self.searchParams.searchStr)
@@ -504,6 +616,13 @@ class GSUIWidget(QWidget):
                     self.enableNavButtons()
 
             self.setStatusResultFound(searchResults.getFoundCount())
+
+            # node id search (i.e. from a cooking error) with a single result: go straight to the node
+            if handleHistoryAndNav and searchCriteria.isNodeIdSearch() and searchResults.getFoundCount() == 1 and self.ui.btn_focus_sr.isChecked():
+                foundItem = self.navFirstOrLastFoundItem(first=True)
+                if foundItem is not None:
+                    self.searchResultTreeWidget.setCurrentItem(foundItem)
+                    self.searchResultTreeWidget.openOrFocusOnItemIfPossible(foundItem)
         else:
             if self.searchParams:
                 self.setNotFoundStatus(self.searchParams.searchStr)
@@ -517,6 +636,7 @@ class GSUIWidget(QWidget):
         self.enableExpandCollapseButtons()
         hasSearchResults = self.hasSearchResults()
         self.ui.btn_save_sr.setEnabled(hasSearchResults)
+        self.resultFilterEdit.setEnabled(hasSearchResults)
         self.ui.btn_focus_sr.setEnabled(hasSearchResults)
         self.ui.btn_prev_sr.setEnabled(hasSearchResults)
         self.ui.btn_next_sr.setEnabled(hasSearchResults)
@@ -528,23 +648,35 @@ class GSUIWidget(QWidget):
         self.ui.btn_collapse.setEnabled(enable)
 
     def emptySearchResults(self):
+        self.clearResultFilter()
         self.searchResultTreeWidget.clearAll()
 
     def populateSearchResults(self, searchResults, searchCriteria):
+        self.clearResultFilter()
         self.searchResultTreeWidget.populate(searchResults, searchCriteria)
 
+    def clearResultFilter(self):
+        self.resultFilterEdit.blockSignals(True)
+        self.resultFilterEdit.clear()
+        self.resultFilterEdit.blockSignals(False)
+
+    def onResultFilterTextChanged(self, text):
+        self.searchResultTreeWidget.setFilter(text)
+
     # search history
     def insertSearchHistory(self, index, text, data = GSPresetTypes.SP_NONE):
         self.ui.cb_search.insertItem(index, text, data)
 
     def setupSearchHistory(self):
+        if self.searchHistory:
+            self.searchHistory.close()
         self.searchHistory = GSUISearchHistory(self)
         self.searchHistory.load()
 
         # populate search history
         self.ui.cb_search.clear()
         i = 0
-        for text in self.searchHistory.history:
+        for text in self.searchHistory.texts():
             self.insertSearchHistory(i, text)
             i += 1
         self.ui.cb_search.setCurrentIndex(-1) # not initial selection
@@ -557,6 +689,9 @@ class GSUIWidget(QWidget):
         self.insertSearchHistory(self.searchHistorySeparatorIndex + 1, "Param functions", GSPresetTypes.SP_PARAM_CUSTOM_FUNC)
         self.insertSearchHistory(self.searchHistorySeparatorIndex + 2, "TODO", GSPresetTypes.SP_TODO)
         self.insertSearchHistory(self.searchHistorySeparatorIndex + 3, "TMP", GSPresetTypes.SP_TMP)
+        self.insertSearchHistory(self.searchHistorySeparatorIndex + 4, "Variables set but never read", GSPresetTypes.SP_VAR_SET_NOT_READ)
+        self.insertSearchHistory(self.searchHistorySeparatorIndex + 5, "Variables read but never set", GSPresetTypes.SP_VAR_READ_NOT_SET)
+        self.insertSearchHistory(self.searchHistorySeparatorIndex + 6, "Library usage", GSPresetTypes.SP_LIBRARY_USAGE)
 
         self.enableNavButtons()
 
@@ -607,8 +742,10 @@ class GSUIWidget(QWidget):
         self.ui.cb_search.insertItem(0, text, GSPresetTypes.SP_NONE)
         self.updateSearchHistorySeparatorIndex()
 
-    def searchHistoryRemoved(self, index):
-        self.ui.cb_search.removeItem(index)
+    def searchHistoryRemoved(self, text):
+        index = self.ui.cb_search.findText(text)
+        if 0 <= index < self.searchHistorySeparatorIndex:
+            self.ui.cb_search.removeItem(index)
         self.updateSearchHistorySeparatorIndex()
 
     def searchHistoryCleared(self):
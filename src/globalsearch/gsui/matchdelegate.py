@@ -0,0 +1,75 @@
+# ---------------
+# Global Search - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import sd
+if sd.getContext().getSDApplication().getVersion() < "14.0.0":
+    from PySide2.QtCore import Qt, QRect
+    from PySide2.QtGui import QColor, QFont, QFontMetrics, QPalette
+    from PySide2.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionViewItem
+else:
+    from PySide6.QtCore import Qt, QRect
+    from PySide6.QtGui import QColor, QFont, QFontMetrics, QPalette
+    from PySide6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+from globalsearch.gsui.resultmodel import GSUISearchResultModel
+
+class GSUIMatchDelegate(QStyledItemDelegate):
+    """
+    Paints found texts of search results with the search match highlighted. The match span is provided by the model
+    (see GSUISearchResultModel.MATCH_SPAN_ROLE) as recorded at match time, texts are not searched again.
+    Other cells are painted as usual.
+    """
+    HIGHLIGHT_COLOR = QColor(255, 190, 0, 80)
+    TEXT_MARGIN = 3 # horizontal margin of item view texts, see QCommonStyle
+
+    def paint(self, painter, option, index):
+        span = index.data(GSUISearchResultModel.MATCH_SPAN_ROLE)
+        if not span:
+            super().paint(painter, option, index)
+            return
+
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        text = opt.text
+        opt.text = ""
+        widget = opt.widget
+        style = widget.style() if widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, widget) # background, selection, icon
+        textRect = style.subElementRect(QStyle.SE_ItemViewItemText, opt, widget).adjusted(self.TEXT_MARGIN, 0, -self.TEXT_MARGIN, 0)
+
+        selected = opt.state & QStyle.State_Selected
+        textColor = opt.palette.color(QPalette.HighlightedText if selected else QPalette.Text)
+        boldFont = QFont(opt.font)
+        boldFont.setBold(True)
+
+        painter.save()
+        painter.setClipRect(textRect)
+        painter.setPen(textColor)
+        x = textRect.left()
+        start, end = span
+        for segment, font in ((text[:start], opt.font), (text[start:end], boldFont), (text[end:], opt.font)):
+            if not segment:
+                continue
+            width = QFontMetrics(font).horizontalAdvance(segment)
+            segmentRect = QRect(x, textRect.top(), width, textRect.height())
+            if font is boldFont and not selected:
+                painter.fillRect(segmentRect, self.HIGHLIGHT_COLOR)
+            painter.setFont(font)
+            painter.drawText(segmentRect, Qt.AlignLeft | Qt.AlignVCenter, segment)
+            x += width
+            if x > textRect.right():
+                break
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        span = index.data(GSUISearchResultModel.MATCH_SPAN_ROLE)
+        if span:
+            # the match being painted in bold, it is wider than measured
+            match = index.data(Qt.DisplayRole)[span[0]:span[1]]
+            boldFont = QFont(option.font)
+            boldFont.setBold(True)
+            size.setWidth(size.width() + QFontMetrics(boldFont).horizontalAdvance(match) - QFontMetrics(option.font).horizontalAdvance(match))
+        return size
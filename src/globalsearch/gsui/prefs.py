@@ -6,29 +6,33 @@
 import os
 import json
 
-from globalsearch.gscore import gslog
+from globalsearch.gscore import gslog, gsstore
 from globalsearch.gscore.searchdata import SearchCriteria
 
 class GSUIPref:
     """
     Holding Preferences, non UI form
+    Preferences are saved to the store (see GSStore), only the ones changed since last saved being written
     """
 
     """
     Preferences file format versions:
+    7: added sp_liveSearch
+    6: added ix_prune
+    5: added ix_enable, ix_watchDirs
     4: removed sp_naturalSearch, added sp_wholeWord, dev_unitTests, dev_searchLogs
     3: added sp_displayNodeIds
     2: added sc_GraphParamFunc
     1: initial version
     """
-    VERSION = "4"
+    VERSION = "7"
+    NOT_SAVED = ("savedValues", "path") # attributes which are not preferences ("path" was saved by JSON preference files)
     
     def __init__(self):
         self.setupDefaults()
-        self.path = self.__class__.filename()
+        self.savedValues = {} # key: preference name, value: JSON of the value last saved to the store
         self.load()
-        if not os.path.exists(self.path):
-            self.save()
+        self.save() # preferences not in the store yet (first run, added by this version)
      
     def setupDefaults(self):
         self.version = self.__class__.VERSION
@@ -49,6 +53,11 @@ class GSUIPref:
         self.sp_enterGraphPkgFct = False
         self.sp_enterCustomSubGraphs = False
         self.sp_displayNodeIds = True
+        self.sp_liveSearch = False # search as you type
+
+        self.ix_enable = False # content index kept up to date when packages are saved
+        self.ix_watchDirs = [] # asset directories watched in addition to the loaded user packages
+        self.ix_prune = False # skip graphs and functions whose indexed content cannot match the search string (ignores unsaved changes)
         
         # development only, not visible in the UI
         self.dev_unitTests = False # enables unit test menus
@@ -60,22 +69,33 @@ class GSUIPref:
         path = os.path.join(path ,"gsprefs.json")
         return path
 
-    def load(self):
-        if os.path.exists(self.path):
-            try:
-                with open(self.path, "r") as readFile:
-                    j = json.load(readFile)
-                self.__dict__.update(j)
-                self.version = self.__class__.VERSION # force current version
-            except:
-                gslog.error("Error loading preferences.")
+    def values(self):
+        return {name: value for name, value in self.__dict__.items() if name not in self.NOT_SAVED}
 
-    def save(self):
+    # preferences file of previous versions, imported once into the store
+    def importJSON(self, j):
+        gsstore.g_gsstore.savePrefs({name: value for name, value in j.items() if name not in self.NOT_SAVED})
+
+    def load(self):
+        store = gsstore.g_gsstore
         try:
-            with open(self.path, "w") as writeFile: 
-                json.dump(self.__dict__, writeFile)
+            store.migrateJSONFile("prefs", self.__class__.filename(), self.importJSON)
+            values = store.prefs()
+            self.__dict__.update(values)
+            self.savedValues = {name: json.dumps(value) for name, value in values.items()}
+            self.version = self.__class__.VERSION # force current version
         except:
-            gslog.error("Error saving preferences.")
+            gslog.error("Error loading preferences.")
+
+    def save(self):
+        values = {name: json.dumps(value) for name, value in self.values().items()}
+        changed = [name for name, value in values.items() if self.savedValues.get(name) != value]
+        if changed:
+            try:
+                gsstore.g_gsstore.savePrefs({name: self.__dict__[name] for name in changed})
+                self.savedValues.update({name: values[name] for name in changed})
+            except:
+                gslog.error("Error saving preferences.")
 
     def toSearchCriteria(self):
         sc = SearchCriteria()
@@ -3,6 +3,7 @@
 # (c) 2019-2025 Eyosido Software SARL
 # ---------------
 
+import os
 import sd
 if sd.getContext().getSDApplication().getVersion() < "14.0.0":
     from PySide2 import QtCore, QtWidgets
@@ -137,6 +138,12 @@ class GSUIPrefsDlg(QtWidgets.QDialog):
         self.chk_disp_node_ids.setToolTip("Displays numerical node identifiers in search results")
         self.chk_disp_node_ids.setText("Display node Ids")
 
+        self.chk_live_search = QtWidgets.QCheckBox(self.gb_search_process)
+        search_process_left_col_layout.addWidget(self.chk_live_search)
+        self.chk_live_search.setToolTip("Search while typing the search text, results being updated after a short pause.\n"
+"Live searches are not added to the search history, press Enter to do so.")
+        self.chk_live_search.setText("Search as you type")
+
         search_process_right_col_layout = QVBoxLayout()
         search_process_content_layout.addLayout(search_process_right_col_layout)
 
@@ -156,6 +163,33 @@ class GSUIPrefsDlg(QtWidgets.QDialog):
 
         search_process_right_col_layout.addStretch(1)
 
+        # --- Content Index
+        self.gb_index = QtWidgets.QGroupBox("Content Index")
+        main_layout.addWidget(self.gb_index)
+
+        index_group_layout = QVBoxLayout()
+        self.gb_index.setLayout(index_group_layout)
+
+        self.chk_ix_enable = QtWidgets.QCheckBox(self.gb_index)
+        index_group_layout.addWidget(self.chk_ix_enable)
+        self.chk_ix_enable.setToolTip("Keep an index of the content of user packages, updated when packages are saved.\n"
+            "Node type filters and variable names are then looked up in the index for graphs not modified since last save")
+        self.chk_ix_enable.setText("Enable content index")
+
+        self.chk_ix_prune = QtWidgets.QCheckBox(self.gb_index)
+        index_group_layout.addWidget(self.chk_ix_prune)
+        self.chk_ix_prune.setToolTip("Skip graphs, functions and folders whose indexed content cannot match the search string.\n"
+"The index reflects saved packages: changes made since the last save are not searched with this option.")
+        self.chk_ix_prune.setText("Skip graphs not matching indexed content")
+
+        index_dirs_layout = QHBoxLayout()
+        index_group_layout.addLayout(index_dirs_layout)
+        l_ix_watch_dirs = QtWidgets.QLabel("Watched directories:", self.gb_index)
+        index_dirs_layout.addWidget(l_ix_watch_dirs)
+        self.le_ix_watch_dirs = QtWidgets.QLineEdit(self.gb_index)
+        index_dirs_layout.addWidget(self.le_ix_watch_dirs)
+        self.le_ix_watch_dirs.setToolTip("Asset directories watched for package changes in addition to the loaded packages, separated by \"" + os.pathsep + "\"")
+
         # gb_bottom = QtWidgets.QGroupBox()
         # main_layout.addWidget(gb_bottom)
 
@@ -207,6 +241,11 @@ class GSUIPrefsDlg(QtWidgets.QDialog):
         self.chk_enter_subgraphs.setChecked(prefs.sp_enterCustomSubGraphs)
 
         self.chk_disp_node_ids.setChecked(prefs.sp_displayNodeIds)
+        self.chk_live_search.setChecked(prefs.sp_liveSearch)
+
+        self.chk_ix_enable.setChecked(prefs.ix_enable)
+        self.chk_ix_prune.setChecked(prefs.ix_prune)
+        self.le_ix_watch_dirs.setText(os.pathsep.join(prefs.ix_watchDirs))
 
     def saveToPrefs(self):
         prefs = self.gsuiMgr.prefs
@@ -235,6 +274,10 @@ class GSUIPrefsDlg(QtWidgets.QDialog):
         prefs.sp_enterGraphPkgFct = self.chk_enter_pkg_func.isChecked()
         prefs.sp_enterCustomSubGraphs = self.chk_enter_subgraphs.isChecked()
         prefs.sp_displayNodeIds = self.chk_disp_node_ids.isChecked()
+        prefs.sp_liveSearch = self.chk_live_search.isChecked()
+        prefs.ix_enable = self.chk_ix_enable.isChecked()
+        prefs.ix_prune = self.chk_ix_prune.isChecked()
+        prefs.ix_watchDirs = [d.strip() for d in self.le_ix_watch_dirs.text().split(os.pathsep) if len(d.strip()) > 0]
         prefs.save()
 
     def onFunctionStateChanged(self, state):
@@ -254,6 +297,7 @@ class GSUIPrefsDlg(QtWidgets.QDialog):
                 self.gsuiMgr.uiWidget.searchHistory.clear()
         
     def onAccept(self):
+        self.gsuiMgr.uiWidget.stopLiveSearch() # searched with former preferences
         self.saveToPrefs()
         self.gsuiMgr.updateFromPrefs()
         self.gsuiMgr.uiWidget.searchResultTreeWidget.updateFromPrefs()
@@ -0,0 +1,536 @@
+# ---------------
+# Global Search - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import bisect
+import sd
+if sd.getContext().getSDApplication().getVersion() < "14.0.0":
+    from PySide2.QtCore import Qt, QAbstractItemModel, QModelIndex
+else:
+    from PySide6.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+from sd.api.sdnode import SDNode
+from globalsearch.gsui.uiutil import GSUIUtil
+from globalsearch.gscore.sdobj import SDObj
+from globalsearch.gscore.searchdata import SearchResultPathNode
+
+class GSUISearchResultModel(QAbstractItemModel):
+    """
+    Item model over the path tree of a SearchResults. Rows are fetched in batches as the view needs them
+    and display data is only computed for the rows actually displayed.
+    In list display mode, rows are the path nodes having a found match, with the path leading to them.
+    """
+    FETCH_BATCH_SIZE = 256
+    ICON_HEIGHT = 18
+
+    # Display modes
+    DM_TREE = 0
+    DM_LIST = 1
+
+    HEADERS = {
+        DM_TREE: ("Location", "Found", "Node Id"),
+        DM_LIST: ("Found", "Context", "Node Id", "Path")
+    }
+    COLUMN_COUNT = 4 # Path column is hidden in tree display mode
+    FOUND_COLUMN = {DM_TREE: 1, DM_LIST: 0}
+    MATCH_SPAN_ROLE = Qt.UserRole + 1 # (start, end) of the search match within the displayed found text, see GSUIMatchDelegate
+
+    def __init__(self, searchResults, searchCriteria, displayMode, parent=None):
+        super().__init__(parent)
+        self.searchResults = searchResults
+        self.searchCriteria = searchCriteria
+        self.displayMode = displayMode
+        self.rootNode = None
+        self.topNodes = [] # displayed top level path nodes
+        self.unfilteredTopNodes = [] # top level path nodes, sorted in list display mode
+        self.foundNodes = [] # found path nodes in tree order, always collected in list display mode, on first filtering in tree display mode
+        self.sortKeyColumns = {} # list display mode, key: column, value: sort key of each found node (see sortKeys())
+        self.sortPermutations = {} # list display mode, key: column, value: found node indexes in ascending order
+        self.pathStrings = {} # list display mode, key: id(pathNode), value: path string up to pathNode, shared by the rows below it
+        self.fetched = {} # key: id(parent path node) (None for top level), value: number of rows fetched
+        self.rowOf = {} # key: id(pathNode), value: row of the fetched path node in its parent
+        self.rowData = {} # key: id(pathNode), value: (texts, icons) per column
+        self.matchSpans = {} # key: id(pathNode), value: match span within the displayed found text, see foundText()
+        self.orderedNodes = None # path nodes in display order, see nodesInOrder()
+        self.nodePosition = None # key: id(pathNode), value: position in orderedNodes
+        self.foundPositions = None # positions in orderedNodes of the path nodes having a found match, ascending
+        self.foundRank = None # key: id(pathNode), value: index in foundPositions
+        self.foundCursor = -1 # index in foundPositions of the current found item, -1 if none
+
+        # filtering within results
+        self.filterTerms = [] # (category, value) tuples, see parseFilter()
+        self.filterKeys = None # (found pathNode, text key, type key, package key) tuples, see computeFilterKeys()
+        self.filterMatches = None # filterKeys entries matching filterTerms
+        self.visibleIds = None # ids of the path nodes displayed with the filter, None if not filtered
+        self.filteredChildren = {} # key: id(pathNode), value: displayed children of pathNode
+        self.packageKeys = {} # key: id(top level path node), value: package filter key of the nodes below it
+
+        if searchResults and searchResults.pathTree:
+            pathTree = searchResults.pathTree
+            if displayMode == self.DM_TREE:
+                if pathTree.subType == SDObj.ROOT:
+                    self.rootNode = pathTree
+                    self.unfilteredTopNodes = pathTree.children
+                else:
+                    self.unfilteredTopNodes = [pathTree]
+            else:
+                self.collectFoundNodes(pathTree)
+                self.unfilteredTopNodes = list(self.foundNodes)
+            self.topNodes = self.unfilteredTopNodes
+
+    def collectFoundNodes(self, pathNode):
+        if pathNode.subType != SDObj.ROOT and pathNode.hasFoundMatch():
+            self.foundNodes.append(pathNode)
+        for child in pathNode.children:
+            self.collectFoundNodes(child)
+
+    # --- structure
+    def nodeFromIndex(self, index):
+        return index.internalPointer() if index.isValid() else None
+
+    def childNodes(self, pathNode):
+        if pathNode is None:
+            return self.topNodes
+        if self.displayMode == self.DM_LIST:
+            return []
+        if self.visibleIds is None:
+            return pathNode.children
+        children = self.filteredChildren.get(id(pathNode))
+        if children is None:
+            children = self.filterNodes(pathNode.children)
+            self.filteredChildren[id(pathNode)] = children
+        return children
+
+    def fetchedCount(self, pathNode):
+        return self.fetched.get(id(pathNode) if pathNode is not None else None, 0)
+
+    def index(self, row, column, parent=QModelIndex()):
+        pathNode = self.nodeFromIndex(parent)
+        if 0 <= row < self.fetchedCount(pathNode) and 0 <= column < self.COLUMN_COUNT:
+            return self.createIndex(row, column, self.childNodes(pathNode)[row])
+        return QModelIndex()
+
+    def parent(self, index):
+        pathNode = self.nodeFromIndex(index)
+        if pathNode is None or self.displayMode == self.DM_LIST:
+            return QModelIndex()
+        parentNode = pathNode.parent
+        if parentNode is None or parentNode is self.rootNode:
+            return QModelIndex()
+        return self.createIndex(self.rowOf[id(parentNode)], 0, parentNode)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return self.fetchedCount(self.nodeFromIndex(parent))
+
+    def columnCount(self, parent=QModelIndex()):
+        return self.COLUMN_COUNT
+
+    def hasChildren(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return False
+        return len(self.childNodes(self.nodeFromIndex(parent))) > 0
+
+    def canFetchMore(self, parent):
+        pathNode = self.nodeFromIndex(parent)
+        return self.fetchedCount(pathNode) < len(self.childNodes(pathNode))
+
+    def fetchMore(self, parent):
+        pathNode = self.nodeFromIndex(parent)
+        children = self.childNodes(pathNode)
+        start = self.fetchedCount(pathNode)
+        end = min(start + self.FETCH_BATCH_SIZE, len(children))
+        if end > start:
+            self.beginInsertRows(parent, start, end - 1)
+            for row in range(start, end):
+                self.rowOf[id(children[row])] = row
+            self.fetched[id(pathNode) if pathNode is not None else None] = end
+            self.endInsertRows()
+
+    # returns the index of a path node, fetching the rows leading to it if needed
+    def indexForNode(self, pathNode, column=0):
+        chain = []
+        if self.displayMode == self.DM_TREE:
+            n = pathNode
+            while n is not None and n is not self.rootNode:
+                chain.insert(0, n)
+                n = n.parent
+        else:
+            chain = [pathNode]
+
+        index = QModelIndex()
+        for n in chain:
+            while id(n) not in self.rowOf and self.canFetchMore(index):
+                self.fetchMore(index)
+            row = self.rowOf.get(id(n))
+            if row is None:
+                return QModelIndex()
+            index = self.createIndex(row, 0, n)
+        return self.createIndex(index.row(), column, pathNode) if column != 0 else index
+
+    # all path nodes in display order (depth first in tree display mode), whether fetched or not
+    def nodesInOrder(self):
+        if self.orderedNodes is None:
+            if self.displayMode == self.DM_TREE:
+                self.orderedNodes = []
+                stack = list(reversed(self.topNodes))
+                while stack:
+                    pathNode = stack.pop()
+                    self.orderedNodes.append(pathNode)
+                    stack.extend(reversed(self.childNodes(pathNode)))
+            else:
+                self.orderedNodes = list(self.topNodes)
+            self.nodePosition = {id(n): pos for pos, n in enumerate(self.orderedNodes)}
+            self.foundPositions = [pos for pos, n in enumerate(self.orderedNodes) if n.foundMatch is not None]
+            self.foundRank = {id(self.orderedNodes[pos]): rank for rank, pos in enumerate(self.foundPositions)}
+            self.foundCursor = -1
+        return self.orderedNodes
+
+    # --- found item navigation
+    # found nodes are located by their position in display order, the found item navigation being O(1) (O(log n) from a non found node)
+    def foundCount(self):
+        self.nodesInOrder()
+        return len(self.foundPositions)
+
+    def foundNodeAt(self, rank):
+        self.foundCursor = rank
+        return self.orderedNodes[self.foundPositions[rank]]
+
+    def firstFoundNode(self):
+        return self.foundNodeAt(0) if self.foundCount() > 0 else None
+
+    def lastFoundNode(self):
+        return self.foundNodeAt(self.foundCount() - 1) if self.foundCount() > 0 else None
+
+    # found node following or preceding pathNode in display order, cycling at both ends
+    def nextFoundNode(self, pathNode, next):
+        count = self.foundCount()
+        if count == 0:
+            return None
+        rank = self.foundRank.get(id(pathNode))
+        if rank is None:
+            # pathNode is not a found node: locate it among found node positions
+            pos = self.nodePosition.get(id(pathNode))
+            if pos is None:
+                return None
+            if next:
+                rank = bisect.bisect_right(self.foundPositions, pos)
+            else:
+                rank = bisect.bisect_left(self.foundPositions, pos) - 1
+        else:
+            rank = rank + 1 if next else rank - 1
+        return self.foundNodeAt(rank % count)
+
+    # found node following or preceding the current one (the last one returned)
+    def cursorFoundNode(self, next):
+        if self.foundCursor < 0:
+            return self.firstFoundNode() if next else self.lastFoundNode()
+        return self.foundNodeAt((self.foundCursor + (1 if next else -1)) % self.foundCount())
+
+    # --- data
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            headers = self.HEADERS[self.displayMode]
+            if section < len(headers):
+                return headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        pathNode = self.nodeFromIndex(index)
+        if pathNode is None:
+            return None
+        if role == Qt.DisplayRole:
+            return self.rowDataForNode(pathNode)[0][index.column()]
+        elif role == Qt.DecorationRole:
+            return self.rowDataForNode(pathNode)[1][index.column()]
+        elif role == Qt.UserRole:
+            return pathNode
+        elif role == self.MATCH_SPAN_ROLE:
+            if index.column() == self.FOUND_COLUMN[self.displayMode]:
+                self.rowDataForNode(pathNode)
+                return self.matchSpans.get(id(pathNode))
+        return None
+
+    def rowDataForNode(self, pathNode):
+        rowData = self.rowData.get(id(pathNode))
+        if rowData is None:
+            if self.displayMode == self.DM_TREE:
+                rowData = self.rowDataTreeDM(pathNode)
+            else:
+                rowData = self.rowDataListDM(pathNode)
+            self.rowData[id(pathNode)] = rowData
+        return rowData
+
+    def icon(self, type):
+        return GSUIUtil.iconForSDObj(type, self.ICON_HEIGHT)
+
+    @classmethod
+    def idForPathNode(cls, pathNode):
+        sdNode = None
+        ident = None
+        if pathNode.contextNode:
+            sdNode = pathNode.contextNode
+        elif isinstance(pathNode.sdObj, SDNode):
+            sdNode = pathNode.sdObj
+        if sdNode:
+            ident = sdNode.getIdentifier()
+        return ident
+
+    # found match cropped around the span recorded at match time, the span within the cropped text being kept for highlighting
+    def foundText(self, pathNode):
+        text, span = GSUIUtil.croppedTextAroundSpan(pathNode.foundMatch, pathNode.matchSpan)
+        if span:
+            self.matchSpans[id(pathNode)] = span
+        return text
+
+    # --- Tree display mode
+    def rowDataTreeDM(self, pathNode):
+        texts = ["", "", "", ""]
+        icons = [None, None, None, None]
+
+        type,_ = pathNode.consolidatedType()
+
+        # Location: name + icon
+        if type == SDObj.FUNC_PARAM and self.searchCriteria.ss_param_func:
+            locationText = "Parameter function"
+            icons[0] = self.icon(SDObj.FUNC_PARAM)
+        elif pathNode.subType == SDObj.FUNC_CALL:
+            locationText = "Function call"
+            icons[0] = self.icon(SDObj.FUNC_CALL)
+        elif pathNode.subType == SDObj.USAGE:
+            locationText = pathNode.contextString
+            icons[0] = self.icon(SDObj.USAGE)
+        else:
+            locationText = GSUIUtil.croppedText(pathNode.consolidatedName())
+            icons[0] = self.icon(type)
+
+        if len(locationText) == 0:
+            locationText = "(no name)"
+        texts[0] = locationText
+
+        # Found
+        if type == SDObj.FUNC_PARAM and self.searchCriteria.ss_param_func:
+            # special search, search all param functions, there is no string match
+            # in this case so we set the location name in the Found column
+            texts[1] = GSUIUtil.croppedText(pathNode.consolidatedName())
+            icons[1] = self.icon(SDObj.FUNC_PARAM)
+        elif pathNode.hasFoundMatch():
+            texts[1] = self.foundText(pathNode)
+            if pathNode.subType == SDObj.FUNC_CALL:
+                icons[1] = self.icon(SDObj.FUNC_CALL)
+
+        # ID
+        if pathNode.subType != SDObj.FUNC_PARAM:
+            ident = self.idForPathNode(pathNode)
+            if ident:
+                texts[2] = ident
+
+        return (texts, icons)
+
+    # --- List display mode
+    # path string of the nodes leading to pathNode (included), built once per node and extended by its children
+    def pathString(self, pathNode):
+        chain = []
+        n = pathNode
+        while n is not None and n.subType != SDObj.ROOT and id(n) not in self.pathStrings:
+            chain.append(n)
+            n = n.parent
+        s = self.pathStrings.get(id(n), "") if n is not None else ""
+        for node in reversed(chain):
+            _,typeStr = SDObj.type(node.sdObj)
+            segment = typeStr.upper() + ": " +  node.consolidatedName()
+            s = s + " > " + segment if s else segment
+            self.pathStrings[id(node)] = s
+        return s
+
+    def rowDataListDM(self, pathNode):
+        texts = [self.listColumnText(pathNode, c) for c in range(0, self.COLUMN_COUNT)]
+        icons = [None, None, None, None]
+
+        if pathNode.subType == SDObj.FUNC_CALL:
+            type = SDObj.FUNC_CALL
+        else:
+            type,_ = pathNode.consolidatedType()
+        icons[0] = self.icon(type)
+
+        if self.searchCriteria.ss_param_func and pathNode.contextNode:
+            icons[1] = self.icon(SDObj.GRAPH_NODE)
+        return (texts, icons)
+
+    # text of a list display mode column, computed on its own so a column can be sorted without computing the others
+    def listColumnText(self, pathNode, column):
+        if column == 0:
+            # Found
+            if self.searchCriteria.ss_param_func:
+                # special search, search all param functions, there is no string match
+                # in this case so we set the location name in the Found column
+                return GSUIUtil.croppedText(pathNode.consolidatedName())
+            return self.foundText(pathNode)
+        elif column == 1:
+            # Context
+            context = ""
+            if self.searchCriteria.ss_param_func:
+                if pathNode.contextNode:
+                    if pathNode.contextString:
+                        context = pathNode.contextString
+                    else:
+                        tempPathNode = SearchResultPathNode(pathNode.contextNode)
+                        context = tempPathNode.consolidatedName()
+            elif pathNode.contextString:
+                context = pathNode.contextString
+            elif pathNode.subType != SDObj.FUNC_CALL:
+                _, typeStr = pathNode.consolidatedType()
+                context = typeStr.capitalize()
+            return context
+        elif column == 2:
+            # ID
+            ident = self.idForPathNode(pathNode)
+            return ident if ident else ""
+        # Path
+        return self.pathString(pathNode.parent)
+
+    # --- sorting (list display mode)
+    # sort key of every found row for a column, in found order, computed on first sort by this column
+    def sortKeys(self, column):
+        keys = self.sortKeyColumns.get(column)
+        if keys is None:
+            if column == 2:
+                # node ids are numbers
+                keys = [(0, int(t), "") if t.isdigit() else (1, 0, t) for t in (self.listColumnText(n, column) for n in self.foundNodes)]
+            else:
+                keys = [self.listColumnText(n, column).casefold() for n in self.foundNodes]
+            self.sortKeyColumns[column] = keys
+        return keys
+
+    # found row order for a column as a permutation of the found order, computed once per column
+    def sortPermutation(self, column):
+        permutation = self.sortPermutations.get(column)
+        if permutation is None:
+            keys = self.sortKeys(column)
+            permutation = sorted(range(0, len(keys)), key=keys.__getitem__)
+            self.sortPermutations[column] = permutation
+        return permutation
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if self.displayMode != self.DM_LIST or not self.foundNodes:
+            return
+        if 0 <= column < self.COLUMN_COUNT:
+            permutation = self.sortPermutation(column)
+            if order == Qt.DescendingOrder:
+                permutation = reversed(permutation)
+        else:
+            permutation = range(0, len(self.foundNodes)) # unsorted: found order
+
+        self.layoutAboutToBeChanged.emit()
+        oldIndexes = self.persistentIndexList()
+        oldNodes = [self.nodeFromIndex(i) for i in oldIndexes]
+        self.unfilteredTopNodes = [self.foundNodes[i] for i in permutation]
+        self.topNodes = self.filterNodes(self.unfilteredTopNodes)
+        fetchedCount = self.fetchedCount(None)
+        self.rowOf = {}
+        for row in range(0, fetchedCount):
+            self.rowOf[id(self.topNodes[row])] = row
+        newIndexes = []
+        for i, pathNode in zip(oldIndexes, oldNodes):
+            row = self.rowOf.get(id(pathNode))
+            newIndexes.append(self.createIndex(row, i.column(), pathNode) if row is not None else QModelIndex())
+        self.changePersistentIndexList(oldIndexes, newIndexes)
+        self.orderedNodes = None
+        self.layoutChanged.emit()
+
+    # --- filtering within results
+    # A filter is made of space separated terms, all of them having to match a found row: "type:" terms match
+    # the type of the found node, "pkg:" terms the top level entry (package) it is in, other terms its found text,
+    # name, context or path. In tree display mode, ancestors of the matching found nodes are displayed as well.
+    FILTER_CATEGORIES = ("type:", "pkg:")
+
+    @classmethod
+    def parseFilter(cls, filterText):
+        terms = []
+        for token in filterText.casefold().split():
+            category = ""
+            for c in cls.FILTER_CATEGORIES:
+                if token.startswith(c):
+                    category = c
+                    token = token[len(c):]
+                    break
+            if token:
+                terms.append((category, token))
+        return terms
+
+    # filter keys of the found nodes, computed on first filtering
+    def computeFilterKeys(self):
+        if self.filterKeys is None:
+            if self.displayMode == self.DM_TREE and self.searchResults and self.searchResults.pathTree:
+                self.collectFoundNodes(self.searchResults.pathTree)
+            self.filterKeys = []
+            for pathNode in self.foundNodes:
+                _, typeStr = pathNode.consolidatedType()
+                texts = (pathNode.foundMatch, pathNode.consolidatedName(), pathNode.contextString, self.pathString(pathNode.parent))
+                textKey = "\n".join(t for t in texts if t).casefold()
+                self.filterKeys.append((pathNode, textKey, typeStr.casefold(), self.packageKey(pathNode)))
+        return self.filterKeys
+
+    def packageKey(self, pathNode):
+        top = pathNode
+        while top.parent is not None and top.parent.subType != SDObj.ROOT:
+            top = top.parent
+        key = self.packageKeys.get(id(top))
+        if key is None:
+            key = top.consolidatedName().casefold()
+            self.packageKeys[id(top)] = key
+        return key
+
+    # True if the matches of previous terms contain the matches of terms (terms only being more specific)
+    @classmethod
+    def isNarrowing(cls, previousTerms, terms):
+        if len(previousTerms) == 0 or len(terms) < len(previousTerms):
+            return False
+        for (previousCategory, previousValue), (category, value) in zip(previousTerms, terms):
+            if previousCategory != category or previousValue not in value:
+                return False
+        return True
+
+    def filterNodes(self, nodes):
+        if self.visibleIds is None:
+            return nodes
+        return [n for n in nodes if id(n) in self.visibleIds]
+
+    def setFilter(self, filterText):
+        terms = self.parseFilter(filterText)
+        if terms == self.filterTerms:
+            return
+
+        self.beginResetModel()
+        if terms:
+            candidates = self.filterMatches if self.isNarrowing(self.filterTerms, terms) else self.computeFilterKeys()
+            for category, value in terms:
+                # one pass per term over flat key tuples
+                if category == "type:":
+                    candidates = [k for k in candidates if value in k[2]]
+                elif category == "pkg:":
+                    candidates = [k for k in candidates if value in k[3]]
+                else:
+                    candidates = [k for k in candidates if value in k[1]]
+            self.filterMatches = candidates
+            self.visibleIds = set()
+            for k in candidates:
+                pathNode = k[0]
+                if self.displayMode == self.DM_TREE:
+                    while pathNode is not None and pathNode is not self.rootNode and id(pathNode) not in self.visibleIds:
+                        self.visibleIds.add(id(pathNode))
+                        pathNode = pathNode.parent
+                else:
+                    self.visibleIds.add(id(pathNode))
+        else:
+            self.filterMatches = None
+            self.visibleIds = None
+        self.filterTerms = terms
+        self.filteredChildren = {}
+        self.topNodes = self.filterNodes(self.unfilteredTopNodes)
+        self.fetched = {}
+        self.rowOf = {}
+        self.orderedNodes = None
+        self.endResetModel()
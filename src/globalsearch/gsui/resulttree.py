@@ -7,55 +7,64 @@ import sd, sys
 if sd.getContext().getSDApplication().getVersion() < "14.0.0":
     from PySide2 import QtWidgets
     from PySide2.QtGui import QGuiApplication
-    from PySide2.QtCore import Qt
-    from PySide2.QtWidgets import QMenu, QAction, QTreeWidgetItemIterator, QMessageBox
+    from PySide2.QtCore import Qt, QModelIndex
+    from PySide2.QtWidgets import QMenu, QAction, QMessageBox
 else:
     from PySide6 import QtWidgets
     from PySide6.QtGui import QGuiApplication, QAction
-    from PySide6.QtCore import Qt
-    from PySide6.QtWidgets import QMenu, QTreeWidgetItemIterator, QMessageBox
+    from PySide6.QtCore import Qt, QModelIndex
+    from PySide6.QtWidgets import QMenu, QMessageBox
 
 from sd.api.sdnode import SDNode
 from sd.api.apiexception import APIException
 from sd.api.sdapiobject import SDApiError
 from globalsearch.gsui.uiutil import GSUIUtil
+from globalsearch.gsui.resultmodel import GSUISearchResultModel
+from globalsearch.gsui.matchdelegate import GSUIMatchDelegate
 from globalsearch.gscore.sdobj import SDObj
-from globalsearch.gscore.searchdata import SearchResultPathNode
 from globalsearch.gscore import gslog
 
-class GSUISearchResultTreeWidget(QtWidgets.QTreeWidget):
+class GSUISearchResultTreeWidget(QtWidgets.QTreeView):
     """
-    Tree view widget displaying search results
+    Tree view displaying search results through a GSUISearchResultModel.
+    Items are model indexes, rows being fetched lazily by the model as they get visible.
     """
-    ICON_HEIGHT = 18
+    ICON_HEIGHT = GSUISearchResultModel.ICON_HEIGHT
+    AUTO_EXPAND_COUNT = 500 # max number of items expanded as they are fetched, tree display mode
+    SIZE_SAMPLE_COUNT = 200 # number of rows measured to size columns
+    SECTION_MARGIN = 16
+    MAX_SECTION_WIDTH = 600
 
     # Display modes
-    DM_TREE = 0
-    DM_LIST = 1
+    DM_TREE = GSUISearchResultModel.DM_TREE
+    DM_LIST = GSUISearchResultModel.DM_LIST
 
     def __init__(self, gsuiMgr, parent=None):
         super().__init__(parent)
         self.gsuiMgr = gsuiMgr
         self.searchResults = None
+        self.searchCriteria = None
+        self.resultModel = None
+        self.models = {} # key: display mode, value: GSUISearchResultModel of current search results
+        self.expandedNodes = [] # expanded path nodes of the tree display mode model while list display mode is active
         self.rootCount = 0
+        self.autoExpandCount = 0
+        self.filterText = "" # filter within results, see GSUISearchResultModel.setFilter()
+        self.setUniformRowHeights(True)
+        self.setItemDelegate(GSUIMatchDelegate(self)) # highlights search matches in found texts
         self.setDisplayMode(self.__class__.DM_TREE)
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.onContextMenu)
         self.resetContextMenuBuffers()
 
         if sd.getContext().getSDApplication().getVersion() >= "14.0.0":
-            self.itemDoubleClicked.connect(self.onItemDoubleClicked)   
+            self.doubleClicked.connect(self.onItemDoubleClicked)   
 
     def idForPathNode(self, pathNode):
-        sdNode = None
-        ident = None
-        if pathNode.contextNode:
-            sdNode = pathNode.contextNode
-        elif isinstance(pathNode.sdObj, SDNode):
-            sdNode = pathNode.sdObj
-        if sdNode:
-            ident = sdNode.getIdentifier()
-        return ident
+        return GSUISearchResultModel.idForPathNode(pathNode)
+
+    def pathNodeForItem(self, item):
+        return self.resultModel.nodeFromIndex(item) if self.resultModel and item is not None else None
 
     def resetContextMenuBuffers(self):
         self.bufferedLocation = None
@@ -65,12 +74,14 @@ class GSUISearchResultTreeWidget(QtWidgets.QTreeWidget):
         self.bufferedSDNode = None
         self.bufferedGraphViewID = None
         self.bufferedParentGraph = None
+        self.bufferedUsagesRes = None
 
     def onContextMenu(self, pos):
-        treeItem = self.itemAt(pos)
+        pathNode = self.pathNodeForItem(self.indexAt(pos))
+        if pathNode is None:
+            return
         menu = QMenu(self)
         self.resetContextMenuBuffers()
-        pathNode = treeItem.data(0, Qt.UserRole)
         self.bufferedPathNode = pathNode
 
         # check if selected is still valid
@@ -83,7 +94,7 @@ class GSUISearchResultTreeWidget(QtWidgets.QTreeWidget):
         # Location column
         if self.displayMode == self.__class__.DM_TREE:
             useLocation = True
-            if pathNode.subType == SDObj.FUNC_CALL:
+            if pathNode.subType == SDObj.FUNC_CALL or pathNode.subType == SDObj.USAGE:
                 useLocation = False
             elif isinstance(pathNode.sdObj, SDNode):
                 defId = pathNode.sdObj.getDefinition().getId()
@@ -161,6 +172,13 @@ class GSUISearchResultTreeWidget(QtWidgets.QTreeWidget):
             if action:
                 action.triggered.connect(self.onCMSearchFound)
 
+        # Find usages of a graph or function
+        self.bufferedUsagesRes = self.resourceForUsages(pathNode)
+        if self.bufferedUsagesRes:
+            action = QAction("Find Usages", self)
+            action.triggered.connect(self.onCMFindUsages)
+            menu.addAction(action)
+
         menu.exec_(self.mapToGlobal(pos))
 
     # given a pathNode, check if it can be shown in a graph view. If so, returns the sdNode and its parent graph
@@ -180,6 +198,18 @@ class GSUISearchResultTreeWidget(QtWidgets.QTreeWidget):
 
         return (sdNode, sdParentGraph)
     
+    # given a pathNode, returns the graph or function whose usages can be searched, if any
+    def resourceForUsages(self, pathNode):
+        type = pathNode.sdObjType()
+        if type == SDObj.GRAPH or type == SDObj.FUNCTION:
+            return pathNode.sdObj
+        if pathNode.referencedRes:
+            return pathNode.referencedRes
+        if isinstance(pathNode.sdObj, SDNode):
+            if pathNode.subType == SDObj.FUNC_CALL or type == SDObj.GRAPH_INSTANCE:
+                return pathNode.sdObj.getReferencedResource()
+        return None
+
     # given a pathNode, check if it can be opened as a graph, if so return the sd graph
     def containerForOpening(self, pathNode):
         sdContainer = None
@@ -190,8 +220,8 @@ class GSUISearchResultTreeWidget(QtWidgets.QTreeWidget):
     
     def openOrFocusOnItemIfPossible(self, item):
         if sd.getContext().getSDApplication().getVersion() >= "14.0.0":
-            if item and item.childCount() == 0: # check if leaf
-                pathNode = item.data(0, Qt.UserRole)
+            if item is not None and not self.resultModel.hasChildren(item): # check if leaf
+                pathNode = self.pathNodeForItem(item)
                 sdNode, sdParentGraph = self.nodeForShowing(pathNode)
                 if sdNode and sdParentGraph:
                     self.jumpToNode(sdNode, sdParentGraph, pathNode)
@@ -199,7 +229,7 @@ class GSUISearchResultTreeWidget(QtWidgets.QTreeWidget):
                     if self.containerForOpening(pathNode):
                         self.openContainerInEditor(pathNode)
 
-    def onItemDoubleClicked(self, item, column):
+    def onItemDoubleClicked(self, item):
         self.openOrFocusOnItemIfPossible(item)
 
     def createContextMenuItemForTextAtColumn(self, menu, actionStr, text):
@@ -301,283 +331,168 @@ class GSUISearchResultTreeWidget(QtWidgets.QTreeWidget):
     def onCMSearchFound(self, checked):
         self.gsuiMgr.uiWidget.programmaticSearch(self.bufferedFound)
 
-    def setDisplayMode(self, displayMode):
-        if displayMode == self.__class__.DM_TREE:
-            headers = ("Location", "Found", "Node Id")
-            enableFlag = False
-        else:
-            headers = ("Found", "Context", "Node Id", "Path")
-            enableFlag = True
+    def onCMFindUsages(self, checked):
+        self.gsuiMgr.uiWidget.usagesSearch(self.bufferedUsagesRes)
 
-        self.setupDisplayMode(displayMode, headers, enableFlag)
+    def setDisplayMode(self, displayMode):
+        self.displayMode = displayMode
+        self.setupModel()
 
     def updateFromPrefs(self):
         prefs = self.gsuiMgr.prefs
         self.header().setSectionHidden(2, not prefs.sp_displayNodeIds)
 
-    def setupDisplayMode(self, displayMode, headers, enableFlag):
-        header = self.header()
-        header.reset()
-        self.setHeaderLabels(headers)
-        self.displayMode = displayMode
-        self.setHeaderResizeMode(QtWidgets.QHeaderView.ResizeToContents)
-
-        self.setSortingEnabled(enableFlag)
-        header.setSortIndicatorShown(enableFlag)
-        header.setSectionsClickable(enableFlag)
-        header.setSectionHidden(3, not enableFlag) # show/hide last column (Path)
+    # sets the model of the current display mode up, models are kept per display mode until search results change
+    # so toggling between display modes reuses their fetched rows, display data and sort keys
+    def setupModel(self):
+        listMode = self.displayMode == self.__class__.DM_LIST
+        if self.resultModel is not None and self.resultModel.displayMode == self.__class__.DM_TREE:
+            self.expandedNodes = self.collectExpandedNodes()
+        self.setSortingEnabled(False)
+
+        model = self.models.get(self.displayMode)
+        isCached = model is not None
+        if not isCached:
+            model = GSUISearchResultModel(self.searchResults, self.searchCriteria, self.displayMode, self)
+            model.rowsInserted.connect(self.onRowsInserted)
+            self.models[self.displayMode] = model
+        self.resultModel = model
+        model.setFilter(self.filterText)
+        self.setModel(model)
+        self.rootCount = len(model.topNodes)
+        if isCached and not listMode:
+            for pathNode in self.expandedNodes:
+                self.setExpanded(model.indexForNode(pathNode), True)
 
-        if self.searchResults:
-            self.clear()
-            self.doPopulate()
+        header = self.header()
+        header.setSectionResizeMode(QtWidgets.QHeaderView.Interactive)
+        header.setSectionHidden(3, not listMode) # show/hide last column (Path)
+        self.updateFromPrefs()
+        self.setRootIsDecorated(not listMode)
+        self.setSortingEnabled(listMode)
+        header.setSortIndicatorShown(listMode)
+        header.setSectionsClickable(listMode)
+        self.resizeSectionsFromSample()
+
+    # tree display mode: items get expanded as they are fetched, up to AUTO_EXPAND_COUNT items
+    def onRowsInserted(self, parent, first, last):
+        if self.displayMode == self.__class__.DM_TREE:
+            for row in range(first, last + 1):
+                if self.autoExpandCount >= self.AUTO_EXPAND_COUNT:
+                    break
+                index = self.resultModel.index(row, 0, parent)
+                if self.resultModel.hasChildren(index):
+                    self.setExpanded(index, True)
+                    self.autoExpandCount += 1
+
+    # sizes columns to their content, measured on a sample of rows rather than on every row
+    def resizeSectionsFromSample(self):
+        model = self.resultModel
+        header = self.header()
+        fm = self.fontMetrics()
+        widths = [fm.horizontalAdvance(str(model.headerData(c, Qt.Horizontal))) if model.headerData(c, Qt.Horizontal) else 0 for c in range(0, model.COLUMN_COUNT)]
+        for pathNode in model.nodesInOrder()[:self.SIZE_SAMPLE_COUNT]:
+            texts, icons = model.rowDataForNode(pathNode)
+            for c in range(0, model.COLUMN_COUNT):
+                width = fm.horizontalAdvance(texts[c])
+                if icons[c]:
+                    width += self.ICON_HEIGHT + 4
+                if c == 0 and self.displayMode == self.__class__.DM_TREE:
+                    width += self.indentation() * self.depthOfNode(pathNode)
+                widths[c] = max(widths[c], width)
+        for c in range(0, model.COLUMN_COUNT):
+            header.resizeSection(c, min(widths[c] + self.SECTION_MARGIN, self.MAX_SECTION_WIDTH))
+
+    def depthOfNode(self, pathNode):
+        depth = 1
+        p = pathNode.parent
+        while p is not None and p is not self.resultModel.rootNode:
+            depth += 1
+            p = p.parent
+        return depth
+
+    # expanded path nodes among the fetched rows of the tree display mode model
+    def collectExpandedNodes(self):
+        expandedNodes = []
+        model = self.resultModel
+        parents = [QModelIndex()]
+        while parents:
+            parent = parents.pop()
+            for row in range(0, model.rowCount(parent)):
+                index = model.index(row, 0, parent)
+                if self.isExpanded(index):
+                    expandedNodes.append(model.nodeFromIndex(index))
+                    parents.append(index)
+        return expandedNodes
+
+    def resetModels(self):
+        oldModels = list(self.models.values())
+        self.models = {}
+        self.expandedNodes = []
+        self.autoExpandCount = 0
+        self.resultModel = None
+        self.setupModel()
+        for model in oldModels:
+            model.deleteLater()
 
     def clearAll(self):
-        self.clear()
         self.searchResults = None
-        self.rootCount = 0
-
-    def setHeaderResizeMode(self, resizeMode):
-        header = self.header()
-        for s in range (0, header.count()):
-            header.setSectionResizeMode(s, resizeMode)
+        self.searchCriteria = None
+        self.filterText = ""
+        self.resetModels()
 
     def populate(self, searchResults, searchCriteria):
         self.searchResults = searchResults
         self.searchCriteria = searchCriteria
-        self.doPopulate()
+        self.filterText = ""
+        self.resetModels()
 
-    def doPopulate(self):
-        self.setHeaderResizeMode(QtWidgets.QHeaderView.Interactive) # doing this at init time does not create even columns
-        pathNode = self.searchResults.pathTree
-        if pathNode:
-            if self.displayMode == self.__class__.DM_TREE:
-                self.populateFromPathNodeTreeDM(pathNode)
-                self.expandAll()
-            else:
-                nodeList = []
-                self.populateFromPathNodeListDM(pathNode, nodeList)
-                
-        self.header().resizeSections(QtWidgets.QHeaderView.ResizeToContents) # adapts headers to new context
-        self.rootCount = self.countRoots()
-
-    def countRoots(self):
-        iter = QTreeWidgetItemIterator(self)
-        root_count = 0
-        while iter.value():
-            treeItem = iter.value()
-            if treeItem.parent() is None:
-                root_count += 1
-            iter += 1
-        return root_count
+    # narrows displayed rows to the ones matching filterText, without searching again
+    def setFilter(self, filterText):
+        self.filterText = filterText
+        self.autoExpandCount = 0
+        self.resultModel.setFilter(filterText)
+        self.rootCount = len(self.resultModel.topNodes)
 
     # expand or collapse all tree items
     def expandCollapseAllItems(self, expand = False, excludeRoot=True):
-        iter = QTreeWidgetItemIterator(self)
-        while iter.value():
-            treeItem = iter.value()
-            hasChildren = treeItem.childCount() > 0
-
-            # we do not collapse the root of a tree having a single root (for reasability) excludeRoot if True
-            if not (excludeRoot and (treeItem.parent() is None) and (self.rootCount == 1) and not expand):
-                if hasChildren:
-                    if expand:
-                        self.expandItem(treeItem)
-                    else:
-                        self.collapseItem(treeItem)
-
-            iter += 1
-
-    # --- Tree display mode
-
-    def populateFromPathNodeTreeDM(self, pathNode, parentItem = None):
-        if pathNode.subType == SDObj.ROOT:
-            uiTreeItem = None
-        else:
-            uiTreeItem = self.createUITreeItemTreeDM(pathNode, parentItem)
-        for child in pathNode.children:
-            self.populateFromPathNodeTreeDM(child, uiTreeItem)
-
-    def createUITreeItemTreeDM(self, pathNode, parentItem = None):
-        if parentItem:
-            treeItem = QtWidgets.QTreeWidgetItem(parentItem)
-        else:
-            treeItem = QtWidgets.QTreeWidgetItem(self)
-
-        treeItem.setData(0, Qt.UserRole, pathNode)
-
-        type,_ = pathNode.consolidatedType()
-
-        # Location: name + icon
-        if type == SDObj.FUNC_PARAM and self.searchCriteria.ss_param_func:
-            locationText = "Parameter function"
-            icon = GSUIUtil.iconForSDObj(SDObj.FUNC_PARAM, self.__class__.ICON_HEIGHT)
-        elif pathNode.subType == SDObj.FUNC_CALL:
-            locationText = "Function call"
-            icon = GSUIUtil.iconForSDObj(SDObj.FUNC_CALL, self.__class__.ICON_HEIGHT)
-        else:
-            locationText = GSUIUtil.croppedText(pathNode.consolidatedName())   
-            icon = GSUIUtil.iconForSDObj(type, self.__class__.ICON_HEIGHT)
-        
-        if len(locationText) == 0:
-            locationText = "(no name)"
-
-        treeItem.setText(0, locationText)
-        if icon:
-            treeItem.setIcon(0, icon)
-
-        # Found
-        foundText = None
-        if type == SDObj.FUNC_PARAM and self.searchCriteria.ss_param_func:
-            # special search, search all param functions, there is no string match
-            # in this case so we set the location name in the Found column 
-            foundText = GSUIUtil.croppedText(pathNode.consolidatedName())
-            icon = GSUIUtil.iconForSDObj(SDObj.FUNC_PARAM, self.__class__.ICON_HEIGHT)
-            if icon:
-                treeItem.setIcon(1, icon)
-        elif pathNode.hasFoundMatch():
-            foundText = GSUIUtil.croppedTextCenteredAroundSubstring(self.searchCriteria.searchString, pathNode.foundMatch)
-            if pathNode.subType == SDObj.FUNC_CALL:
-                icon = GSUIUtil.iconForSDObj(SDObj.FUNC_CALL, self.__class__.ICON_HEIGHT)
-                if icon:
-                    treeItem.setIcon(1, icon)
-        
-        if foundText:
-            treeItem.setText(1, foundText)
-
-        # ID
-        if pathNode.subType != SDObj.FUNC_PARAM:
-            ident = self.idForPathNode(pathNode)
-            if ident:
-                treeItem.setText(2, ident)
-
-        return treeItem
-
-    # --- List display mode
-    def strFromNodeList(self, nodeList):
-        s = ""
-        size = len(nodeList)
-        for n in range(0, size):
-            node = nodeList[n]
-            _,typeStr = SDObj.type(node.sdObj)
-            s += typeStr.upper() + ": " +  node.consolidatedName()
-            if n < size-1:
-                s += " > "
-        return s
-
-    def populateFromPathNodeListDM(self, pathNode, nodeList):
-        if pathNode.subType != SDObj.ROOT:
-            if pathNode.hasFoundMatch():
-                self.createUITreeItemListDM(pathNode, nodeList)
-
-            nodeList.append(pathNode)
-
-        for child in pathNode.children:
-            self.populateFromPathNodeListDM(child, nodeList)
-
-        if pathNode.subType != SDObj.ROOT:
-            nodeList.pop()
-
-    def createUITreeItemListDM(self, pathNode, nodeList):
-        treeItem = QtWidgets.QTreeWidgetItem(self)
-        treeItem.setData(0, Qt.UserRole, pathNode)
-
-        # Found
-        if self.searchCriteria.ss_param_func:
-            # special search, search all param functions, there is no string match
-            # in this case so we set the location name in the Found column 
-            foundText = GSUIUtil.croppedText(pathNode.consolidatedName())
+        if expand:
+            self.expandAll()
         else:
-            foundText = GSUIUtil.croppedTextCenteredAroundSubstring(self.searchCriteria.searchString, pathNode.foundMatch)
+            self.collapseAll()
+            # we do not collapse the root of a tree having a single root (for reasability) excludeRoot if True
+            if excludeRoot and self.rootCount == 1:
+                self.expand(self.resultModel.index(0, 0))
 
-        treeItem.setText(0, foundText)
+    def hasSearchResults(self):
+        return self.searchResults is not None and self.searchResults.hasSearchResults()
 
-        typeStr = ""
-        if pathNode.subType == SDObj.FUNC_CALL:
-            type = SDObj.FUNC_CALL
-        else:
-            type, typeStr = pathNode.consolidatedType()
-
-        icon = GSUIUtil.iconForSDObj(type, self.__class__.ICON_HEIGHT)
-        if icon:
-            treeItem.setIcon(0, icon)
-
-        # Context
-        context = ""
-        if self.searchCriteria.ss_param_func:
-            if pathNode.contextNode:
-                if pathNode.contextString:
-                    context = pathNode.contextString
-                else:
-                    tempPathNode = SearchResultPathNode(pathNode.contextNode)
-                    context = tempPathNode.consolidatedName()
-                icon = GSUIUtil.iconForSDObj(SDObj.GRAPH_NODE, self.__class__.ICON_HEIGHT)
-                if icon:
-                    treeItem.setIcon(1, icon)
-        elif pathNode.contextString:
-            context = pathNode.contextString
+    # returns the item in tree having a found match following or preceding item,
+    # following or preceding the last navigated found item if item is None
+    def navFoundItem(self, next, item):
+        pathNode = self.pathNodeForItem(item)
+        if pathNode is not None:
+            foundNode = self.resultModel.nextFoundNode(pathNode, next)
         else:
-            context = typeStr.capitalize()
-            
-        treeItem.setText(1, context)
+            foundNode = self.resultModel.cursorFoundNode(next)
+        return self.itemForNode(foundNode)
 
-        # ID
-        ident = self.idForPathNode(pathNode)
-        if ident:
-            treeItem.setText(2, ident)
-            
-        # Path
-        treeItem.setText(3, self.strFromNodeList(nodeList))
-        return treeItem
-    
-    def hasSearchResults(self):
-        return self.topLevelItemCount() > 0
+    def navFirstFoundItem(self):
+        return self.itemForNode(self.resultModel.firstFoundNode())
 
-    # returns the item in tree having a found match following or preceding item
-    def navFoundItem(self, next, item):
-        if item:
-            iter = QTreeWidgetItemIterator(item)
-            cur_item = iter.value()            
-            while cur_item: # this loop won't go infinite as there always is at least one found match
-                if next:
-                    iter += 1
-                    if iter.value() is None:
-                        iter = QTreeWidgetItemIterator(self.navFirstTreeItem()) # cycle to top item
-                else:
-                    iter -= 1
-                    if iter.value() is None:
-                        iter = QTreeWidgetItemIterator(self.navLastTreeItem()) # cycle to last item
-
-                cur_item = iter.value()
-                if cur_item:
-                    if self.navIsFoundItem(cur_item):
-                        return cur_item
-        return None
-    
-    def navIsFoundItem(self, item):
-        if item:
-            pathNode = item.data(0, Qt.UserRole)
-            # Note: nodes found by node type filetering only (i.e. no search string) have foundMatch set to "" (=match without using string) which differenciates them from None (=no match)
-            if pathNode.foundMatch is not None:
-                return True
-        return False
-    
-    def navNextFoundItem(self):
-        return self.navFoundItem(next=True)
-                    
-    def navPrevFoundItem(self):
-        return self.navFoundItem(next=False)
-    
-    def navFirstTreeItem(self):
-        return QTreeWidgetItemIterator(self).value()
-    
-    def navLastTreeItem(self):
-        iter = QTreeWidgetItemIterator(self)
-        item = None
-        while iter.value():
-            item = iter.value()            
-            iter += 1
-        return item
+    def navLastFoundItem(self):
+        return self.itemForNode(self.resultModel.lastFoundNode())
 
+    def itemForNode(self, pathNode):
+        if pathNode is None:
+            return None
+        index = self.resultModel.indexForNode(pathNode)
+        return index if index.isValid() else None
 
-    
+    def currentItem(self):
+        index = self.currentIndex()
+        return index if index.isValid() else None
 
+    def setCurrentItem(self, item):
+        self.setCurrentIndex(item)
+        self.scrollTo(item)
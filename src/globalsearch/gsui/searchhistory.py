@@ -3,22 +3,28 @@
 # (c) 2019-2025 Eyosido Software SARL
 # ---------------
 
-import os, json
-from globalsearch.gscore import gslog
+import os
+from collections import OrderedDict
+from globalsearch.gscore import gslog, gsstore
+from globalsearch.gscore.gsstore import GSStore
+from globalsearch.gscore.gsstorewriter import GSStoreWriter
 
 class GSUISearchHistory:
     """
     Search history management
+    History and navigation are saved to the store (see GSStore) one entry at a time, from a background thread shortly
+    after they changed (see GSStoreWriter). close() is to be called once the history is not used anymore.
     Callbacks (required!):
         searchHistoryUpdateStarting()
         searchHistoryUpdatEnded()
         searchHistoryPushed(text)
-        searchHistoryRemoved(index)
+        searchHistoryRemoved(text)
         searchHistoryCleared()
     """
     DEFAULT_MAX_SEARCH_HISTORY_COUNT = 20
     DEFAULT_MAX_SEARCH_NAVIGATION_COUNT = 100
 
+    # history file of previous versions, imported once into the store: list of history texts, or object holding history and navigation
     @classmethod
     def filename(cls):
         path = os.path.dirname(os.path.dirname(__file__)) # go one folder up
@@ -28,82 +34,76 @@ class GSUISearchHistory:
     def __init__(self, callback, maxCount = DEFAULT_MAX_SEARCH_HISTORY_COUNT):
         self.callback = callback
         self.maxCount = maxCount # max item count in history
-        self.history = []   # found searches without duplicates, persistent
-        self.navigation = []  # found searches in the order they are made, duplicates possible, not persistent, content {'text':<text string>, 'preset':<GSPresetTypes>}
+        self.history = OrderedDict() # found searches without duplicates, most recent first, key: case folded text, value: text, persistent
+        self.navigation = []  # found searches in the order they are made, duplicates possible, persistent, content {'text':<text string>, 'preset':<GSPresetTypes>}
         self.nav_index = 0  # current position in self.navigation to enable prev/next
+        self.writer = GSStoreWriter(gsstore.g_gsstore, "GlobalSearchHistoryWriter")
 
     def count(self):
         return len(self.history)
 
+    # history texts, most recent first
+    def texts(self):
+        return list(self.history.values())
+
     def push(self, text):
-        # check whether already existing
-        text_l = text.lower()
-        found = False
-        i = 0
-        historyLen = len(self.history)
-        while i < historyLen and not found:
-            item = self.history[i]
-            if text_l == item.lower():
-                found = True
-            else:
-                i += 1
+        key = text.casefold()
+        previousText = self.history.get(key)
+        if previousText == text and next(iter(self.history)) == key:
+            return # already most recent
 
         self.callback.searchHistoryUpdateStarting()
 
-        if found:
+        if previousText is not None:
             # move found item to top, also replacing the text by the new one in case the case changed
-            del self.history[i]
-            self.callback.searchHistoryRemoved(i)
-            self.history.insert(0, text)
-            self.callback.searchHistoryPushed(text)
-        else:
-            self.history.insert(0, text)
-            self.callback.searchHistoryPushed(text)
-            if len(self.history) > self.maxCount:
-                self.history.pop()
-                self.callback.searchHistoryRemoved(len(self.history))
+            self.callback.searchHistoryRemoved(previousText)
+        self.history[key] = text
+        self.history.move_to_end(key, last=False)
+        self.callback.searchHistoryPushed(text)
+        if len(self.history) > self.maxCount:
+            _, removedText = self.history.popitem(last=True)
+            self.callback.searchHistoryRemoved(removedText)
 
         self.callback.searchHistoryUpdateEnded()
-        self.save()
+        self.writer.write(GSStore.historyPush, key, text, self.maxCount)
 
     def clear(self):
-        self.history = []
-        self.save()
+        self.history.clear()
+        self.writer.write(GSStore.historyClear)
         self.callback.searchHistoryUpdateStarting()
         self.callback.searchHistoryCleared()
         self.callback.searchHistoryUpdateEnded()
 
+    def importJSON(self, j):
+        store = gsstore.g_gsstore
+        texts, navigation = (j, []) if isinstance(j, list) else (j.get("history", []), j.get("navigation", []))
+        for text in reversed(texts[:self.maxCount]):
+            store.pushHistory(text.casefold(), text, self.maxCount)
+        for item in navigation[-self.DEFAULT_MAX_SEARCH_NAVIGATION_COUNT:]:
+            store.appendNavigation(item, self.DEFAULT_MAX_SEARCH_NAVIGATION_COUNT)
+
     def load(self):
-        path = self.__class__.filename()
-        if os.path.exists(path):
-            try:
-                self.callback.searchHistoryUpdateStarting()
-                with open(path, "r") as readFile: 
-                    self.history = json.load(readFile)
-            except:
-                gslog.error("Error loading search history.")
-            finally:
-                self.callback.searchHistoryUpdateEnded()
-
-    def save(self):
-        path = self.__class__.filename()
+        store = gsstore.g_gsstore
         try:
             self.callback.searchHistoryUpdateStarting()
-            with open(path, "w") as writeFile: 
-                json.dump(self.history, writeFile)
+            store.migrateJSONFile("history", self.__class__.filename(), self.importJSON)
+            self.history = OrderedDict((text.casefold(), text) for text in store.history(self.maxCount))
+            self.navigation = store.navigation(self.DEFAULT_MAX_SEARCH_NAVIGATION_COUNT)
+            self.nav_index = len(self.navigation) - 1 if self.navigation else 0
         except:
-            gslog.error("Error saving search history.")
+            gslog.error("Error loading search history.")
         finally:
-                self.callback.searchHistoryUpdateEnded()
+            self.callback.searchHistoryUpdateEnded()
+
+    # pending changes are written
+    def close(self):
+        self.writer.close()
 
     def delete(self):
-        path = self.__class__.filename()
-        if os.path.exists(path):
-            try:
-                os.remove(path)
-                self.callback.searchHistoryCleared()
-            except:
-                gslog.error("Error deleting search history file.")
+        self.writer.write(GSStore.historyClear)
+        self.writer.write(GSStore.navigationClear)
+        self.close()
+        self.callback.searchHistoryCleared()
 
     def nav_item(self, text, preset, nt_filter_index, func_nt_filter_index):
         return {'text':text, 'preset':preset, 'ntfi':nt_filter_index, 'fntfi':func_nt_filter_index}
@@ -115,6 +115,7 @@ class GSUISearchHistory:
             self.navigation.pop(0)  # remove first item
 
         self.nav_index = len(self.navigation) - 1
+        self.writer.write(GSStore.navigationAppend, self.navigation[-1], self.DEFAULT_MAX_SEARCH_NAVIGATION_COUNT)
         # self.logNav()
 
     def nav_has_next(self):
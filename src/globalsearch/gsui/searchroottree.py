@@ -21,6 +21,7 @@ from sd.api.sdresourcefolder import SDResourceFolder
 
 from globalsearch.gscore import gslog
 from globalsearch.gscore.sdobj import SDObj
+from globalsearch.gscore.gspackagetracker import GSPackageTracker
 from globalsearch.gsui.uiutil import GSUIUtil
 
 class GSUISearchRootTreeWidget(QtWidgets.QTreeWidget):
@@ -34,22 +35,97 @@ class GSUISearchRootTreeWidget(QtWidgets.QTreeWidget):
         super().__init__(parent)
         self.resetData()
         self.setHeaderHidden(True)
+        self.itemExpanded.connect(self.onItemExpanded)
 
     def resetData(self):
         self.treeItemRoot = None
         self.treeMapping = {} # dictionnary mapping tree QTreeWidgetItem and CustomTreeData. Key:id(treeItem), value:CustomTreeData 
+        self.packageItems = {} # key: package key (see GSPackageTracker.userPackages), value: QTreeWidgetItem
         self.isExpandCollapse = False
 
     def populate(self):
         self.resetData()
         self.clear()
         self.setupTreeItemRoot()
-        ctx = sd.getContext()
-        pkgMgr = ctx.getSDApplication().getPackageMgr()
-        packages = pkgMgr.getUserPackages()
-        for p in range(0, packages.getSize()):
-            pkg = packages.getItem(p)
-            self.populateFromPackage(pkg, self.treeItemRoot)
+        self.refresh()
+
+    # Synchronizes the package items with the user packages: items of closed packages are removed, items of new
+    # packages are added, the others are kept and, if resetKept is True, their content will be reloaded on next expand.
+    # Items of empty unsaved packages are always reset, their key not telling which package they hold.
+    def refresh(self, resetKept=True):
+        if not self.treeItemRoot:
+            self.setupTreeItemRoot()
+
+        packages = GSPackageTracker.userPackages()
+        keys = set(key for key, _ in packages)
+        for key in list(self.packageItems.keys()):
+            if key not in keys:
+                self.removePackageItem(key)
+
+        for index, (key, package) in enumerate(packages):
+            item = self.packageItems.get(key)
+            if item:
+                if self.treeItemRoot.indexOfChild(item) != index:
+                    isExpanded = item.isExpanded()
+                    self.treeItemRoot.removeChild(item)
+                    self.treeItemRoot.insertChild(index, item)
+                    item.setExpanded(isExpanded)
+                if resetKept or GSPackageTracker.isPositionKey(key):
+                    self.resetItem(item, package)
+            else:
+                self.packageItems[key] = self.createUITreeItem(self.CustomTreeData(package), self.treeItemRoot, index)
+
+    def packageCount(self):
+        return len(self.packageItems)
+
+    def removePackageItem(self, key):
+        item = self.packageItems.pop(key, None)
+        if item:
+            self.forgetChildren(item)
+            self.treeMapping.pop(id(item), None)
+            self.treeItemRoot.removeChild(item)
+
+    # updates the SD object of an item and drops its children, reloaded lazily (right away if the item is expanded)
+    def resetItem(self, item, sdObj):
+        customTreeData = self.customDataFromTreeItem(item)
+        customTreeData.sdObj = sdObj
+        customTreeData.name = SDObj.name(sdObj, customTreeData.entryType)
+        item.setText(0, self.itemText(customTreeData))
+        if customTreeData.childrenLoaded:
+            isExpanded = item.isExpanded()
+            self.forgetChildren(item)
+            item.takeChildren()
+            customTreeData.childrenLoaded = False
+            item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+            if isExpanded:
+                self.loadChildren(item)
+
+    def forgetChildren(self, item):
+        for c in range(0, item.childCount()):
+            child = item.child(c)
+            self.forgetChildren(child)
+            self.treeMapping.pop(id(child), None)
+
+    def onItemExpanded(self, item):
+        self.loadChildren(item)
+
+    # creates the child items of a package or folder item on first expand
+    def loadChildren(self, item):
+        customTreeData = self.treeMapping.get(id(item))
+        if customTreeData and not customTreeData.childrenLoaded and customTreeData.sdObj:
+            customTreeData.childrenLoaded = True
+            if isinstance(customTreeData.sdObj, SDPackage):
+                resources = customTreeData.sdObj.getChildrenResources(False)
+            else:
+                resources = customTreeData.sdObj.getChildren(False)
+            if resources:
+                for r in range(0, resources.getSize()):
+                    resource = resources.getItem(r)
+                    self.populateFrom(resource, item)
+            item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.DontShowIndicatorWhenChildless)
+
+    def isExpandable(self, item):
+        return item.childCount() > 0 or item.childIndicatorPolicy() == QtWidgets.QTreeWidgetItem.ShowIndicator
 
     class CustomTreeData():
         def __init__(self, sdObj = None):
@@ -62,6 +138,7 @@ class GSUISearchRootTreeWidget(QtWidgets.QTreeWidget):
                 self.name = "Everything (hit Refresh button to update)"
                
             self.sdObj = sdObj
+            self.childrenLoaded = False
 
         def __str__(self):
             return "entryType: " + str(self.entryType) + " name: " + self.name
@@ -92,48 +169,39 @@ class GSUISearchRootTreeWidget(QtWidgets.QTreeWidget):
     def customDataFromTreeItem(self, treeItem):
         return self.treeMapping[id(treeItem)]
 
-    def populateFromPackage(self, package, parentUITreeItem):
-        customTreeData = self.CustomTreeData(package)
-        uiTreeItem = self.createUITreeItem(customTreeData, parentUITreeItem)
-
-        resources = package.getChildrenResources(False)
-        if resources:
-            for r in range(0, resources.getSize()):
-                resource = resources.getItem(r)
-                self.populateFrom(resource, uiTreeItem)
-
     def populateFrom(self, sdObj, parentUITreeItem):
         if isinstance(sdObj, SDGraph):
             customTreeData = self.CustomTreeData(sdObj)
             self.createUITreeItem(customTreeData, parentUITreeItem)
         elif isinstance(sdObj, SDResourceFolder):
-            self.populateFromFolder(sdObj, parentUITreeItem)
-
-    def populateFromFolder(self, folder, parentUITreeItem):
-        customTreeData = self.CustomTreeData(folder)
-        uiTreeItem = self.createUITreeItem(customTreeData, parentUITreeItem)
+            customTreeData = self.CustomTreeData(sdObj)
+            self.createUITreeItem(customTreeData, parentUITreeItem)
 
-        resources = folder.getChildren(False)
-        if resources:
-            for r in range(0, resources.getSize()):
-                resource = resources.getItem(r)
-                self.populateFrom(resource, uiTreeItem)
+    def itemText(self, customTreeData):
+        text = customTreeData.name
+        if len(text) == 0:
+            text = "(no name)"
+        return text
 
-    def createUITreeItem(self, customTreeData, parentItem=None):
+    def createUITreeItem(self, customTreeData, parentItem=None, index=-1):
         if parentItem:
-            treeItem = QtWidgets.QTreeWidgetItem(parentItem)
+            if index >= 0:
+                treeItem = QtWidgets.QTreeWidgetItem()
+                parentItem.insertChild(index, treeItem)
+            else:
+                treeItem = QtWidgets.QTreeWidgetItem(parentItem)
         else:
             treeItem = QtWidgets.QTreeWidgetItem(self)
 
-        text = customTreeData.name
-        if len(text) == 0:
-            text = "(no name)"
-            
-        treeItem.setText(0, text)
+        treeItem.setText(0, self.itemText(customTreeData))
         icon = GSUIUtil.iconForSDObj(customTreeData.entryType, self.__class__.ICON_HEIGHT)
         if icon:
             treeItem.setIcon(0, icon)
 
+        if isinstance(customTreeData.sdObj, (SDPackage, SDResourceFolder)):
+            # children are created when the item is first expanded
+            treeItem.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+
         self.treeMapping[id(treeItem)] = customTreeData
         return treeItem
 
@@ -163,10 +231,10 @@ class GSUIComboTreeWidget(QtWidgets.QComboBox):
         self.lastSelectedItem = None # we keep track of last selected item because getCurrentItem() is not reliable in our tree view, the current item sometimes doesn't get set properly on expanded/collapsed items
         self.treeWidget.viewport().installEventFilter(self)
     
-    def reload(self):
-        self.clear()
-        self.treeWidget.populate()
-        self.lastSelectedItem = None
+    def reload(self, resetKept=True):
+        self.treeWidget.refresh(resetKept)
+        if self.lastSelectedItem and id(self.lastSelectedItem) not in self.treeWidget.treeMapping:
+            self.lastSelectedItem = None
     
     def hidePopup(self):
         if not self.treeWidget.isExpandCollapse:
@@ -181,7 +249,7 @@ class GSUIComboTreeWidget(QtWidgets.QComboBox):
                 index = self.treeWidget.indexAt(event.pos())
                 if index.isValid():
                     tree_item = self.treeWidget.itemFromIndex(index)
-                    if tree_item.childCount() > 0:
+                    if self.treeWidget.isExpandable(tree_item):
                         if self.treeWidget.isExpanded(index):
                             self.treeWidget.collapse(index)
                         else:
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'gs_main.ui'
+##
+## Created by: Qt User Interface Compiler version 5.15.2
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide2.QtCore import *
+from PySide2.QtGui import *
+from PySide2.QtWidgets import *
+
+
+class Ui_Form(object):
+    def setupUi(self, Form):
+        if not Form.objectName():
+            Form.setObjectName(u"Form")
+        Form.resize(400, 335)
+        self.vl_main = QVBoxLayout(Form)
+        self.vl_main.setObjectName(u"vl_main")
+        self.hl_root = QHBoxLayout()
+        self.hl_root.setObjectName(u"hl_root")
+        self.l_search_root = QLabel(Form)
+        self.l_search_root.setObjectName(u"l_search_root")
+
+        self.hl_root.addWidget(self.l_search_root)
+
+        self.btn_refresh = QToolButton(Form)
+        self.btn_refresh.setObjectName(u"btn_refresh")
+
+        self.hl_root.addWidget(self.btn_refresh)
+
+        self.vl_main.addLayout(self.hl_root)
+
+        self.vl_search_main = QVBoxLayout()
+        self.vl_search_main.setObjectName(u"vl_search_main")
+        self.hl_search = QHBoxLayout()
+        self.hl_search.setObjectName(u"hl_search")
+        self.btn_prev_search = QToolButton(Form)
+        self.btn_prev_search.setObjectName(u"btn_prev_search")
+
+        self.hl_search.addWidget(self.btn_prev_search)
+
+        self.btn_next_search = QToolButton(Form)
+        self.btn_next_search.setObjectName(u"btn_next_search")
+
+        self.hl_search.addWidget(self.btn_next_search)
+
+        self.cb_search = QComboBox(Form)
+        self.cb_search.setObjectName(u"cb_search")
+        self.cb_search.setEditable(True)
+        self.cb_search.setInsertPolicy(QComboBox.NoInsert)
+        self.cb_search.setFrame(True)
+
+        self.hl_search.addWidget(self.cb_search)
+
+        self.btn_search = QToolButton(Form)
+        self.btn_search.setObjectName(u"btn_search")
+
+        self.hl_search.addWidget(self.btn_search)
+
+        self.btn_clear = QToolButton(Form)
+        self.btn_clear.setObjectName(u"btn_clear")
+
+        self.hl_search.addWidget(self.btn_clear)
+
+        self.btn_collapse = QToolButton(Form)
+        self.btn_collapse.setObjectName(u"btn_collapse")
+
+        self.hl_search.addWidget(self.btn_collapse)
+
+        self.btn_expand = QToolButton(Form)
+        self.btn_expand.setObjectName(u"btn_expand")
+
+        self.hl_search.addWidget(self.btn_expand)
+
+        self.btn_prefs = QToolButton(Form)
+        self.btn_prefs.setObjectName(u"btn_prefs")
+
+        self.hl_search.addWidget(self.btn_prefs)
+
+        self.vl_search_main.addLayout(self.hl_search)
+
+        self.hl_search_type = QHBoxLayout()
+        self.hl_search_type.setObjectName(u"hl_search_type")
+        self.cb_graph_node_type = QComboBox(Form)
+        self.cb_graph_node_type.setObjectName(u"cb_graph_node_type")
+        self.cb_graph_node_type.setEditable(False)
+        self.cb_graph_node_type.setInsertPolicy(QComboBox.NoInsert)
+        self.cb_graph_node_type.setFrame(True)
+
+        self.hl_search_type.addWidget(self.cb_graph_node_type)
+
+        self.cb_fct_node_type = QComboBox(Form)
+        self.cb_fct_node_type.setObjectName(u"cb_fct_node_type")
+        self.cb_fct_node_type.setEditable(False)
+        self.cb_fct_node_type.setInsertPolicy(QComboBox.NoInsert)
+        self.cb_fct_node_type.setFrame(True)
+
+        self.hl_search_type.addWidget(self.cb_fct_node_type)
+
+        self.vl_search_main.addLayout(self.hl_search_type)
+
+        self.line = QFrame(Form)
+        self.line.setObjectName(u"line")
+        self.line.setFrameShadow(QFrame.Sunken)
+        self.line.setLineWidth(1)
+        self.line.setMidLineWidth(1)
+        self.line.setFrameShape(QFrame.HLine)
+
+        self.vl_search_main.addWidget(self.line)
+
+        self.hl_found = QHBoxLayout()
+        self.hl_found.setObjectName(u"hl_found")
+        self.l_status = QLabel(Form)
+        self.l_status.setObjectName(u"l_status")
+        self.l_status.setFrameShape(QFrame.NoFrame)
+
+        self.hl_found.addWidget(self.l_status)
+
+        self.btn_prev_sr = QToolButton(Form)
+        self.btn_prev_sr.setObjectName(u"btn_prev_sr")
+
+        self.hl_found.addWidget(self.btn_prev_sr)
+
+        self.btn_next_sr = QToolButton(Form)
+        self.btn_next_sr.setObjectName(u"btn_next_sr")
+
+        self.hl_found.addWidget(self.btn_next_sr)
+
+        self.btn_focus_sr = QToolButton(Form)
+        self.btn_focus_sr.setObjectName(u"btn_focus_sr")
+
+        self.hl_found.addWidget(self.btn_focus_sr)
+
+        self.btn_save_sr = QToolButton(Form)
+        self.btn_save_sr.setObjectName(u"btn_save_sr")
+
+        self.hl_found.addWidget(self.btn_save_sr)
+
+        self.vl_search_main.addLayout(self.hl_found)
+
+        self.vl_main.addLayout(self.vl_search_main)
+
+        self.retranslateUi(Form)
+
+        QMetaObject.connectSlotsByName(Form)
+    # setupUi
+
+    def retranslateUi(self, Form):
+        Form.setWindowTitle(QCoreApplication.translate("Form", u"Form", None))
+        self.l_search_root.setText(QCoreApplication.translate("Form", u"Search into:", None))
+#if QT_CONFIG(tooltip)
+        self.btn_refresh.setToolTip(QCoreApplication.translate("Form", u"Refresh Search Into data (use if items in the Explorer view have been added/removed/renamed)", None))
+#endif // QT_CONFIG(tooltip)
+        self.btn_refresh.setText(QCoreApplication.translate("Form", u"...", None))
+#if QT_CONFIG(tooltip)
+        self.btn_prev_search.setToolTip(QCoreApplication.translate("Form", u"Previous search", None))
+#endif // QT_CONFIG(tooltip)
+        self.btn_prev_search.setText(QCoreApplication.translate("Form", u"...", None))
+#if QT_CONFIG(tooltip)
+        self.btn_next_search.setToolTip(QCoreApplication.translate("Form", u"Next search", None))
+#endif // QT_CONFIG(tooltip)
+        self.btn_next_search.setText(QCoreApplication.translate("Form", u"...", None))
+#if QT_CONFIG(tooltip)
+        self.btn_search.setToolTip(QCoreApplication.translate("Form", u"Perform a new search", None))
+#endif // QT_CONFIG(tooltip)
+        self.btn_search.setText(QCoreApplication.translate("Form", u"...", None))
+#if QT_CONFIG(tooltip)
+        self.btn_clear.setToolTip(QCoreApplication.translate("Form", u"Clear both search field and search results", None))
+#endif // QT_CONFIG(tooltip)
+        self.btn_clear.setText(QCoreApplication.translate("Form", u"...", None))
+#if QT_CONFIG(tooltip)
+        self.btn_collapse.setToolTip(QCoreApplication.translate("Form", u"Collapse all items in the Search Result tree", None))
+#endif // QT_CONFIG(tooltip)
+        self.btn_collapse.setText(QCoreApplication.translate("Form", u"...", None))
+#if QT_CONFIG(tooltip)
+        self.btn_expand.setToolTip(QCoreApplication.translate("Form", u"Expand all items in the Search Result tree", None))
+#endif // QT_CONFIG(tooltip)
+        self.btn_expand.setText(QCoreApplication.translate("Form", u"...", None))
+#if QT_CONFIG(tooltip)
+        self.btn_prefs.setToolTip(QCoreApplication.translate("Form", u"Search settings", None))
+#endif // QT_CONFIG(tooltip)
+        self.btn_prefs.setText(QCoreApplication.translate("Form", u"...", None))
+#if QT_CONFIG(tooltip)
+        self.cb_graph_node_type.setToolTip(QCoreApplication.translate("Form", u"Filters by graph node type", None))
+#endif // QT_CONFIG(tooltip)
+#if QT_CONFIG(tooltip)
+        self.cb_fct_node_type.setToolTip(QCoreApplication.translate("Form", u"Filters by function node type", None))
+#endif // QT_CONFIG(tooltip)
+        self.l_status.setText(QCoreApplication.translate("Form", u"<status>", None))
+#if QT_CONFIG(tooltip)
+        self.btn_prev_sr.setToolTip(QCoreApplication.translate("Form", u"Previous Search Result", None))
+#endif // QT_CONFIG(tooltip)
+        self.btn_prev_sr.setText(QCoreApplication.translate("Form", u"...", None))
+#if QT_CONFIG(tooltip)
+        self.btn_next_sr.setToolTip(QCoreApplication.translate("Form", u"Next Search Result", None))
+#endif // QT_CONFIG(tooltip)
+        self.btn_next_sr.setText(QCoreApplication.translate("Form", u"...", None))
+#if QT_CONFIG(tooltip)
+        self.btn_focus_sr.setToolTip(QCoreApplication.translate("Form", u"Open/show in Graph View the previous/next search result", None))
+#endif // QT_CONFIG(tooltip)
+        self.btn_focus_sr.setText(QCoreApplication.translate("Form", u"...", None))
+#if QT_CONFIG(tooltip)
+        self.btn_save_sr.setToolTip(QCoreApplication.translate("Form", u"Save search result to file", None))
+#endif // QT_CONFIG(tooltip)
+        self.btn_save_sr.setText(QCoreApplication.translate("Form", u"...", None))
+    # retranslateUi
@@ -3,19 +3,20 @@
 # (c) 2019-2025 Eyosido Software SARL
 # ---------------
 
-import os
+import os, importlib
 
 import sd
 if sd.getContext().getSDApplication().getVersion() < "14.0.0":
-    from PySide2.QtUiTools import QUiLoader
     from PySide2 import QtGui, QtWidgets
     from PySide2.QtCore import Qt
+    QT_BINDING = "pyside2"
 else:
-    from PySide6.QtUiTools import QUiLoader
     from PySide6 import QtGui, QtWidgets
     from PySide6.QtCore import Qt
+    QT_BINDING = "pyside6"
     
 from globalsearch.gscore.sdobj import SDObj 
+from globalsearch.gscore import gslog
 from globalsearch.gscore.gslog import GSLogger
 
 class GSUIUtil:
@@ -38,11 +39,57 @@ class GSUIUtil:
         SDObj.FUNC_INPUT: "gs_func_input.png",
         SDObj.PARAM_INPUT: "gs_input.png",
         SDObj.FUNC_CALL: "gs_func_call.png",
-        SDObj.FUNC_PARAM: "gs_func_param.png"
+        SDObj.FUNC_PARAM: "gs_func_param.png",
+        SDObj.USAGE: "gs_graph_node.png",
+        SDObj.LIBRARY_NODE: "gs_graph_node.png"
     }
+    GRAPH_NODE_ICON_FILE = "gs_graph_node.png"
+    PREWARM_ICON_HEIGHTS = (18,) # icon height of the result and root trees
 
+    ICON_CACHE = {} # process-wide, key: (icon filename, scaled height), value: QIcon
+
+    # Forms of the "ui" folder are compiled ahead of time into one module per Qt binding, which must be regenerated
+    # whenever a .ui file is modified, i.e. from the "ui" folder:
+    #   pyside2-uic gs_main.ui -o gs_main_pyside2.py
+    #   pyside6-uic gs_main.ui -o gs_main_pyside6.py
+    # The .ui file is parsed at runtime only if its compiled module is missing.
     @classmethod
     def loadUI(cls, uiFilename):
+        widget = cls.loadCompiledUI(uiFilename)
+        if widget is None:
+            gslog.warning("No compiled form for " + uiFilename + ", loading it at runtime")
+            widget = cls.loadUIFile(uiFilename)
+        return widget
+
+    @classmethod
+    def compiledUIModuleName(cls, uiFilename):
+        return "globalsearch.gsui.ui." + os.path.splitext(uiFilename)[0] + "_" + QT_BINDING
+
+    # widget set up by the compiled form, None if not available
+    @classmethod
+    def loadCompiledUI(cls, uiFilename):
+        try:
+            module = importlib.import_module(cls.compiledUIModuleName(uiFilename))
+        except ImportError:
+            return None
+        formClass = next((value for name, value in vars(module).items() if name.startswith("Ui_")), None)
+        if formClass is None:
+            return None
+        form = formClass()
+        widget = QtWidgets.QWidget()
+        form.setupUi(widget)
+        # children and layouts made attributes of the widget, as QUiLoader does
+        for name, value in vars(form).items():
+            setattr(widget, name, value)
+        return widget
+
+    # .ui file parsed at runtime
+    @classmethod
+    def loadUIFile(cls, uiFilename):
+        if QT_BINDING == "pyside2":
+            from PySide2.QtUiTools import QUiLoader
+        else:
+            from PySide6.QtUiTools import QUiLoader
         curdir = os.path.dirname(__file__)
         path = os.path.join(curdir,"ui/" + uiFilename)
         return QUiLoader().load(path)
@@ -51,8 +98,9 @@ class GSUIUtil:
     def filePathForIcon(cls, iconFilename):
         return os.path.join(os.path.dirname(__file__), "img", iconFilename)
 
+    # loads the icon from disk, see iconWithFilename() for the cached version
     @classmethod
-    def iconWithFilename(cls, iconFilename, scaledHeight = -1):
+    def loadIcon(cls, iconFilename, scaledHeight = -1):
         pixmap = QtGui.QPixmap(cls.filePathForIcon(iconFilename))
         if scaledHeight != -1:
             pixmap = pixmap.scaledToHeight(scaledHeight, Qt.TransformationMode.SmoothTransformation)
@@ -60,18 +108,35 @@ class GSUIUtil:
         return icon
 
     @classmethod
-    def iconForSDObj(cls, nodeType, scaledHeight = -1):
-        iconFilename = None
-        icon = None
+    def iconWithFilename(cls, iconFilename, scaledHeight = -1):
+        key = (iconFilename, scaledHeight)
+        icon = cls.ICON_CACHE.get(key)
+        if icon is None:
+            icon = cls.loadIcon(iconFilename, scaledHeight)
+            cls.ICON_CACHE[key] = icon
+        return icon
+
+    # loads the SD object icons at the tree icon heights, so the first search does not pay for it
+    @classmethod
+    def prewarmIcons(cls):
+        filenames = set(cls.TYPE_ICON_FILE.values())
+        filenames.add(cls.GRAPH_NODE_ICON_FILE)
+        for height in cls.PREWARM_ICON_HEIGHTS:
+            for filename in filenames:
+                cls.iconWithFilename(filename, height)
 
+    @classmethod
+    def iconFilenameForSDObj(cls, nodeType):
         if SDObj.isGraphNode(nodeType):
-            iconFilename = "gs_graph_node.png"
-        else:
-            iconFilename = cls.TYPE_ICON_FILE.get(nodeType)
-                       
+            return cls.GRAPH_NODE_ICON_FILE
+        return cls.TYPE_ICON_FILE.get(nodeType)
+
+    @classmethod
+    def iconForSDObj(cls, nodeType, scaledHeight = -1):
+        icon = None
+        iconFilename = cls.iconFilenameForSDObj(nodeType)
         if iconFilename:
             icon = cls.iconWithFilename(iconFilename, scaledHeight)
-        
         return icon
 
     @classmethod
@@ -82,31 +147,31 @@ class GSUIUtil:
                 finalText = text[:maxLen] + ellipsis
         return finalText    
 
+    # Returns text cropped around span (start, end), i.e. a search match, along with the span within the cropped text
+    # (None if there is no span or it does not fit). Without span, text is cropped from its start.
     @classmethod
-    def croppedTextCenteredAroundSubstring(cls, substring, text, maxLen = 50, ellipsis='(...)'):
-        # return text centered around substring
+    def croppedTextAroundSpan(cls, text, span, maxLen = 50, ellipsis='(...)'):
+        if not text or len(text) <= maxLen:
+            return text, span
         textLen = len(text)
-        if text and textLen > maxLen:
-            subStart = text.find(substring)
-            posAtSubMid = subStart + int(len(substring)/2)
-            start = posAtSubMid - int(maxLen/2)
-            if start < 0:
-                start = 0
-
-            lastIndex = textLen - 1
-            end = start + maxLen
-            if end >= textLen:
-                end = lastIndex
-            
-            finalText = ""
-            if start > 0:
-                finalText += ellipsis
-            finalText += text[start:end+1]
-            if end < lastIndex:
-                finalText += ellipsis
-        else:
-            finalText = text
-        return finalText
+        start = 0
+        if span:
+            start = (span[0] + span[1]) // 2 - maxLen // 2 # centered around span
+            start = max(0, min(start, textLen - maxLen))
+        end = start + maxLen
+
+        prefix = ellipsis if start > 0 else ""
+        finalText = prefix + text[start:end]
+        if end < textLen:
+            finalText += ellipsis
+
+        croppedSpan = None
+        if span:
+            spanStart = max(span[0], start) - start + len(prefix)
+            spanEnd = min(span[1], end) - start + len(prefix)
+            if spanEnd > spanStart:
+                croppedSpan = (spanStart, spanEnd)
+        return finalText, croppedSpan
 
     @classmethod
     def displayErrorMsg(cls, msg, parent = None):